@@ -1,14 +1,34 @@
 import logging
 import sys
+from typing import Optional
 
 import click
 import requests
 from click_aliases import ClickAliasedGroup
 
 from app.aliases import COMMAND_ALIASES
-from app.commands import check, download, progress, setup, verify
+from app.commands import (
+    bundle,
+    check,
+    completion,
+    download,
+    list_exercises,
+    prefetch,
+    progress,
+    serve_cache,
+    setup,
+    stats,
+    verify,
+    worker,
+)
 from app.commands.repl import repl
 from app.commands.version import version
+from app.configs.gitmastery_config import (
+    GITMASTERY_CONFIG_NAME,
+    METADATA_FOLDER_NAME,
+    GitMasteryConfig,
+)
+from app.configs.utils import find_root
 from app.utils.click import ClickColor, CliContextKey, warn
 from app.utils.version import Version
 from app.version import __version__
@@ -22,6 +42,31 @@ class LoggingGroup(ClickAliasedGroup):
 
 
 CONTEXT_SETTINGS = {"max_content_width": 120}
+# The version check is skipped rather than holding up every command on a slow network
+VERSION_CHECK_TIMEOUT = 3
+
+
+def _is_offline_configured() -> bool:
+    root = find_root(GITMASTERY_CONFIG_NAME, folder=METADATA_FOLDER_NAME)
+    if root is None:
+        return False
+    try:
+        return GitMasteryConfig.read(*root).offline
+    except (OSError, ValueError):
+        return False
+
+
+def _get_latest_version() -> Optional[str]:
+    try:
+        response = requests.get(
+            "https://github.com/git-mastery/app/releases/latest",
+            allow_redirects=False,
+            timeout=VERSION_CHECK_TIMEOUT,
+        )
+        return response.headers["Location"].rsplit("/", 1)[-1]
+    except (requests.RequestException, KeyError):
+        logging.getLogger(__name__).info("Unable to check for the latest version")
+        return None
 
 
 @click.group(
@@ -30,23 +75,28 @@ CONTEXT_SETTINGS = {"max_content_width": 120}
     invoke_without_command=True,
 )
 @click.option("--verbose", "-v", is_flag=True, help="Enable verbose output")
+@click.option(
+    "--offline",
+    is_flag=True,
+    envvar="GITMASTERY_OFFLINE",
+    help="Only use data cached on this machine instead of reaching Github",
+)
 @click.pass_context
-def cli(ctx: click.Context, verbose: bool) -> None:
+def cli(ctx: click.Context, verbose: bool, offline: bool) -> None:
     """Git-Mastery app"""
     ctx.ensure_object(dict)
 
     ctx.obj[CliContextKey.VERBOSE] = verbose
+    ctx.obj[CliContextKey.OFFLINE] = offline or _is_offline_configured()
 
     current_version = Version.parse_version_string(__version__)
     ctx.obj[CliContextKey.VERSION] = current_version
-    latest_version = (
-        requests.get(
-            "https://github.com/git-mastery/app/releases/latest", allow_redirects=False
-        )
-        .headers["Location"]
-        .rsplit("/", 1)[-1]
-    )
-    if current_version.is_behind(Version.parse_version_string(latest_version)):
+    latest_version = None
+    if not ctx.obj[CliContextKey.OFFLINE]:
+        latest_version = _get_latest_version()
+    if latest_version is not None and current_version.is_behind(
+        Version.parse_version_string(latest_version)
+    ):
         warn(
             click.style(
                 f"Your version of Git-Mastery app {current_version} is behind the latest version {latest_version}.",
@@ -63,7 +113,21 @@ def cli(ctx: click.Context, verbose: bool) -> None:
 
 
 def start() -> None:
-    commands = [check, download, progress, setup, verify, version]
+    commands = [
+        bundle,
+        check,
+        completion,
+        download,
+        list_exercises,
+        prefetch,
+        progress,
+        serve_cache,
+        setup,
+        stats,
+        verify,
+        version,
+        worker,
+    ]
     for command in commands:
         if command.name and command.name in COMMAND_ALIASES:
             cli.add_command(command, aliases=COMMAND_ALIASES[command.name])
@@ -1,9 +1,31 @@
-__all__ = ["check", "download", "progress", "repl", "setup", "verify", "version"]
+__all__ = [
+    "bundle",
+    "check",
+    "completion",
+    "download",
+    "list_exercises",
+    "prefetch",
+    "progress",
+    "repl",
+    "serve_cache",
+    "setup",
+    "stats",
+    "verify",
+    "version",
+    "worker",
+]
 
+from .bundle import bundle
 from .check import check
+from .completion import completion
 from .download import download
+from .list_exercises import list_exercises
+from .prefetch import prefetch
 from .progress.progress import progress
 from .repl import repl
+from .serve_cache import serve_cache
 from .setup_folder import setup
+from .stats import stats
 from .verify import verify
 from .version import version
+from .worker import worker
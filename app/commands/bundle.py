@@ -0,0 +1,101 @@
+import shutil
+from pathlib import Path
+from typing import List, Tuple
+
+import click
+
+from app.commands.prefetch import SHARED_FOLDERS, format_size, select_exercises
+from app.configs.gitmastery_config import GitMasteryConfig
+from app.hooks import in_gitmastery_root
+from app.utils.bundle import ExercisesBundle, InvalidBundleError, write_bundle
+from app.utils.catalog import get_catalog_dir
+from app.utils.click import (
+    ensure_online,
+    error,
+    info,
+    must_get_gitmastery_root_config,
+    success,
+)
+from app.utils.gitmastery import ExercisesRepo
+
+BUNDLES_FOLDER_NAME = "bundles"
+
+
+def export_exercises(
+    repo: ExercisesRepo, formatted_exercises: List[str], output: Path
+) -> None:
+    """Writes the given exercises, along with what they share, to a bundle."""
+    folders = formatted_exercises + SHARED_FOLDERS
+    files = repo.prefetch(folders)
+    folder_hashes = {folder: repo.get_folder_hash(folder) for folder in folders}
+    write_bundle(output, files, folder_hashes, repo.commit)
+
+
+@click.group()
+def bundle() -> None:
+    """Moves exercises between machines without reaching Github."""
+    pass
+
+
+@bundle.command()
+@click.argument("output", type=click.Path(dir_okay=False, path_type=Path))
+@click.argument("exercises", nargs=-1)
+@click.option(
+    "--tag",
+    "tags",
+    multiple=True,
+    help="Export every exercise with this tag. Can be used multiple times.",
+)
+@in_gitmastery_root()
+def export(output: Path, exercises: Tuple[str, ...], tags: Tuple[str, ...]) -> None:
+    """
+    Packs exercises into a single bundle file, or every exercise if none are given.
+    """
+    config = must_get_gitmastery_root_config()
+    if config.exercises_source.type == "remote":
+        ensure_online("Exporting a bundle")
+
+    with ExercisesRepo() as repo:
+        formatted_exercises = select_exercises(
+            repo, exercises, tags, get_catalog_dir(config)
+        )
+        info(f"Packing {len(formatted_exercises)} exercises")
+        export_exercises(repo, formatted_exercises, output)
+
+    success(
+        f"Exported {len(formatted_exercises)} exercises to {click.style(str(output), bold=True)} ({format_size(output.stat().st_size)})"
+    )
+
+
+@bundle.command(name="import")
+@click.argument(
+    "bundle_path", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@in_gitmastery_root(must=True)
+def import_bundle(bundle_path: Path) -> None:
+    """
+    Uses a bundle as the source of exercises for this Git-Mastery root.
+    """
+    config = must_get_gitmastery_root_config()
+    try:
+        exercises_bundle = ExercisesBundle(bundle_path)
+    except InvalidBundleError as e:
+        error(str(e))
+    file_count = exercises_bundle.file_count
+    commit = exercises_bundle.commit
+    exercises_bundle.close()
+
+    # Copied so that the source keeps working once the USB stick or share is removed
+    destination = config.metadata_dir / BUNDLES_FOLDER_NAME / bundle_path.name
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    if bundle_path.resolve() != destination.resolve():
+        shutil.copyfile(bundle_path, destination)
+
+    config.exercises_source = GitMasteryConfig.ExercisesSource(
+        type="bundle", bundle_path=str(destination)
+    )
+    config.write()
+
+    if commit is not None:
+        info(f"The bundle holds {file_count} files from commit {commit[:7]}")
+    success(f"Exercises are now read from {click.style(str(destination), bold=True)}")
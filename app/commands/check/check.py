@@ -2,14 +2,25 @@ import click
 
 from app.commands.check.git import git
 from app.commands.check.github import github
+from app.configs.gitmastery_config import (
+    GITMASTERY_CONFIG_NAME,
+    METADATA_FOLDER_NAME,
+    GitMasteryConfig,
+)
+from app.configs.utils import find_root
+from app.utils.click import CliContextKey
 
 
 @click.group()
-def check() -> None:
+@click.pass_context
+def check(ctx: click.Context) -> None:
     """
     Verifies if Git/Github CLI is properly installed for Git-Mastery.
     """
-    pass
+    # Checks are not tied to a Git-Mastery root, but remember their results in one
+    root = find_root(GITMASTERY_CONFIG_NAME, folder=METADATA_FOLDER_NAME)
+    if root is not None:
+        ctx.obj[CliContextKey.GITMASTERY_ROOT_CONFIG] = GitMasteryConfig.read(*root)
 
 
 check.add_command(git)
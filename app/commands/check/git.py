@@ -1,6 +1,7 @@
 import click
 
-from app.utils.click import error, info, success
+from app.utils.click import error, get_gitmastery_root_config, info, success
+from app.utils.env_check import clear_env_check, read_env_check, save_env_check
 from app.utils.git import (
     MIN_GIT_VERSION,
     get_git_config,
@@ -9,10 +10,29 @@ from app.utils.git import (
 
 
 @click.command()
-def git() -> None:
+@click.option(
+    "--cached",
+    is_flag=True,
+    hidden=True,
+    help="Reuse the last successful check while the Git setup is unchanged.",
+)
+def git(cached: bool) -> None:
     """
     Verifies if Git is installed and setup for Git-Mastery.
     """
+    config = get_gitmastery_root_config()
+    if config is not None:
+        if cached:
+            details = read_env_check(config, "git")
+            if details is not None:
+                info(
+                    f"Git {details['version']} was already checked for {click.style(details['user.name'], bold=True, italic=True)}"
+                )
+                success("Git is installed and configured")
+                return
+        # A failing check must not leave an earlier success behind
+        clear_env_check(config, "git")
+
     info("Checking that you have Git installed and configured")
 
     git_version = get_git_version()
@@ -50,4 +70,15 @@ def git() -> None:
             f"You have set {click.style('user.email', bold=True)} as {click.style(config_user_email, bold=True, italic=True)}"
         )
 
+    if config is not None:
+        save_env_check(
+            config,
+            "git",
+            {
+                "version": str(git_version),
+                "user.name": config_user_name,
+                "user.email": config_user_email,
+            },
+        )
+
     success("Git is installed and configured")
@@ -1,18 +1,72 @@
+from datetime import datetime
+
 import click
 
-from app.utils.click import error, info, success
+from app.utils.auth_snapshot import read_auth_snapshot, save_auth_snapshot
+from app.utils.click import (
+    error,
+    get_gitmastery_root_config,
+    info,
+    is_offline,
+    success,
+)
+from app.utils.env_check import clear_env_check, read_env_check, save_env_check
 from app.utils.github_cli import (
-    has_delete_repo_scope,
+    get_token_scopes,
+    get_username,
     is_authenticated,
     is_github_cli_installed,
 )
 
 
+def _check_cached_github() -> None:
+    # Checking the authentication requires reaching Github, so the result of the last
+    # check made while online is used instead
+    config = get_gitmastery_root_config()
+    snapshot = read_auth_snapshot(config) if config is not None else None
+    if snapshot is None:
+        error(
+            "Github CLI has not been checked while online yet, so it cannot be used offline"
+        )
+
+    checked_at = datetime.fromtimestamp(snapshot.checked_at).strftime("%Y-%m-%d %H:%M")
+    info(f"Using the Github CLI authentication last checked at {checked_at}")
+
+    if "delete_repo" not in snapshot.scopes:
+        error(
+            "You need to authenticate Github CLI with the 'delete_repo' scope. Do so via 'gh auth refresh -s delete_repo'"
+        )
+
+    success(
+        f"Github CLI was configured for {click.style(snapshot.username, bold=True, italic=True)}"
+    )
+
+
 @click.command()
-def github() -> None:
+@click.option(
+    "--cached",
+    is_flag=True,
+    hidden=True,
+    help="Reuse the last successful check while the Github CLI setup is unchanged.",
+)
+def github(cached: bool) -> None:
     """
     Verifies if Github and Github CLI is installed and setup for Git-Mastery.
     """
+    config = get_gitmastery_root_config()
+    if config is not None:
+        if cached:
+            details = read_env_check(config, "github")
+            if details is not None:
+                info(
+                    f"Github CLI was already checked for {click.style(details['username'], bold=True, italic=True)}"
+                )
+                success("Github CLI is installed and configured")
+                return
+        # A failing check must not leave an earlier success behind
+        if not is_offline():
+            clear_env_check(config, "github")
+
     info("Checking that you have Github CLI is installed and configured")
 
     if is_github_cli_installed():
@@ -20,16 +74,26 @@ def github() -> None:
     else:
         error("Github CLI is not installed yet")
 
+    if is_offline():
+        _check_cached_github()
+        return
+
     if is_authenticated():
         info("You have authenticated Github CLI")
     else:
         error("You have not authenticated Github CLI")
 
-    if has_delete_repo_scope():
+    scopes = get_token_scopes()
+    if "delete_repo" in scopes:
         info("You have authenticated Github CLI with the 'delete_repo' scope")
     else:
         error(
             "You need to authenticate Github CLI with the 'delete_repo' scope. Do so via 'gh auth refresh -s delete_repo'"
         )
 
+    if config is not None:
+        username = get_username()
+        save_auth_snapshot(config, username, scopes)
+        save_env_check(config, "github", {"username": username, "scopes": scopes})
+
     success("Github CLI is installed and configured")
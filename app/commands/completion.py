@@ -0,0 +1,17 @@
+import click
+
+from app.completion import COMPLETION_SCRIPTS
+
+
+@click.command()
+@click.argument("shell", type=click.Choice(sorted(COMPLETION_SCRIPTS)))
+def completion(shell: str) -> None:
+    """
+    Prints the script that sets up tab completion for a shell.
+
+    \b
+    bash: eval "$(gitmastery completion bash)" in ~/.bashrc
+    zsh:  eval "$(gitmastery completion zsh)" in ~/.zshrc
+    fish: gitmastery completion fish > ~/.config/fish/completions/gitmastery.fish
+    """
+    click.echo(COMPLETION_SCRIPTS[shell], nl=False)
@@ -12,25 +12,42 @@ from app.commands.check.git import git
 from app.commands.check.github import github
 from app.configs.exercise_config import ExerciseConfig
 from app.hooks import in_gitmastery_root
+from app.utils.base_files import write_base_files_manifest
 from app.utils.cli import rmtree
 from app.utils.click import (
+    ensure_online,
     error,
+    get_gitmastery_root_config,
     get_verbose,
     info,
     invoke_command,
+    is_offline,
     success,
     warn,
 )
-from app.utils.git import add_all, commit, empty_commit, init
+from app.utils.git import (
+    add_all,
+    checkout_branch,
+    commit,
+    empty_commit,
+    fetch,
+    force_push,
+    get_remote_branches,
+    get_remote_default_branch,
+    init,
+)
 from app.utils.github_cli import (
     clone_with_custom_name,
     close_prs,
     delete_repo,
     fork,
+    get_fork_parent,
     get_username,
     has_fork,
+    wait_for_fork,
 )
 from app.utils.gitmastery import ExercisesRepo, Namespace
+from app.utils.snapshot import is_snapshottable, save_snapshot
 
 
 def _download_exercise(
@@ -67,11 +84,17 @@ def _download_exercise(
             )
         config = ExerciseConfig.read(Path("./"), 0)
 
+        if config.exercise_repo.repo_type == "remote" and is_offline():
+            # The exercise repository is forked or cloned from Github
+            os.chdir("..")
+            rmtree(exercise)
+            ensure_online("Downloading exercises that use Github")
+
         # Check if the exercise requires Git to operate, if so, error if not present
         if config.requires_git:
             try:
                 info("Exercise requires Git, checking if you have it setup")
-                invoke_command(git)
+                invoke_command(git, cached=True)
             except SystemExit as e:
                 if e.code == 1:
                     # Exited because of missing Github configuration
@@ -86,7 +109,7 @@ def _download_exercise(
         if config.requires_github:
             try:
                 info("Exercise requires Github, checking if you have it setup")
-                invoke_command(github)
+                invoke_command(github, cached=True)
             except SystemExit as e:
                 if e.code == 1:
                     # Exited because of missing Github configuration
@@ -115,6 +138,7 @@ def _download_exercise(
                 path,
                 is_binary,
             )
+        write_base_files_manifest(Path.cwd(), config.base_files)
 
         if config.exercise_repo.repo_type != "ignore":
             setup_exercise_folder(repo, download_time, config)
@@ -127,6 +151,7 @@ def _download_exercise(
             )
         else:
             config.downloaded_at = download_time.timestamp()
+            config.source_commit = repo.source_commit
             info(click.style(f"cd {exercise}", bold=True, italic=True))
             with open(".gitmastery-exercise.json", "w") as gitmastery_exercise_file:
                 gitmastery_exercise_file.write(config.to_json())
@@ -163,7 +188,7 @@ def _download_hands_on(hands_on: str, formatted_hands_on: str) -> None:
         if requires_git:
             try:
                 info("Hands-on requires Git, checking if you have it setup")
-                invoke_command(git)
+                invoke_command(git, cached=True)
             except SystemExit as e:
                 if e.code == 1:
                     # Exited because of missing Github configuration
@@ -177,7 +202,7 @@ def _download_hands_on(hands_on: str, formatted_hands_on: str) -> None:
         if requires_github:
             try:
                 info("Hands-on requires Github, checking if you have it setup")
-                invoke_command(github)
+                invoke_command(github, cached=True)
             except SystemExit as e:
                 if e.code == 1:
                     # Exited because of missing Github configuration
@@ -197,13 +222,67 @@ def _download_hands_on(hands_on: str, formatted_hands_on: str) -> None:
         success(f"Completed setting up {click.style(hands_on, bold=True, italic=True)}")
 
 
+def _reset_fork_to_upstream(all_branches: Optional[bool]) -> bool:
+    """Makes the fork cloned in the current folder identical to its upstream."""
+    # Cloning a fork with the Github CLI adds its parent as the upstream remote
+    if not fetch("upstream"):
+        return False
+    default_branch = get_remote_default_branch("upstream")
+    if default_branch is None:
+        return False
+
+    upstream_branches = (
+        get_remote_branches("upstream") if all_branches else [default_branch]
+    )
+    stale_branches = [
+        branch
+        for branch in get_remote_branches("origin")
+        if branch not in upstream_branches
+    ]
+    refspecs = [
+        f"+refs/remotes/upstream/{branch}:refs/heads/{branch}"
+        for branch in upstream_branches
+    ] + [f":refs/heads/{branch}" for branch in stale_branches]
+    if not force_push("origin", refspecs):
+        return False
+
+    fetch("origin")
+    checkout_branch(default_branch, f"origin/{default_branch}")
+    return True
+
+
+def _reuse_fork(
+    exercise_repo: str, fork_name: str, username: str, config: ExerciseConfig
+) -> bool:
+    info("You already have a fork, resetting it to match the exercise repository")
+    close_prs(exercise_repo)
+    close_prs(f"{username}/{fork_name}")
+    info("Creating clone of your fork")
+    clone_with_custom_name(f"{username}/{fork_name}", config.exercise_repo.repo_name)
+
+    exercise_path = Path.cwd()
+    try:
+        os.chdir(config.exercise_repo.repo_name)
+        reset = _reset_fork_to_upstream(config.exercise_repo.fork_all_branches)
+    finally:
+        os.chdir(exercise_path)
+
+    if not reset:
+        warn("Unable to reset your fork, it will be recreated instead")
+        rmtree(config.exercise_repo.repo_name)
+    return reset
+
+
 def setup_exercise_folder(
     repo: ExercisesRepo, download_time: datetime, config: ExerciseConfig
 ) -> None:
     exercise = config.exercise_name
     formatted_exercise = config.formatted_exercise_name
+    exercise_path = Path.cwd()
 
     config.downloaded_at = download_time.timestamp()
+    # Verification later uses the scripts of this commit, which match the setup
+    config.source_commit = repo.source_commit
 
     with open(".gitmastery-exercise.json", "w") as gitmastery_exercise_file:
         gitmastery_exercise_file.write(config.to_json())
@@ -220,15 +299,29 @@ def setup_exercise_folder(
         if config.exercise_repo.create_fork:
             info("Checking if you already have a fork")
             fork_name = config.exercise_fork_name(username)
+            gitmastery_config = get_gitmastery_root_config()
+            reused = False
             if has_fork(fork_name):
-                info("You already have a fork, deleting it")
-                delete_repo(fork_name)
-            info("Creating fork of exercise repository")
-            fork(exercise_repo, fork_name, config.exercise_repo.fork_all_branches)
-            info("Creating clone of your fork")
-            clone_with_custom_name(
-                f"{username}/{fork_name}", config.exercise_repo.repo_name
-            )
+                # Forking is asynchronous and deleting repositories is rate-limited, so
+                # resetting the existing fork is much faster when it is allowed
+                if (
+                    gitmastery_config is not None
+                    and gitmastery_config.reuse_forks
+                    and get_fork_parent(fork_name) == exercise_repo
+                ):
+                    reused = _reuse_fork(exercise_repo, fork_name, username, config)
+                if not reused:
+                    info("You already have a fork, deleting it")
+                    delete_repo(fork_name)
+            if not reused:
+                info("Creating fork of exercise repository")
+                fork(exercise_repo, fork_name, config.exercise_repo.fork_all_branches)
+                if not wait_for_fork(f"{username}/{fork_name}"):
+                    warn("Your fork is taking a while to be created, cloning anyway")
+                info("Creating clone of your fork")
+                clone_with_custom_name(
+                    f"{username}/{fork_name}", config.exercise_repo.repo_name
+                )
         else:
             info("Creating clone of repository")
             clone_with_custom_name(exercise_repo, config.exercise_repo.repo_name)
@@ -273,6 +366,11 @@ def setup_exercise_folder(
             {"rs": repo_smith, "verbose": verbose},
         )
 
+    gitmastery_config = get_gitmastery_root_config()
+    if gitmastery_config is not None and is_snapshottable(config):
+        # Lets the exercise be reset without downloading and setting it up again
+        save_snapshot(gitmastery_config.snapshots_dir, exercise_path, config)
+
     success(f"Completed setting up {click.style(exercise, bold=True, italic=True)}")
     info("Start working on it:")
 
@@ -0,0 +1,86 @@
+from typing import Optional, Tuple
+
+import click
+
+from app.commands.prefetch import format_size
+from app.hooks import in_gitmastery_root
+from app.utils.catalog import (
+    build_catalog,
+    get_catalog,
+    get_catalog_dir,
+    is_catalog_stale,
+    read_catalog,
+    write_catalog,
+)
+from app.utils.click import (
+    ensure_online,
+    info,
+    is_offline,
+    must_get_gitmastery_root_config,
+    warn,
+)
+from app.utils.gitmastery import ExercisesRepo
+
+
+@click.command(name="list")
+@click.option(
+    "--tag",
+    "tags",
+    multiple=True,
+    help="Only list exercises with this tag. Can be used multiple times.",
+)
+@click.option(
+    "--requires-github/--no-requires-github",
+    "requires_github",
+    default=None,
+    help="Only list exercises that do, or do not, need a Github account.",
+)
+@click.option(
+    "--refresh", is_flag=True, help="Rebuild the catalog of exercises before listing."
+)
+@in_gitmastery_root()
+def list_exercises(
+    tags: Tuple[str, ...], requires_github: Optional[bool], refresh: bool
+) -> None:
+    """
+    Lists the exercises available, optionally filtered by tag.
+    """
+    config = must_get_gitmastery_root_config()
+    catalog_dir = get_catalog_dir(config)
+
+    # The catalog kept from the last build answers without touching the exercises
+    pinned_commit = config.exercises_source.commit
+    catalog = None if refresh else read_catalog(catalog_dir, pinned_commit)
+    if (
+        catalog is not None
+        and pinned_commit is None
+        and not is_offline()
+        and is_catalog_stale(catalog_dir)
+    ):
+        catalog = None
+    if catalog is None:
+        if config.exercises_source.type == "remote":
+            ensure_online("Building the list of exercises")
+        with ExercisesRepo() as repo:
+            if refresh:
+                catalog = build_catalog(repo)
+                write_catalog(catalog_dir, catalog)
+            else:
+                catalog = get_catalog(repo, catalog_dir)
+
+    entries = catalog.filter(list(tags), requires_github)
+    if len(entries) == 0:
+        warn("No exercises match the given filters.")
+        return
+
+    info(f"Found {len(entries)} exercises")
+    header = f"{'Exercise':<32} {'Github':>6} {'Resources':>10}  Tags"
+    click.echo(click.style(header, bold=True))
+    for entry in sorted(entries, key=lambda entry: entry.exercise_name):
+        github = "yes" if entry.requires_github else "no"
+        resources = (
+            format_size(entry.resource_size) if entry.resource_count > 0 else "-"
+        )
+        click.echo(
+            f"{entry.exercise_name:<32} {github:>6} {resources:>10}  {', '.join(entry.tags)}"
+        )
@@ -0,0 +1,114 @@
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import click
+
+from app.hooks import in_gitmastery_root
+from app.utils.catalog import get_catalog, get_catalog_dir
+from app.utils.click import (
+    ensure_online,
+    error,
+    info,
+    must_get_gitmastery_root_config,
+    success,
+    warn,
+)
+from app.utils.exercises_cache import (
+    BYTECODE_CACHE_FOLDER_NAME,
+    compile_script,
+    get_cache_size,
+)
+from app.utils.general import ensure_str
+from app.utils.gitmastery import ExercisesRepo
+
+# Shared by every exercise and hands-on, so they are always cached
+SHARED_FOLDERS = ["exercise_utils", "hands_on"]
+
+
+def select_exercises(
+    repo: ExercisesRepo,
+    exercises: Tuple[str, ...],
+    tags: Tuple[str, ...],
+    catalog_dir: Optional[Path],
+) -> List[str]:
+    """Returns the folders of the named exercises and of those with any of the tags.
+
+    Every exercise is selected when neither names nor tags are given.
+    """
+    catalog = get_catalog(repo, catalog_dir)
+    available_exercises = {entry.formatted_exercise_name for entry in catalog.exercises}
+    if len(exercises) == 0 and len(tags) == 0:
+        return sorted(available_exercises)
+
+    formatted_exercises = [exercise.replace("-", "_") for exercise in exercises]
+    if len(tags) > 0:
+        tagged = [entry.formatted_exercise_name for entry in catalog.filter(list(tags))]
+        if len(tagged) == 0:
+            warn(f"No exercises are tagged with {', '.join(tags)}")
+        formatted_exercises += tagged
+
+    for formatted_exercise in formatted_exercises:
+        if formatted_exercise not in available_exercises:
+            error(
+                f"Missing exercise {formatted_exercise.replace('_', '-')}. Make sure you typed the name correctly."
+            )
+    return sorted(set(formatted_exercises))
+
+
+def format_size(size: int) -> str:
+    if size < 1024:
+        return f"{size} B"
+    scaled = float(size)
+    for unit in ["KB", "MB", "GB"]:
+        scaled /= 1024
+        if scaled < 1024 or unit == "GB":
+            break
+    return f"{scaled:.1f} {unit}"
+
+
+@click.command()
+@click.argument("exercises", nargs=-1)
+@click.option(
+    "--tag",
+    "tags",
+    multiple=True,
+    help="Prefetch every exercise with this tag. Can be used multiple times.",
+)
+@in_gitmastery_root()
+def prefetch(exercises: Tuple[str, ...], tags: Tuple[str, ...]) -> None:
+    """
+    Caches exercises ahead of time so that they can be used without Github.
+    """
+    if len(exercises) == 0 and len(tags) == 0:
+        error(
+            f"Provide the exercises to prefetch, or select them with {click.style('--tag', bold=True, italic=True)}"
+        )
+    ensure_online("Prefetching exercises")
+
+    config = must_get_gitmastery_root_config()
+    with ExercisesRepo() as repo:
+        if not repo.is_cached:
+            info("Exercises are not read from Github, so there is nothing to cache")
+            return
+
+        formatted_exercises = select_exercises(
+            repo, exercises, tags, get_catalog_dir(config)
+        )
+
+        info(f"Fetching {len(formatted_exercises)} exercises from Github")
+        folders = formatted_exercises + SHARED_FOLDERS
+        cached_files = repo.prefetch(folders)
+
+        bytecode_dir = config.cache_dir / BYTECODE_CACHE_FOLDER_NAME
+        scripts = [
+            file_path
+            for file_path in cached_files
+            if file_path.endswith(".py") and not file_path.startswith("exercise_utils/")
+        ]
+        for file_path in scripts:
+            compile_script(ensure_str(cached_files[file_path]), file_path, bytecode_dir)
+
+    info(f"Cached {len(cached_files)} files and compiled {len(scripts)} scripts")
+    success(
+        f"Prefetched {len(formatted_exercises)} exercises, the cache now uses {format_size(get_cache_size(config.cache_dir))}"
+    )
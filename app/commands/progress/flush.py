@@ -0,0 +1,75 @@
+import os
+
+import click
+
+from app.commands.progress.constants import PROGRESS_LOCAL_FOLDER_NAME
+from app.commands.progress.pull_request import ensure_progress_pull_request
+from app.hooks import in_gitmastery_root
+from app.utils.click import (
+    info,
+    is_offline,
+    must_get_gitmastery_root_config,
+    success,
+    warn,
+)
+from app.utils.git import add_all, commit, push
+from app.utils.github_cli import get_username
+from app.utils.progress_outbox import (
+    acquire_flush_lock,
+    complete_outbox,
+    release_flush_lock,
+    take_outbox,
+)
+
+# Progress recorded while a push is in flight is picked up by another round
+MAX_FLUSH_ROUNDS = 3
+
+
+@click.command()
+@click.option("--quiet", is_flag=True, hidden=True)
+@in_gitmastery_root()
+def flush(quiet: bool) -> None:
+    """
+    Pushes progress that has not been synced to your remote progress yet.
+    """
+    config = must_get_gitmastery_root_config()
+    if is_offline():
+        if not quiet:
+            info("You are offline, your progress will be pushed once you are connected")
+        return
+
+    if not acquire_flush_lock(config):
+        if not quiet:
+            info("Your progress is already being pushed")
+        return
+
+    try:
+        for _ in range(MAX_FLUSH_ROUNDS):
+            entries = take_outbox(config)
+            if len(entries) == 0:
+                break
+
+            if not config.progress_remote:
+                # Remote sync was turned off after the progress was recorded
+                complete_outbox(config)
+                break
+
+            if not quiet:
+                info(f"Pushing {len(entries)} pending progress updates")
+            os.chdir(config.metadata_dir / PROGRESS_LOCAL_FOLDER_NAME)
+            add_all()
+            commit("Update progress")
+            if not push("origin", "main"):
+                # Kept in the outbox and retried on the next command
+                if not quiet:
+                    warn("Unable to push your progress, it will be retried later")
+                return
+
+            ensure_progress_pull_request(config, get_username())
+            complete_outbox(config)
+
+        if not quiet:
+            success("Your remote progress is up to date")
+    finally:
+        release_flush_lock(config)
+        os.chdir(config.path)
@@ -0,0 +1,61 @@
+import os
+
+import click
+
+from app.commands.check.git import git
+from app.commands.check.github import github
+from app.commands.progress.constants import PROGRESS_LOCAL_FOLDER_NAME
+from app.hooks import in_gitmastery_root
+from app.utils.click import (
+    error,
+    info,
+    invoke_command,
+    is_offline,
+    must_get_gitmastery_root_config,
+    success,
+)
+from app.utils.progress_outbox import add_to_outbox, flush_in_background
+from app.utils.progress_store import (
+    JsonProgressStore,
+    ShardedProgressStore,
+    is_sharded,
+)
+
+
+@click.command()
+@in_gitmastery_root(must=True)
+def migrate() -> None:
+    """
+    Splits your progress into one file per exercise.
+    """
+    config = must_get_gitmastery_root_config()
+    progress_dir = config.metadata_dir / PROGRESS_LOCAL_FOLDER_NAME
+
+    if is_sharded(progress_dir):
+        info("Your progress is already stored per exercise")
+        return
+
+    json_store = JsonProgressStore(progress_dir)
+    if not json_store.exists():
+        error("Progress tracking file not created yet. No progress to migrate.")
+
+    if config.progress_remote:
+        invoke_command(git, cached=True)
+        invoke_command(github, cached=True)
+
+    entries = json_store.read_all()
+    ShardedProgressStore(progress_dir).write_all(entries)
+    os.remove(json_store.progress_file)
+    info(f"Moved {len(entries)} progress entries into per-exercise files")
+
+    if config.progress_remote:
+        # Pushed by a background process along with any other pending progress, as
+        # verify does
+        add_to_outbox(config, {"migrated": True})
+        if is_offline():
+            info("Your remote progress will be updated once you are online")
+        else:
+            info("Your remote progress will be updated in the background")
+            flush_in_background(config)
+
+    success("Migrated your progress")
@@ -1,5 +1,7 @@
 import click
 
+from app.commands.progress.flush import flush
+from app.commands.progress.migrate import migrate
 from app.commands.progress.reset import reset
 from app.commands.progress.show import show
 from app.commands.progress.sync.sync import sync
@@ -14,3 +16,5 @@ def progress() -> None:
 progress.add_command(sync)
 progress.add_command(reset)
 progress.add_command(show)
+progress.add_command(flush)
+progress.add_command(migrate)
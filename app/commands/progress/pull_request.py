@@ -0,0 +1,57 @@
+import json
+import os
+import time
+
+from app.commands.progress.constants import PROGRESS_REPOSITORY_NAME
+from app.configs.gitmastery_config import GitMasteryConfig
+from app.utils.click import warn
+from app.utils.github_cli import get_prs, pull_request
+
+PROGRESS_PR_CACHE_NAME = "progress_pr.json"
+# The pull request is only closed by the Git-Mastery team, so it is looked up again
+# once a day rather than after every progress update
+PROGRESS_PR_CACHE_TTL = 24 * 60 * 60
+
+
+def ensure_progress_pull_request(config: GitMasteryConfig, username: str) -> None:
+    """Creates the pull request that submits the student's progress, if missing."""
+    cache_file = config.cache_dir / PROGRESS_PR_CACHE_NAME
+    try:
+        with open(cache_file, "r") as file:
+            cached = json.load(file)
+        if (
+            cached["username"] == username
+            and time.time() - cached["checked_at"] < PROGRESS_PR_CACHE_TTL
+        ):
+            return
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        pass
+
+    prs = get_prs(PROGRESS_REPOSITORY_NAME, "main", username)
+    if len(prs) > 0:
+        url = prs[0]
+    else:
+        warn("No pull request created for progress. Creating one now")
+        created_url = pull_request(
+            PROGRESS_REPOSITORY_NAME,
+            "main",
+            f"{username}:main",
+            f"[{username}] Progress",
+            "Automated",
+        )
+        if created_url is None:
+            return
+        url = created_url
+
+    os.makedirs(cache_file.parent, exist_ok=True)
+    with open(cache_file, "w") as file:
+        file.write(
+            json.dumps(
+                {"username": username, "url": url, "checked_at": time.time()},
+                indent=2,
+            )
+        )
+
+
+def clear_progress_pull_request_cache(config: GitMasteryConfig) -> None:
+    (config.cache_dir / PROGRESS_PR_CACHE_NAME).unlink(missing_ok=True)
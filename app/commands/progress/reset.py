@@ -1,4 +1,3 @@
-import json
 import os
 import sys
 from datetime import datetime
@@ -10,24 +9,26 @@ import pytz
 from app.commands.check.git import git
 from app.commands.check.github import github
 from app.commands.download import setup_exercise_folder
-from app.commands.progress.constants import (
-    PROGRESS_LOCAL_FOLDER_NAME,
-    PROGRESS_REPOSITORY_NAME,
-)
+from app.commands.progress.constants import PROGRESS_LOCAL_FOLDER_NAME
 from app.hooks.in_exercise_root import in_exercise_root
 from app.hooks.in_gitmastery_root import in_gitmastery_root
+from app.utils.base_files import get_changed_base_files, write_base_files_manifest
 from app.utils.cli import rmtree
 from app.utils.click import (
+    ensure_online,
     info,
     invoke_command,
+    is_offline,
     must_get_exercise_root_config,
     must_get_gitmastery_root_config,
     success,
     warn,
 )
-from app.utils.git import add_all, commit, push
-from app.utils.github_cli import close_prs, delete_repo, get_prs, get_username, pull_request
+from app.utils.github_cli import close_prs, delete_repo, get_username
 from app.utils.gitmastery import ExercisesRepo
+from app.utils.progress_outbox import add_to_outbox, flush_in_background
+from app.utils.progress_store import open_progress_store
+from app.utils.snapshot import is_snapshottable, restore_snapshot
 
 
 @click.command()
@@ -39,17 +40,18 @@ def reset() -> None:
     """
     download_time = datetime.now(tz=pytz.UTC)
 
-    username = get_username()
-
     gitmastery_config = must_get_gitmastery_root_config()
     exercise_config = must_get_exercise_root_config()
 
     is_remote_type = exercise_config.exercise_repo.repo_type == "remote"
     has_remote_progress = gitmastery_config.progress_remote
 
-    invoke_command(git)
+    if is_remote_type:
+        ensure_online("Resetting exercises that use Github")
+
+    invoke_command(git, cached=True)
     if has_remote_progress or is_remote_type:
-        invoke_command(github)
+        invoke_command(github, cached=True)
 
     exercise_name = exercise_config.exercise_name
 
@@ -62,11 +64,13 @@ def reset() -> None:
             close_prs(pr_repo_full_name)
         exercise_config.exercise_repo.pr_number = None
         exercise_config.exercise_repo.pr_repo_full_name = None
-        # Remove the fork first
-        exercise_fork_name = (
-            f"{username}-gitmastery-{exercise_config.exercise_repo.repo_title}"
-        )
-        delete_repo(exercise_fork_name)
+        # Remove the fork first, unless it is reset in place when setting up again
+        if not gitmastery_config.reuse_forks:
+            username = get_username()
+            exercise_fork_name = (
+                f"{username}-gitmastery-{exercise_config.exercise_repo.repo_title}"
+            )
+            delete_repo(exercise_fork_name)
 
     if os.path.isdir(exercise_config.path / exercise_config.exercise_repo.repo_name):
         # Only delete if the sub-folder present
@@ -74,29 +78,59 @@ def reset() -> None:
         # student has already created the sub-folder needed
         rmtree(exercise_config.path / exercise_config.exercise_repo.repo_name)
 
-    with ExercisesRepo() as repo:
-        formatted_exercise_name = exercise_config.formatted_exercise_name
-
-        if len(exercise_config.base_files) > 0:
-            info("Re-downloading exercise base files...")
-            for resource, path in exercise_config.base_files.items():
-                os.makedirs(Path(path).parent, exist_ok=True)
-                is_binary = Path(path).suffix in [".png", ".jpg", ".jpeg", ".gif"]
-                repo.download_file(
-                    f"{formatted_exercise_name}/res/{resource}",
-                    path,
-                    is_binary,
+    restored = False
+    if is_snapshottable(exercise_config):
+        restored = restore_snapshot(
+            gitmastery_config.snapshots_dir, exercise_config.path, exercise_config
+        )
+        if restored:
+            info("Restored the exercise from its initial snapshot")
+            exercise_config.downloaded_at = download_time.timestamp()
+            exercise_config.write()
+        elif os.path.isdir(
+            exercise_config.path / exercise_config.exercise_repo.repo_name
+        ):
+            # Clear anything left behind by a snapshot that failed to restore
+            rmtree(exercise_config.path / exercise_config.exercise_repo.repo_name)
+
+    if not restored:
+        # The exercise is set up again as it was at the commit it was downloaded from
+        with ExercisesRepo(commit=exercise_config.source_commit) as repo:
+            formatted_exercise_name = exercise_config.formatted_exercise_name
+            if len(exercise_config.base_files) > 0:
+                # Only base files the student modified or removed are downloaded again
+                changed_resources = get_changed_base_files(
+                    exercise_config.path, exercise_config.base_files
                 )
-
-        if exercise_config.exercise_repo.repo_type != "ignore":
-            setup_exercise_folder(repo, download_time, exercise_config)
-            info(
-                click.style(
-                    f"cd {exercise_config.exercise_repo.repo_name}",
-                    bold=True,
-                    italic=True,
+                if len(changed_resources) == 0:
+                    info("Exercise base files are unchanged")
+                else:
+                    info("Re-downloading changed exercise base files...")
+                for resource in changed_resources:
+                    path = exercise_config.base_files[resource]
+                    os.makedirs(Path(path).parent, exist_ok=True)
+                    is_binary = Path(path).suffix in [".png", ".jpg", ".jpeg", ".gif"]
+                    repo.download_file(
+                        f"{formatted_exercise_name}/res/{resource}",
+                        path,
+                        is_binary,
+                    )
+                    info(f"Restored {click.style(path, bold=True)}")
+                write_base_files_manifest(
+                    exercise_config.path, exercise_config.base_files
                 )
+
+            if exercise_config.exercise_repo.repo_type != "ignore":
+                setup_exercise_folder(repo, download_time, exercise_config)
+
+    if exercise_config.exercise_repo.repo_type != "ignore":
+        info(
+            click.style(
+                f"cd {exercise_config.exercise_repo.repo_name}",
+                bold=True,
+                italic=True,
             )
+        )
 
     if not os.path.isdir(gitmastery_config.metadata_dir / PROGRESS_LOCAL_FOLDER_NAME):
         warn(
@@ -105,40 +139,29 @@ def reset() -> None:
         sys.exit(0)
 
     os.chdir(gitmastery_config.metadata_dir / PROGRESS_LOCAL_FOLDER_NAME)
-    if not os.path.isfile("progress.json"):
+    store = open_progress_store(
+        gitmastery_config.metadata_dir / PROGRESS_LOCAL_FOLDER_NAME
+    )
+    if not store.exists():
         warn("Progress tracking file not created yet. No progress to reset.")
         return
 
     info(
         f"Resetting your progress for {click.style(exercise_name, bold=True, italic=True)}"
     )
-    clean_progress = []
-    with open("progress.json", "r") as progress_file:
-        progress = json.load(progress_file)
-        for entry in progress:
-            if entry["exercise_name"] == exercise_name:
-                continue
-            clean_progress.append(entry)
-
-    with open("progress.json", "w") as progress_file:
-        progress_file.write(json.dumps(clean_progress, indent=2))
+    store.remove_exercise(exercise_name)
 
     if has_remote_progress:
-        info("Updating your remote progress as well")
-        add_all()
-        commit(f"Reset progress for {exercise_name}")
-        push("origin", "main")
-
-        prs = get_prs(PROGRESS_REPOSITORY_NAME, "main", username)
-        if len(prs) == 0:
-            warn("No pull request created for progress. Creating one now")
-            pull_request(
-                "git-mastery/progress",
-                "main",
-                f"{username}:main",
-                f"[{username}] Progress",
-                "Automated",
-            )
+        # Pushed by a background process along with any other pending progress, as
+        # verify does
+        add_to_outbox(
+            gitmastery_config, {"exercise_name": exercise_name, "status": "RESET"}
+        )
+        if is_offline():
+            info("Your remote progress will be updated once you are online")
+        else:
+            info("Your remote progress will be updated in the background")
+            flush_in_background(gitmastery_config)
 
     success(
         f"Reset your progress for {click.style(exercise_name, bold=True, italic=True)}"
@@ -1,4 +1,3 @@
-import json
 import os
 
 import click
@@ -7,7 +6,8 @@ from app.commands.check.github import github
 from app.commands.progress.constants import PROGRESS_LOCAL_FOLDER_NAME
 from app.hooks import in_gitmastery_root
 from app.utils.click import error, info, invoke_command, must_get_gitmastery_root_config
-from app.utils.github_cli import get_username
+from app.utils.auth_snapshot import resolve_username
+from app.utils.progress_store import open_progress_store
 
 
 @click.command()
@@ -25,13 +25,11 @@ def show() -> None:
         )
 
     if config.progress_remote:
-        invoke_command(github)
+        invoke_command(github, cached=True)
 
-    progress_file_path = config.metadata_dir / PROGRESS_LOCAL_FOLDER_NAME / "progress.json"
-    all_progress = []
-    if os.path.isfile(progress_file_path):
-        with open(progress_file_path, "r") as file:
-            all_progress = json.load(file)
+    all_progress = open_progress_store(
+        config.metadata_dir / PROGRESS_LOCAL_FOLDER_NAME
+    ).read_all()
 
     all_progress.sort(
         key=lambda entry: (entry["exercise_name"], -entry["completed_at"])
@@ -47,7 +45,7 @@ def show() -> None:
         )
 
     if config.progress_remote:
-        username = get_username()
+        username = resolve_username(config)
         dashboard_url = (
             f"https://git-mastery.org/progress-dashboard/#/dashboard/{username}"
         )
@@ -1,4 +1,3 @@
-import json
 import os
 import sys
 
@@ -10,16 +9,19 @@ from app.commands.progress.constants import (
     PROGRESS_LOCAL_FOLDER_NAME,
     STUDENT_PROGRESS_FORK_NAME,
 )
+from app.commands.progress.pull_request import clear_progress_pull_request_cache
 from app.hooks import in_gitmastery_root
 from app.utils.cli import rmtree
 from app.utils.click import (
     confirm,
+    ensure_online,
     error,
     info,
     invoke_command,
     must_get_gitmastery_root_config,
 )
 from app.utils.github_cli import delete_repo, get_username
+from app.utils.progress_store import open_progress_store
 
 
 @click.command()
@@ -33,31 +35,31 @@ def off() -> None:
     if not config.progress_remote:
         error("You have not enabled sync for Git-Mastery yet.")
 
+    ensure_online("Turning off progress sync")
+
     result = confirm("Are you sure you want to turn off syncing?")
     if not result:
         info("Cancelling command")
         sys.exit(0)
 
-    invoke_command(git)
-    invoke_command(github)
+    invoke_command(git, cached=True)
+    invoke_command(github, cached=True)
 
     info("Removing fork")
     username = get_username()
     delete_repo(f"{username}/{STUDENT_PROGRESS_FORK_NAME.format(username=username)}")
     config.progress_remote = False
     config.write()
+    clear_progress_pull_request_cache(config)
 
     progress_dir = config.metadata_dir / PROGRESS_LOCAL_FOLDER_NAME
-    local_progress_filepath = progress_dir / "progress.json"
-    local_progress = []
-    with open(local_progress_filepath, "r") as file:
-        local_progress = json.load(file)
+    store = open_progress_store(progress_dir)
+    local_progress = store.read_all()
 
     rmtree(progress_dir)
     os.makedirs(progress_dir, exist_ok=True)
 
-    # Re-create just the progress folder
-    with open(local_progress_filepath, "a") as progress_file:
-        progress_file.write(json.dumps(local_progress, indent=2))
+    # Re-create just the progress folder, keeping the layout it used
+    store.write_all(local_progress)
 
     info("Successfully removed your remote sync")
@@ -1,6 +1,4 @@
-import json
 import os
-import time
 
 import click
 
@@ -11,9 +9,14 @@ from app.commands.progress.constants import (
     PROGRESS_REPOSITORY_NAME,
     STUDENT_PROGRESS_FORK_NAME,
 )
+from app.commands.progress.pull_request import (
+    clear_progress_pull_request_cache,
+    ensure_progress_pull_request,
+)
 from app.hooks import in_gitmastery_root
 from app.utils.cli import rmtree
 from app.utils.click import (
+    ensure_online,
     info,
     invoke_command,
     must_get_gitmastery_root_config,
@@ -24,14 +27,11 @@ from app.utils.git import add_all, commit, push
 from app.utils.github_cli import (
     clone_with_custom_name,
     fork,
-    get_prs,
     get_username,
     has_fork,
-    pull_request,
+    wait_for_fork,
 )
-
-NUM_RETRIES = 3
-CLONE_RETRY_INITIAL_SLEEP = 3
+from app.utils.progress_store import open_progress_store
 
 
 @click.command()
@@ -42,8 +42,9 @@ def on() -> None:
     """
     config = must_get_gitmastery_root_config()
 
-    invoke_command(git)
-    invoke_command(github)
+    ensure_online("Turning on progress sync")
+    invoke_command(git, cached=True)
+    invoke_command(github, cached=True)
 
     info("Syncing progress tracker")
     info(
@@ -65,31 +66,19 @@ def on() -> None:
     # before cloning again. This should automatically setup the origin and upstream
     # remotes as well
     progress_dir = config.metadata_dir / PROGRESS_LOCAL_FOLDER_NAME
-    local_progress = []
-    local_progress_filepath = progress_dir / "progress.json"
-    if os.path.isfile(local_progress_filepath):
-        with open(local_progress_filepath, "r") as file:
-            local_progress = json.load(file)
-
-    # GitHub fork creation is async; retry clone until it succeeds
-    cloned = False
-    for attempt in range(NUM_RETRIES):
-        if attempt > 0:
-            sleep_duration = CLONE_RETRY_INITIAL_SLEEP * (2 ** (attempt - 1))
-            info(
-                f"Clone failed, retrying (attempt {attempt + 1}/{NUM_RETRIES}) in {sleep_duration}s..."
-            )
-            rmtree(progress_dir)
-            time.sleep(sleep_duration)
-        clone_with_custom_name(f"{username}/{fork_name}", str(progress_dir))
-        if os.path.exists(os.path.join(progress_dir, ".git")):
-            cloned = True
-            break
+    local_store = open_progress_store(progress_dir)
+    local_progress = local_store.read_all()
+
+    # GitHub fork creation is async; wait until the fork can be cloned
+    if not wait_for_fork(f"{username}/{fork_name}"):
+        warn("Your fork is taking a while to be created, cloning anyway")
+    if os.path.isdir(progress_dir):
+        rmtree(progress_dir)
+    clone_with_custom_name(f"{username}/{fork_name}", str(progress_dir))
+    cloned = os.path.exists(os.path.join(progress_dir, ".git"))
 
     if not cloned:
-        os.makedirs(os.path.dirname(local_progress_filepath), exist_ok=True)
-        with open(local_progress_filepath, "w") as file:
-            file.write(json.dumps(local_progress, indent=2))
+        local_store.write_all(local_progress)
         raise RuntimeError(
             f"Clone failed for {progress_dir}. "
             "Your local progress has been restored. "
@@ -98,10 +87,9 @@ def on() -> None:
 
     # To reconcile the difference between local and remote progress, we merge by
     # (exercise_name, start_time) which should be unique
-    remote_progress = []
-    if os.path.isfile(local_progress_filepath):
-        with open(local_progress_filepath, "r") as file:
-            remote_progress = json.load(file)
+    # The layout of the remote repository is kept, whichever one the local folder used
+    remote_store = open_progress_store(progress_dir)
+    remote_progress = remote_store.read_all()
 
     synced_progress = []
     seen = set()
@@ -117,8 +105,7 @@ def on() -> None:
         key=lambda entry: (entry["exercise_name"], entry["started_at"])
     )
 
-    with open(local_progress_filepath, "w") as file:
-        file.write(json.dumps(synced_progress, indent=2))
+    remote_store.write_all(synced_progress)
 
     # If we have seen more unique entries than what was stored remotely, we need to
     # push the changes
@@ -129,16 +116,9 @@ def on() -> None:
         commit("Sync progress with local machine")
         push("origin", "main")
 
-    prs = get_prs(PROGRESS_REPOSITORY_NAME, "main", username)
-    if len(prs) == 0:
-        warn("No pull request created for progress. Creating one now")
-        pull_request(
-            "git-mastery/progress",
-            "main",
-            f"{username}:main",
-            f"[{username}] Progress",
-            "Automated",
-        )
+    # The fork may have been re-created, so its pull request is looked up again
+    clear_progress_pull_request_cache(config)
+    ensure_progress_pull_request(config, username)
 
     success("You have setup the progress tracker for Git-Mastery!")
 
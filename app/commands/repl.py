@@ -3,30 +3,47 @@ import os
 import shlex
 import subprocess
 import sys
-from typing import List
+import time
+from typing import Any, Dict, List, Optional
 
 import click
 
 from app.aliases import COMMAND_ALIASES, resolve_alias
+from app.commands.bundle import bundle
 from app.commands.check import check
 from app.commands.download import download
+from app.commands.list_exercises import list_exercises
+from app.commands.prefetch import prefetch
 from app.commands.progress.progress import progress
+from app.commands.serve_cache import serve_cache
 from app.commands.setup_folder import setup
+from app.commands.stats import stats
 from app.commands.verify import verify
 from app.commands.version import version
-from app.utils.click import CliContextKey, ClickColor
+from app.commands.worker import worker
+from app.utils.click import ClickColor, CliContextKey
+from app.utils.jobs import JOB_POLL_INTERVAL, Job, JobManager
+from app.utils.session import GitMasterySession
 from app.utils.version import Version
+from app.utils.warmup import SessionWarmup
 from app.version import __version__
 
-
 GITMASTERY_COMMANDS = {
+    "bundle": bundle,
     "check": check,
     "download": download,
+    "list": list_exercises,
+    "prefetch": prefetch,
     "progress": progress,
+    "serve-cache": serve_cache,
     "setup": setup,
+    "stats": stats,
     "verify": verify,
     "version": version,
+    "worker": worker,
 }
+# Commands that ask for input, which background jobs are unable to give
+PROMPTING_COMMANDS = [["setup"], ["progress", "sync", "off"]]
 
 
 class GitMasteryREPL(cmd.Cmd):
@@ -54,10 +71,37 @@ Shell commands are also supported.
         fg=ClickColor.BRIGHT_CYAN,
     )
 
-    def __init__(self) -> None:
+    def __init__(self, offline: bool = False) -> None:
         super().__init__()
+        self.offline = offline
+        # Shared by every command so the exercises repository, configs and compiled
+        # exercise_utils stay warm between commands
+        self.session = GitMasterySession()
+        self.warmup = SessionWarmup(self.session, self._make_context_obj())
+        self.jobs = JobManager()
+        self.exit_warned = False
         self._update_prompt()
 
+    def _make_context_obj(self) -> Dict[str, Any]:
+        return {
+            CliContextKey.VERBOSE: False,
+            CliContextKey.VERSION: Version.parse_version_string(__version__),
+            CliContextKey.OFFLINE: self.offline,
+            CliContextKey.SESSION: self.session,
+        }
+
+    def preloop(self) -> None:
+        """Warm the session up while the user types their first command."""
+        self.warmup.start()
+
+    def close(self) -> None:
+        self.jobs.close()
+        self.warmup.cancel()
+        # A warmup still opening the exercises repository is left to the process exit,
+        # rather than making the user wait for it
+        if not self.warmup.is_alive():
+            self.session.close()
+
     def _update_prompt(self) -> None:
         """Update prompt to show current directory."""
         cwd = os.path.basename(os.getcwd()) or os.getcwd()
@@ -65,6 +109,11 @@ Shell commands are also supported.
 
     def postcmd(self, stop: bool, line: str) -> bool:
         """Update prompt after each command."""
+        for job in self.jobs.take_finished():
+            click.echo(
+                f"[{job.job_id}] {self._describe_status(job)}: {job.command_line} "
+                f"(use /fg {job.job_id} to see its output)"
+            )
         self._update_prompt()
         return stop
 
@@ -90,6 +139,12 @@ Shell commands are also supported.
         args = parts[1:]
 
         if command_name.lower() == "gitmastery":
+            # The & may also be attached to the last word, as in a shell
+            in_background = len(args) > 0 and args[-1].endswith("&")
+            if in_background:
+                args[-1] = args[-1][:-1]
+                if args[-1] == "":
+                    args.pop()
             if not args:
                 return
             gitmastery_command = resolve_alias(args[0])
@@ -97,6 +152,10 @@ Shell commands are also supported.
                 return self.do_exit("")  # type: ignore[return-value]
             elif gitmastery_command == "help":
                 self.do_help("")
+            elif gitmastery_command in ("jobs", "wait", "fg"):
+                getattr(self, f"do_{gitmastery_command}")(" ".join(args[1:]))
+            elif gitmastery_command in GITMASTERY_COMMANDS and in_background:
+                self._start_job(gitmastery_command, args[1:])
             elif gitmastery_command in GITMASTERY_COMMANDS:
                 self._run_gitmastery_command(gitmastery_command, args[1:])
             else:
@@ -117,8 +176,7 @@ Shell commands are also supported.
         try:
             ctx = command.make_context(f"/{command_name}", args)
             ctx.ensure_object(dict)
-            ctx.obj[CliContextKey.VERBOSE] = False
-            ctx.obj[CliContextKey.VERSION] = Version.parse_version_string(__version__)
+            ctx.obj.update(self._make_context_obj())
             with ctx:
                 command.invoke(ctx)
         except click.ClickException as e:
@@ -173,8 +231,104 @@ Shell commands are also supported.
             )
         return False
 
+    def _start_job(self, command_name: str, args: List[str]) -> None:
+        command_path = [command_name, *args]
+        for prompting_command in PROMPTING_COMMANDS:
+            if command_path[: len(prompting_command)] == prompting_command:
+                click.echo(
+                    click.style(
+                        f"{' '.join(prompting_command)} asks for input, so it cannot run in the background.",
+                        fg=ClickColor.BRIGHT_RED,
+                    )
+                )
+                return
+
+        job = self.jobs.start(command_path, self.offline)
+        click.echo(f"[{job.job_id}] Started {job.command_line}")
+
+    def _describe_status(self, job: Job) -> str:
+        if job.is_running:
+            return "Running"
+        returncode = job.process.returncode
+        return "Done" if returncode == 0 else f"Failed (exit {returncode})"
+
+    def _get_job(self, arg: str) -> Optional[Job]:
+        job_id = arg.strip().lstrip("%")
+        if job_id != "" and not job_id.isdigit():
+            click.echo(click.style(f"Invalid job ID: {arg}", fg=ClickColor.BRIGHT_RED))
+            return None
+        job = self.jobs.get(int(job_id) if job_id else None)
+        if job is None:
+            click.echo(click.style("No such job.", fg=ClickColor.BRIGHT_RED))
+        return job
+
+    def _follow_job(self, job: Job, offset: int = 0) -> None:
+        """Print the output of a job as it is written until the job finishes."""
+        try:
+            while True:
+                running = job.is_running
+                chunk = job.read_output(offset)
+                if chunk:
+                    click.echo(chunk.decode("utf-8", errors="replace"), nl=False)
+                    offset += len(chunk)
+                if not running:
+                    break
+                time.sleep(JOB_POLL_INTERVAL)
+        except KeyboardInterrupt:
+            click.echo(f"\n[{job.job_id}] Still running in the background")
+            return
+        job.reported = True
+        click.echo(f"[{job.job_id}] {self._describe_status(job)}: {job.command_line}")
+
+    def do_jobs(self, arg: str) -> bool:
+        """List the background jobs."""
+        if len(self.jobs.jobs) == 0:
+            click.echo("No background jobs.")
+            return False
+        for job in self.jobs.jobs:
+            click.echo(
+                f"[{job.job_id}] {self._describe_status(job):<18} {job.elapsed:>8.1f}s  {job.command_line}"
+            )
+            if not job.is_running:
+                job.reported = True
+        return False
+
+    def do_fg(self, arg: str) -> bool:
+        """Show the output of a background job, following it until it finishes."""
+        job = self._get_job(arg)
+        if job is not None:
+            self._follow_job(job)
+        return False
+
+    def do_wait(self, arg: str) -> bool:
+        """Wait for a background job, or all of them, then show their output."""
+        jobs = [self._get_job(arg)] if arg.strip() else self.jobs.running
+        try:
+            while any(job is not None and job.is_running for job in jobs):
+                time.sleep(JOB_POLL_INTERVAL)
+        except KeyboardInterrupt:
+            click.echo(
+                "\nStopped waiting, the jobs are still running in the background"
+            )
+            return False
+        for job in jobs:
+            if job is not None:
+                self._follow_job(job)
+        return False
+
     def do_exit(self, args: str) -> bool:
         """Exit the Git-Mastery REPL."""
+        running = self.jobs.running
+        if len(running) > 0 and not self.exit_warned:
+            self.exit_warned = True
+            click.echo(
+                click.style(
+                    f"Background jobs are still running ({len(running)}). "
+                    "Exit again to stop them, or use /wait to let them finish.",
+                    fg=ClickColor.BRIGHT_YELLOW,
+                )
+            )
+            return False
         click.echo(click.style("Goodbye!", fg=ClickColor.BRIGHT_CYAN))
         return True
 
@@ -199,10 +353,17 @@ Shell commands are also supported.
         )
         for name, desc in [
             ("/help", "Show this help message"),
+            ("/jobs", "List the background jobs"),
+            ("/fg [ID]", "Follow the output of a background job"),
+            ("/wait [ID]", "Wait for background jobs to finish"),
             ("/exit", "Exit the REPL"),
             ("/quit", "Exit the REPL"),
         ]:
             click.echo(f"  {click.style(f'{name:<20}', bold=True)} {desc}")
+        click.echo(
+            "\nEnd a Git-Mastery command with & to run it in the background, "
+            "e.g. /download under-control &"
+        )
         click.echo()
         return False
 
@@ -217,12 +378,16 @@ Shell commands are also supported.
 
 
 @click.command()
-def repl() -> None:
+@click.pass_context
+def repl(ctx: click.Context) -> None:
     """Start an interactive REPL session."""
-    repl_instance = GitMasteryREPL()
+    offline = ctx.obj.get(CliContextKey.OFFLINE, False) if ctx.obj else False
+    repl_instance = GitMasteryREPL(offline)
 
     try:
         repl_instance.cmdloop()
     except KeyboardInterrupt:
         click.echo(click.style("\nInterrupted. Goodbye!", fg=ClickColor.BRIGHT_CYAN))
         sys.exit(0)
+    finally:
+        repl_instance.close()
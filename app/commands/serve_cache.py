@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from app.commands.bundle import export_exercises
+from app.commands.prefetch import select_exercises
+from app.configs.gitmastery_config import GitMasteryConfig
+from app.hooks import in_gitmastery_root
+from app.utils.cache_server import CacheServer
+from app.utils.catalog import get_catalog_dir
+from app.utils.click import (
+    ensure_online,
+    info,
+    must_get_gitmastery_root_config,
+    success,
+    warn,
+)
+from app.utils.git import get_remote_commit
+from app.utils.gitmastery import ExercisesRepo
+
+SERVE_CACHE_FOLDER_NAME = "serve"
+DEFAULT_SERVE_CACHE_PORT = 8765
+DEFAULT_REFRESH_MINUTES = 60
+
+
+def _get_upstream_commit(
+    exercises_source: GitMasteryConfig.ExercisesSource,
+) -> Optional[str]:
+    if exercises_source.type != "remote":
+        return None
+    if exercises_source.commit is not None:
+        return exercises_source.commit
+    if exercises_source.branch is None:
+        return None
+    return get_remote_commit(exercises_source.to_url(), exercises_source.branch)
+
+
+def _build_bundle(serve_dir: Path, catalog_dir: Path) -> Path:
+    os.makedirs(serve_dir, exist_ok=True)
+    # Every build gets its own file so requests in flight keep reading the old one
+    bundle_path = serve_dir / f"exercises-{time.time_ns()}.gmbundle"
+    with ExercisesRepo() as repo:
+        formatted_exercises = select_exercises(repo, (), (), catalog_dir)
+        export_exercises(repo, formatted_exercises, bundle_path)
+    return bundle_path
+
+
+def _refresh(
+    ctx: click.Context,
+    server: CacheServer,
+    config: GitMasteryConfig,
+    serve_dir: Path,
+    interval: float,
+) -> None:
+    # The bundle last replaced, which may still be opened by a request that looked it
+    # up just before it was replaced, so it is only removed on the next refresh
+    retired_path: Optional[Path] = None
+    with ctx:
+        while True:
+            time.sleep(interval)
+            published = server.get_published()
+            upstream_commit = _get_upstream_commit(config.exercises_source)
+            if (
+                published is not None
+                and upstream_commit is not None
+                and upstream_commit == published[2]
+            ):
+                continue
+
+            try:
+                bundle_path = _build_bundle(serve_dir, get_catalog_dir(config))
+            except Exception as e:
+                warn(
+                    f"Unable to refresh the exercises, still serving the old ones: {e}"
+                )
+                continue
+            server.publish(bundle_path)
+            if retired_path is not None:
+                retired_path.unlink(missing_ok=True)
+            retired_path = published[0] if published is not None else None
+            info("Refreshed the exercises being served")
+
+
+@click.command(name="serve-cache")
+@click.option(
+    "--host", default="0.0.0.0", show_default=True, help="Address to listen on."
+)
+@click.option(
+    "--port",
+    default=DEFAULT_SERVE_CACHE_PORT,
+    show_default=True,
+    help="Port to listen on.",
+)
+@click.option(
+    "--refresh",
+    default=DEFAULT_REFRESH_MINUTES,
+    show_default=True,
+    help="Minutes between checks for changes to the exercises. Use 0 to never check.",
+)
+@in_gitmastery_root()
+def serve_cache(host: str, port: int, refresh: int) -> None:
+    """
+    Serves the exercises to other machines so that they are fetched from Github once.
+    """
+    config = must_get_gitmastery_root_config()
+    if config.exercises_source.type == "remote":
+        ensure_online("Serving the exercises")
+
+    serve_dir = config.cache_dir / SERVE_CACHE_FOLDER_NAME
+    # Bundles left behind by a previous run are stale
+    for stale_bundle in serve_dir.glob("*.gmbundle"):
+        stale_bundle.unlink(missing_ok=True)
+
+    info("Fetching every exercise to serve")
+    server = CacheServer((host, port))
+    server.publish(_build_bundle(serve_dir, get_catalog_dir(config)))
+
+    if refresh > 0:
+        threading.Thread(
+            target=_refresh,
+            args=(click.get_current_context(), server, config, serve_dir, refresh * 60),
+            daemon=True,
+        ).start()
+
+    url = f"http://{host if host != '0.0.0.0' else '<this machine>'}:{server.server_address[1]}"
+    success(f"Serving the exercises at {click.style(url, bold=True)}")
+    info(
+        "Point other machines at it by setting exercises_source in .gitmastery/config.json to "
+        + click.style(f'{{"type": "mirror", "url": "{url}"}}', bold=True)
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        info("Stopped serving the exercises")
+    finally:
+        server.server_close()
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import click
+
+from app.hooks import in_gitmastery_root
+from app.utils.click import info, must_get_gitmastery_root_config, warn
+from app.utils.metrics import group_by_command_type, percentile, read_metrics
+
+
+@click.command()
+@click.option(
+    "--slowest",
+    default=5,
+    show_default=True,
+    help="Number of slowest invocations to list.",
+)
+@in_gitmastery_root()
+def stats(slowest: int) -> None:
+    """
+    Summarizes the time spent on external Git and Github CLI calls.
+    """
+    config = must_get_gitmastery_root_config()
+    metrics = read_metrics(config.metadata_dir)
+    if len(metrics) == 0:
+        warn("No command metrics have been recorded yet.")
+        return
+
+    info(f"Aggregated {len(metrics)} recorded command invocations")
+
+    groups = group_by_command_type(metrics)
+    rows = []
+    for command_type, group in groups.items():
+        durations = [metric.duration for metric in group]
+        failures = sum(1 for metric in group if metric.returncode != 0)
+        rows.append(
+            (
+                command_type,
+                len(group),
+                failures,
+                percentile(durations, 50),
+                percentile(durations, 95),
+                sum(durations),
+            )
+        )
+    # Surface the calls that dominate the total time first
+    rows.sort(key=lambda row: row[5], reverse=True)
+
+    header = f"{'Command':<20} {'Calls':>6} {'Failed':>6} {'p50 (s)':>8} {'p95 (s)':>8} {'Total (s)':>10}"
+    click.echo(click.style(header, bold=True))
+    for command_type, calls, failures, p50, p95, total in rows:
+        click.echo(
+            f"{command_type:<20} {calls:>6} {failures:>6} {p50:>8.3f} {p95:>8.3f} {total:>10.3f}"
+        )
+
+    if slowest <= 0:
+        return
+
+    click.echo()
+    info(click.style(f"Slowest {slowest} invocations:", bold=True))
+    for metric in sorted(metrics, key=lambda m: m.duration, reverse=True)[:slowest]:
+        ran_at = datetime.fromtimestamp(metric.started_at).strftime("%Y-%m-%d %H:%M:%S")
+        click.echo(
+            f"\t- {metric.duration:.3f}s [{ran_at}] (exit {metric.returncode}) {' '.join(metric.command)}"
+        )
@@ -1,35 +1,57 @@
+import csv
+import dataclasses
 import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import click
 import pytz
-from git_autograder import (
-    GitAutograderExercise,
-    GitAutograderInvalidStateException,
-    GitAutograderStatus,
-    GitAutograderWrongAnswerException,
-)
+from git_autograder import GitAutograderStatus
 from git_autograder.output import GitAutograderOutput
 
-from app.commands.progress.constants import (
-    PROGRESS_LOCAL_FOLDER_NAME,
-    PROGRESS_REPOSITORY_NAME,
+from app.commands.progress.constants import PROGRESS_LOCAL_FOLDER_NAME
+from app.configs.exercise_config import GITMASTERY_EXERCISE_CONFIG_NAME, ExerciseConfig
+from app.configs.gitmastery_config import (
+    GITMASTERY_CONFIG_NAME,
+    METADATA_FOLDER_NAME,
+    GitMasteryConfig,
 )
+from app.configs.utils import find_root
 from app.hooks import in_gitmastery_root
 from app.hooks.in_exercise_root import in_exercise_root
+from app.utils.autograder import output_from_dict
 from app.utils.click import (
     ClickColor,
+    CliContextKey,
     error,
     info,
     must_get_exercise_root_config,
     must_get_gitmastery_root_config,
     warn,
 )
-from app.utils.git import add_all, commit, push
-from app.utils.github_cli import get_prs, get_username, pull_request
-from app.utils.gitmastery import ExercisesRepo, Namespace
+from app.utils.gitmastery import ExercisesRepo, Namespace, ScriptSources
+from app.utils.progress_outbox import add_to_outbox, flush_in_background
+from app.utils.progress_store import open_progress_store
+from app.utils.verify_cache import (
+    compute_cache_key,
+    is_cacheable,
+    read_cached_output,
+    write_cached_output,
+)
+from app.utils.verify_runner import (
+    BatchVerifyResult,
+    BatchVerifyTask,
+    ScriptKey,
+    error_output,
+    init_batch_worker,
+    run_batch_task,
+    run_verify,
+)
+from app.utils.watch import create_watcher
 
 
 def _get_output_status_text(output: GitAutograderOutput) -> str:
@@ -70,8 +92,6 @@ def _print_output(output: GitAutograderOutput) -> None:
 
 
 def _submit_progress(output: GitAutograderOutput) -> None:
-    username = get_username()
-
     config = must_get_gitmastery_root_config()
     progress_local = config.progress_local
 
@@ -88,10 +108,10 @@ def _submit_progress(output: GitAutograderOutput) -> None:
 
     info("Saving progress of attempt")
     os.chdir(config.metadata_dir / PROGRESS_LOCAL_FOLDER_NAME)
-    if not os.path.isfile("progress.json"):
+    store = open_progress_store(config.metadata_dir / PROGRESS_LOCAL_FOLDER_NAME)
+    if not store.exists():
         warn("Progress tracking file not created yet, doing that now")
-        with open("progress.json", "w") as progress_file:
-            progress_file.write(json.dumps([]))
+        store.write_all([])
 
     entry = {
         "exercise_name": output.exercise_name,
@@ -102,107 +122,391 @@ def _submit_progress(output: GitAutograderOutput) -> None:
         "comments": output.comments,
         "status": _get_output_status_text(output),
     }
-    current_progress = []
-    with open("progress.json", "r") as progress_file:
-        current_progress = json.loads(progress_file.read())
 
     # If the existing progress already contains a SUCCESSFUL, we can skip submitting the progress
-    for e in current_progress:
-        if e["exercise_name"] == output.exercise_name and e["status"] == "SUCCESSFUL":
+    for e in store.read_exercise(output.exercise_name or ""):
+        if e["status"] == "SUCCESSFUL":
             info(
                 "You have already completed this exercise. Your latest submission will not be tracked"
             )
             return
 
-    current_progress.append(entry)
-    with open("progress.json", "w") as progress_file:
-        progress_file.write(json.dumps(current_progress, indent=2))
+    store.append(entry)
 
     progress_remote = config.progress_remote
     if progress_remote:
-        info("Updating your remote progress as well")
-        add_all()
-        commit("Update progress")
-        push("origin", "main")
-
-        prs = get_prs(PROGRESS_REPOSITORY_NAME, "main", username)
-        if len(prs) == 0:
-            warn("No pull request created for progress. Creating one now")
-            pull_request(
-                "git-mastery/progress",
-                "main",
-                f"{username}:main",
-                f"[{username}] Progress",
-                "Automated",
-            )
+        # Pushing is slow and may fail while offline, so it is left to a background
+        # process that batches every pending update into a single push
+        add_to_outbox(
+            config,
+            {"exercise_name": output.exercise_name, "status": entry["status"]},
+        )
+        info("Your remote progress will be updated in the background")
+        flush_in_background(config)
 
     info("Updated your progress")
 
 
-def _execute_verify(
-    exercise_path: Path,
-    exercise_name: str,
-    formatted_exercise_name: str,
-    started_at: datetime,
-) -> GitAutograderOutput:
-    with ExercisesRepo() as repo:
+def _fetch_verify_sources(config: ExerciseConfig) -> ScriptSources:
+    # The exercise was set up by the scripts of the commit it was downloaded from, so
+    # it is verified by the same ones, which also avoids looking up the branch
+    with ExercisesRepo(commit=config.source_commit) as repo:
+        return ScriptSources.fetch(repo, f"{config.formatted_exercise_name}/verify.py")
+
+
+def _watch_verify(
+    gitmastery_config: GitMasteryConfig,
+    config: ExerciseConfig,
+    sources: ScriptSources,
+    limits: GitMasteryConfig.VerifyLimits,
+) -> None:
+    # The verification script is only loaded once and re-used across runs
+    try:
+        namespace = Namespace.load_sources_as_namespace(sources)
+    except Exception as e:
+        error(f"Failed to load the verification script: {e}")
+
+    last_key = None
+    with create_watcher(config.path) as watcher:
         try:
-            os.chdir(exercise_path)
-            exercise = GitAutograderExercise(exercise_path)
-            namespace = Namespace.load_file_as_namespace(
-                repo, f"{formatted_exercise_name}/verify.py"
-            )
-            return namespace.execute_function(
-                "verify",
-                {"exercise": exercise},  # type: ignore
-            )
-        except (
-            GitAutograderInvalidStateException,
-            GitAutograderWrongAnswerException,
-        ) as e:
-            return GitAutograderOutput(
-                exercise_name=exercise_name,
-                started_at=started_at,
-                completed_at=datetime.now(tz=pytz.UTC),
-                comments=[e.message] if isinstance(e.message, str) else e.message,
-                status=(
-                    GitAutograderStatus.ERROR
-                    if isinstance(e, GitAutograderInvalidStateException)
-                    else GitAutograderStatus.UNSUCCESSFUL
-                ),
+            while True:
+                # Events are also raised when Git merely refreshes its index, so only
+                # re-verify when the fingerprint of the attempt actually changes
+                key = compute_cache_key(config, sources)
+                if key != last_key:
+                    started_at = datetime.now(tz=pytz.UTC)
+                    click.echo()
+                    if last_key is not None:
+                        info(
+                            f"Change detected at {started_at.astimezone().strftime('%H:%M:%S')}, verifying again"
+                        )
+                    last_key = key
+                    output = run_verify(
+                        config.path,
+                        config.exercise_name,
+                        sources,
+                        started_at,
+                        limits,
+                        namespace,
+                    )
+                    _print_output(output)
+                    if (
+                        is_cacheable(config)
+                        and output.status != GitAutograderStatus.ERROR
+                    ):
+                        write_cached_output(
+                            gitmastery_config.cache_dir,
+                            config.exercise_name,
+                            key,
+                            output,
+                        )
+                    _submit_progress(output)
+                    os.chdir(config.path)
+                    info(
+                        f"Watching {click.style(config.exercise_name, bold=True, italic=True)} for changes, press Ctrl+C to stop"
+                    )
+                watcher.wait_for_change()
+        except KeyboardInterrupt:
+            click.echo()
+            info("Stopped watching for changes")
+
+
+def _discover_exercises(paths: Tuple[Path, ...]) -> List[ExerciseConfig]:
+    configs: Dict[Path, ExerciseConfig] = {}
+    for path in paths:
+        for root, dirs, files in os.walk(path.resolve()):
+            if GITMASTERY_EXERCISE_CONFIG_NAME in files:
+                root_path = Path(root)
+                configs[root_path] = ExerciseConfig.read(root_path, 0)
+                # Exercises are never nested, so the attempt itself is not searched
+                dirs.clear()
+                continue
+            # The Git-Mastery folder keeps copies of exercise configs in its cache
+            dirs[:] = [d for d in dirs if d not in (".git", METADATA_FOLDER_NAME)]
+    return sorted(configs.values(), key=lambda config: config.path)
+
+
+def _write_batch_summary(
+    results: List[BatchVerifyResult], summary_path: Path, summary_format: str
+) -> None:
+    rows = [
+        {
+            "path": str(result.exercise_path),
+            "exercise_name": result.exercise_name,
+            "status": result.output["status"],
+            "duration": round(result.duration, 3),
+            "started_at": result.output["started_at"],
+            "completed_at": result.output["completed_at"],
+            "comments": result.output["comments"] or [],
+        }
+        for result in results
+    ]
+    with open(summary_path, "w", newline="") as summary_file:
+        if summary_format == "json":
+            summary_file.write(json.dumps(rows, indent=2))
+            return
+
+        writer = csv.DictWriter(summary_file, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({**row, "comments": "\n".join(row["comments"])})
+
+
+def _resolve_limits(
+    gitmastery_config: Optional[GitMasteryConfig], overrides: Dict[str, Optional[int]]
+) -> GitMasteryConfig.VerifyLimits:
+    limits = (
+        gitmastery_config.verify_limits
+        if gitmastery_config is not None
+        else GitMasteryConfig.VerifyLimits()
+    )
+    return dataclasses.replace(
+        limits, **{key: value for key, value in overrides.items() if value is not None}
+    )
+
+
+def _verify_batch(
+    paths: Tuple[Path, ...],
+    jobs: Optional[int],
+    summary_path: Optional[Path],
+    summary_format: str,
+    limit_overrides: Dict[str, Optional[int]],
+) -> None:
+    configs = _discover_exercises(paths)
+    if len(configs) == 0:
+        error("No Git-Mastery exercise folders found.")
+
+    exercise_names = sorted({config.formatted_exercise_name for config in configs})
+    info(
+        f"Found {len(configs)} exercise folders across {len(exercise_names)} exercises"
+    )
+
+    # Batches may be run outside of a Git-Mastery root, in which case the default
+    # exercises source is used
+    root = find_root(GITMASTERY_CONFIG_NAME, folder=METADATA_FOLDER_NAME)
+    gitmastery_config = None
+    if root is not None:
+        gitmastery_config = GitMasteryConfig.read(*root)
+        click.get_current_context().obj[CliContextKey.GITMASTERY_ROOT_CONFIG] = (
+            gitmastery_config
+        )
+    limits = _resolve_limits(gitmastery_config, limit_overrides)
+
+    # Each distinct verification script is fetched once and shared by all workers.
+    # Like a single verification, folders use the script of the commit they were
+    # downloaded from
+    exercises_by_commit: Dict[Optional[str], List[str]] = {}
+    for formatted_exercise_name, source_commit in sorted(
+        {(config.formatted_exercise_name, config.source_commit) for config in configs},
+        key=lambda key: (key[0], key[1] or ""),
+    ):
+        exercises_by_commit.setdefault(source_commit, []).append(
+            formatted_exercise_name
+        )
+
+    scripts: Dict[ScriptKey, ScriptSources] = {}
+    for source_commit, formatted_exercise_names in exercises_by_commit.items():
+        with ExercisesRepo(commit=source_commit) as repo:
+            for formatted_exercise_name in formatted_exercise_names:
+                try:
+                    scripts[(formatted_exercise_name, source_commit)] = (
+                        ScriptSources.fetch(
+                            repo, f"{formatted_exercise_name}/verify.py"
+                        )
+                    )
+                except Exception as e:
+                    warn(
+                        f"Unable to load verification for {formatted_exercise_name}: {e}"
+                    )
+
+    tasks = [
+        BatchVerifyTask(
+            exercise_path=config.path,
+            exercise_name=config.exercise_name,
+            script=(config.formatted_exercise_name, config.source_commit),
+        )
+        for config in configs
+    ]
+
+    results: List[BatchVerifyResult] = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=init_batch_worker,
+        initargs=(scripts, limits),
+    ) as executor:
+        futures = [executor.submit(run_batch_task, task) for task in tasks]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            output = output_from_dict(result.output)
+            status = click.style(
+                _get_output_status_text(output), fg=_get_output_status_color(output)
             )
-        except Exception as e:
-            # Unexpected exception
-            return GitAutograderOutput(
-                exercise_name=exercise_name,
-                started_at=started_at,
-                completed_at=datetime.now(tz=pytz.UTC),
-                comments=[str(e)],
-                status=GitAutograderStatus.ERROR,
+            info(
+                f"[{len(results)}/{len(tasks)}] {result.exercise_path}: {status} ({result.duration:.2f}s)"
             )
 
+    results.sort(key=lambda result: result.exercise_path)
+    statuses = [result.output["status"] for result in results]
+    info(
+        f"Verified {len(results)} exercise folders in {time.perf_counter() - start:.2f}s: "
+        f"{statuses.count(GitAutograderStatus.SUCCESSFUL)} completed, "
+        f"{statuses.count(GitAutograderStatus.UNSUCCESSFUL)} incomplete, "
+        f"{statuses.count(GitAutograderStatus.ERROR)} errors"
+    )
+
+    if summary_path is not None:
+        _write_batch_summary(results, summary_path, summary_format)
+        info(f"Wrote summary to {click.style(str(summary_path), bold=True)}")
+
 
-@click.command()
 @in_exercise_root()
 @in_gitmastery_root()
-def verify() -> None:
-    """
-    Verifies the state of the exercise attempt.
-    """
+def _verify_exercise(
+    no_cache: bool, watch: bool, limit_overrides: Dict[str, Optional[int]]
+) -> None:
     started_at = datetime.now(tz=pytz.UTC)
 
+    gitmastery_config = must_get_gitmastery_root_config()
     config = must_get_exercise_root_config()
+    limits = _resolve_limits(gitmastery_config, limit_overrides)
 
     exercise_path = config.path
     exercise_name = config.exercise_name
-    formatted_exercise_name = config.formatted_exercise_name
 
     info(
         f"Starting verification of {click.style(exercise_name, bold=True, italic=True)}"
     )
 
-    output = _execute_verify(
-        exercise_path, exercise_name, formatted_exercise_name, started_at
-    )
+    try:
+        sources = _fetch_verify_sources(config)
+    except Exception as e:
+        output = error_output(exercise_name, started_at, [str(e)])
+        _print_output(output)
+        _submit_progress(output)
+        return
+
+    if watch:
+        _watch_verify(gitmastery_config, config, sources, limits)
+        return
+
+    cache_key = None
+    if not no_cache and is_cacheable(config):
+        cache_key = compute_cache_key(config, sources)
+        cached_output = read_cached_output(
+            gitmastery_config.cache_dir, exercise_name, cache_key
+        )
+        if cached_output is not None:
+            # The previous attempt has already been recorded in the progress
+            info("Nothing has changed since your last verification, reusing its result")
+            _print_output(cached_output)
+            return
+
+    output = run_verify(exercise_path, exercise_name, sources, started_at, limits)
     _print_output(output)
+    # Errors may be caused by the environment rather than the attempt, so they are
+    # always re-verified
+    if cache_key is not None and output.status != GitAutograderStatus.ERROR:
+        write_cached_output(
+            gitmastery_config.cache_dir, exercise_name, cache_key, output
+        )
     _submit_progress(output)
+
+
+@click.command()
+@click.argument(
+    "paths",
+    nargs=-1,
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+)
+@click.option(
+    "--all",
+    "verify_all",
+    is_flag=True,
+    help="Verify every exercise folder found under the given paths or the current folder.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of exercise folders to verify in parallel. Defaults to the number of CPUs.",
+)
+@click.option(
+    "--summary",
+    "summary_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="File to write the summary of a batch verification to.",
+)
+@click.option(
+    "--summary-format",
+    type=click.Choice(["csv", "json"]),
+    default="csv",
+    show_default=True,
+    help="Format of the batch verification summary.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Always re-run the verification, even if nothing changed since the last attempt.",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="Keep verifying the exercise whenever its files or Git state change.",
+)
+@click.option(
+    "--time-limit",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Seconds a verification may run for before it is stopped.",
+)
+@click.option(
+    "--cpu-limit",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Seconds of CPU time a verification may use before it is stopped.",
+)
+@click.option(
+    "--memory-limit",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Megabytes of memory a verification may use.",
+)
+def verify(
+    paths: Tuple[Path, ...],
+    verify_all: bool,
+    jobs: Optional[int],
+    summary_path: Optional[Path],
+    summary_format: str,
+    no_cache: bool,
+    watch: bool,
+    time_limit: Optional[int],
+    cpu_limit: Optional[int],
+    memory_limit: Optional[int],
+) -> None:
+    """
+    Verifies the state of the exercise attempt.
+
+    Pass exercise folders as PATHS, or use --all, to verify every exercise folder found
+    under them in parallel without recording progress.
+
+    When any limit is given, here or under verify_limits in the Git-Mastery config,
+    the verification runs in a separate process that is stopped once a limit is hit.
+    """
+    limit_overrides = {
+        "wall_time": time_limit,
+        "cpu_time": cpu_limit,
+        "memory": memory_limit,
+    }
+    if paths or verify_all:
+        if watch:
+            error("--watch can only be used when verifying a single exercise.")
+        _verify_batch(
+            paths or (Path.cwd(),), jobs, summary_path, summary_format, limit_overrides
+        )
+        return
+
+    _verify_exercise(no_cache, watch, limit_overrides)
@@ -0,0 +1,136 @@
+import socket
+import subprocess
+import time
+from pathlib import Path
+
+import click
+
+from app.hooks import in_gitmastery_root
+from app.utils.click import error, info, must_get_gitmastery_root_config, success
+from app.utils.command import get_gitmastery_command
+from app.worker.client import WORKER_SOCKET_NAME, connect_to_worker, send_request
+
+DEFAULT_IDLE_TIMEOUT_MINUTES = 30
+WORKER_START_TIMEOUT = 10.0
+
+
+def _ensure_supported() -> None:
+    if not hasattr(socket, "AF_UNIX"):
+        error("The Git-Mastery worker is not supported on this platform.")
+
+
+def _wait_for_exit(socket_path: Path) -> None:
+    # The socket is removed last, so a new worker must not bind it before then
+    deadline = time.monotonic() + WORKER_START_TIMEOUT
+    while socket_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.1)
+
+
+@click.group()
+def worker() -> None:
+    """Keeps Git-Mastery loaded in the background to speed up download and verify."""
+    pass
+
+
+@worker.command()
+@click.option(
+    "--idle-timeout",
+    default=DEFAULT_IDLE_TIMEOUT_MINUTES,
+    show_default=True,
+    help="Minutes without requests after which the worker stops.",
+)
+@in_gitmastery_root()
+def start(idle_timeout: int) -> None:
+    """
+    Starts the worker for the current Git-Mastery root.
+    """
+    _ensure_supported()
+    config = must_get_gitmastery_root_config()
+    socket_path = config.metadata_dir / WORKER_SOCKET_NAME
+
+    sock = connect_to_worker(socket_path)
+    if sock is not None:
+        with sock:
+            result = send_request(sock, {"ping": True})
+        if not result.get("rejected"):
+            info("The Git-Mastery worker is already running.")
+            return
+        info("Replacing the Git-Mastery worker of another version of Git-Mastery.")
+        _wait_for_exit(socket_path)
+
+    subprocess.Popen(
+        get_gitmastery_command()
+        + ["worker", "serve", "--idle-timeout", str(idle_timeout)],
+        cwd=config.path,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        # Detach so the worker outlives the terminal that started it
+        start_new_session=True,
+    )
+
+    deadline = time.monotonic() + WORKER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        sock = connect_to_worker(socket_path)
+        if sock is not None:
+            sock.close()
+            success("Started the Git-Mastery worker.")
+            return
+        time.sleep(0.1)
+    error("The Git-Mastery worker did not start in time. Check the logs for details.")
+
+
+@worker.command()
+@in_gitmastery_root()
+def stop() -> None:
+    """
+    Stops the worker for the current Git-Mastery root.
+    """
+    _ensure_supported()
+    config = must_get_gitmastery_root_config()
+    sock = connect_to_worker(config.metadata_dir / WORKER_SOCKET_NAME)
+    if sock is None:
+        info("The Git-Mastery worker is not running.")
+        return
+
+    with sock:
+        send_request(sock, {"shutdown": True})
+    success("Stopped the Git-Mastery worker.")
+
+
+@worker.command()
+@in_gitmastery_root()
+def status() -> None:
+    """
+    Shows whether the worker for the current Git-Mastery root is running.
+    """
+    _ensure_supported()
+    config = must_get_gitmastery_root_config()
+    sock = connect_to_worker(config.metadata_dir / WORKER_SOCKET_NAME)
+    if sock is None:
+        info("The Git-Mastery worker is not running.")
+        return
+
+    with sock:
+        result = send_request(sock, {"ping": True})
+    if result.get("rejected"):
+        info(
+            "The Git-Mastery worker was from another version of Git-Mastery and has been stopped."
+        )
+        return
+    info(
+        f"The Git-Mastery worker is running (pid {result['pid']}), "
+        f"up for {int(result['uptime'])}s and served {result['requests']} commands."
+    )
+
+
+@worker.command(hidden=True)
+@click.option("--idle-timeout", default=DEFAULT_IDLE_TIMEOUT_MINUTES)
+@in_gitmastery_root(must=True)
+def serve(idle_timeout: int) -> None:
+    # Imported lazily as the server loads every forwarded command
+    from app.worker.server import serve as serve_worker
+
+    _ensure_supported()
+    config = must_get_gitmastery_root_config()
+    serve_worker(config.metadata_dir, idle_timeout * 60)
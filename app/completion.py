@@ -0,0 +1,132 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+# Only lightweight modules may be imported here as completion runs on every key press
+# in the shell, before the rest of the app is loaded
+from app.aliases import COMMAND_ALIASES, resolve_alias
+from app.configs.gitmastery_config import (
+    GITMASTERY_CONFIG_NAME,
+    METADATA_FOLDER_NAME,
+    GitMasteryConfig,
+)
+from app.configs.utils import find_root
+from app.utils.catalog import Catalog, get_catalog_dir, read_catalog
+
+COMPLETION_COMMAND = "__complete"
+
+# Kept in sync with the commands registered in app/cli.py
+COMMANDS: Dict[str, List[str]] = {
+    "bundle": ["export", "import"],
+    "check": ["git", "github"],
+    "completion": [],
+    "download": [],
+    "list": [],
+    "prefetch": [],
+    "progress": ["flush", "migrate", "reset", "show", "sync"],
+    "serve-cache": [],
+    "setup": [],
+    "stats": [],
+    "verify": [],
+    "version": [],
+    "worker": [],
+}
+# The positions, counting the command itself, of the exercise names a command takes
+EXERCISE_ARGUMENTS: Dict[Tuple[str, ...], Tuple[int, Optional[int]]] = {
+    ("download",): (1, 1),
+    ("prefetch",): (1, None),
+    ("bundle", "export"): (3, None),
+}
+TAG_OPTION = "--tag"
+
+COMPLETION_SCRIPTS = {
+    "bash": """_gitmastery_complete() {
+    local IFS=$'\\n'
+    COMPREPLY=($(gitmastery __complete "${COMP_WORDS[@]:1:COMP_CWORD}" 2>/dev/null))
+}
+complete -o default -F _gitmastery_complete gitmastery
+""",
+    "zsh": """#compdef gitmastery
+_gitmastery() {
+    local -a completions
+    completions=(${(f)"$(gitmastery __complete "${(@)words[2,CURRENT]}" 2>/dev/null)"})
+    if (( ${#completions} )); then
+        compadd -a completions
+    else
+        _files
+    fi
+}
+compdef _gitmastery gitmastery
+""",
+    "fish": """complete -c gitmastery -a '(gitmastery __complete (commandline -opc)[2..-1] (commandline -ct) 2>/dev/null)'
+""",
+}
+
+
+def _read_root_catalog() -> Optional[Catalog]:
+    root = find_root(GITMASTERY_CONFIG_NAME, folder=METADATA_FOLDER_NAME)
+    if root is None:
+        return None
+    config = GitMasteryConfig.read(*root)
+    # Never builds a catalog, as that could mean cloning the exercises. A pinned
+    # commit only completes from its own catalog, not from the latest one built
+    return read_catalog(get_catalog_dir(config), config.exercises_source.commit)
+
+
+def _takes_exercise(arguments: List[str]) -> bool:
+    """Whether the argument after the given ones is an exercise name."""
+    for command, (first, last) in EXERCISE_ARGUMENTS.items():
+        if tuple(arguments[: len(command)]) != command:
+            continue
+        return first <= len(arguments) and (last is None or len(arguments) <= last)
+    return False
+
+
+def complete(words: List[str]) -> List[str]:
+    """Returns the completions of the last word, which is the one being typed."""
+    if len(words) == 0:
+        words = [""]
+    *previous, incomplete = words
+    arguments = [
+        word
+        for i, word in enumerate(previous)
+        if not word.startswith("-") and (i == 0 or previous[i - 1] != TAG_OPTION)
+    ]
+
+    if len(arguments) == 0:
+        candidates = list(COMMANDS)
+        for aliases in COMMAND_ALIASES.values():
+            candidates += aliases
+    else:
+        command = resolve_alias(arguments[0])
+        subcommands = COMMANDS.get(command, [])
+        if len(arguments) == 1 and len(subcommands) > 0:
+            candidates = subcommands
+        elif len(previous) > 0 and previous[-1] == TAG_OPTION:
+            catalog = _read_root_catalog()
+            tags: Set[str] = set()
+            for entry in catalog.exercises if catalog is not None else []:
+                tags.update(entry.tags)
+            candidates = sorted(tags)
+        elif _takes_exercise([command, *arguments[1:]]):
+            catalog = _read_root_catalog()
+            candidates = [
+                entry.exercise_name
+                for entry in (catalog.exercises if catalog is not None else [])
+                if entry.exercise_name not in arguments
+            ]
+        else:
+            candidates = []
+
+    return sorted(
+        candidate for candidate in candidates if candidate.startswith(incomplete)
+    )
+
+
+def run_completion(words: List[str]) -> int:
+    try:
+        completions = complete(words)
+    except Exception:
+        # A broken completion must never print a traceback into the shell
+        return 1
+    for completion in completions:
+        print(completion)
+    return 0
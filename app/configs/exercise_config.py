@@ -6,6 +6,7 @@ from typing import Dict, List, Literal, Optional, Self, Type
 from app.configs.utils import read_config
 
 GITMASTERY_EXERCISE_CONFIG_NAME = ".gitmastery-exercise.json"
+GITMASTERY_BASE_FILES_MANIFEST_NAME = ".gitmastery-base-files.json"
 
 
 @dataclass
@@ -29,6 +30,8 @@ class ExerciseConfig:
     exercise_repo: ExerciseRepoConfig
 
     downloaded_at: Optional[float]
+    # Commit of the exercises source the exercise was downloaded from
+    source_commit: Optional[str]
 
     path: Path
     cds: int
@@ -81,4 +84,5 @@ class ExerciseConfig:
                 pr_repo_full_name=exercise_repo.get("pr_repo_full_name", None),
             ),
             downloaded_at=None,
+            source_commit=raw_config.get("source_commit"),
         )
@@ -1,5 +1,5 @@
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Self, Type, Optional, Union
 
@@ -9,23 +9,32 @@ OLD_GITMASTERY_CONFIG_NAME = ".gitmastery.json"
 METADATA_FOLDER_NAME = ".gitmastery"
 GITMASTERY_CONFIG_NAME = "config.json"
 GITMASTERY_LOG_NAME = "gitmastery.log"
+GITMASTERY_METRICS_NAME = "metrics.jsonl"
+CACHE_FOLDER_NAME = "cache"
+SNAPSHOTS_FOLDER_NAME = "snapshots"
 
 
 @dataclass
 class GitMasteryConfig:
     @dataclass
     class ExercisesSource:
-        # "remote" or "local"
+        # "remote", "local", "bundle" or "mirror"
         type: Optional[str] = "remote"
         # remote fields (legacy uses username/repository/branch)
         username: Optional[str] = None
         repository: Optional[str] = None
         branch: Optional[str] = "main"
+        # Full SHA of a commit to use instead of the latest commit on the branch
+        commit: Optional[str] = None
         # local field
         repo_path: Optional[str] = None
+        # bundle field
+        bundle_path: Optional[str] = None
+        # mirror field, pointing at a machine running `gitmastery serve-cache`
+        url: Optional[str] = None
 
         def to_url(self) -> str:
-            if self.type == "local":
+            if self.type in ("local", "bundle", "mirror"):
                 raise ValueError("to_url only valid for remote ExercisesSource")
             if not self.username or not self.repository:
                 raise ValueError(
@@ -52,15 +61,47 @@ class GitMasteryConfig:
                 typ = raw.get("type")
                 if typ == "local":
                     return cls(type="local", repo_path=raw.get("repo_path"))
+                if typ == "bundle":
+                    return cls(type="bundle", bundle_path=raw.get("bundle_path"))
+                if typ == "mirror":
+                    return cls(type="mirror", url=raw.get("url"))
                 # fallthrough for None (legacy)/detected remote
                 return cls(
                     type="remote",
                     username=raw.get("username", "git-mastery"),
                     repository=raw.get("repository", "exercises"),
                     branch=raw.get("branch", "main"),
+                    commit=raw.get("commit"),
                 )
             raise ValueError("Unsupported exercises_source shape")
 
+    @dataclass
+    class VerifyLimits:
+        # Seconds of CPU time the verification may use
+        cpu_time: Optional[int] = None
+        # Seconds the verification may run for, including time spent waiting on Git
+        wall_time: Optional[int] = None
+        # Megabytes of memory the verification may allocate
+        memory: Optional[int] = None
+
+        @property
+        def enabled(self) -> bool:
+            return (
+                self.cpu_time is not None
+                or self.wall_time is not None
+                or self.memory is not None
+            )
+
+        @classmethod
+        def from_raw(cls, raw: Optional[dict]) -> "GitMasteryConfig.VerifyLimits":
+            if raw is None:
+                return cls()
+            return cls(
+                cpu_time=raw.get("cpu_time"),
+                wall_time=raw.get("wall_time"),
+                memory=raw.get("memory"),
+            )
+
     progress_local: bool
     progress_remote: bool
     exercises_source: ExercisesSource
@@ -68,10 +109,24 @@ class GitMasteryConfig:
     path: Path
     cds: int
 
+    verify_limits: VerifyLimits = field(default_factory=VerifyLimits)
+    # Resets existing exercise forks in place instead of deleting and forking again
+    reuse_forks: bool = False
+    # Only uses data cached on this machine instead of reaching Github
+    offline: bool = False
+
     @property
     def metadata_dir(self) -> Path:
         return self.path / METADATA_FOLDER_NAME
 
+    @property
+    def cache_dir(self) -> Path:
+        return self.metadata_dir / CACHE_FOLDER_NAME
+
+    @property
+    def snapshots_dir(self) -> Path:
+        return self.metadata_dir / SNAPSHOTS_FOLDER_NAME
+
     def to_json(self) -> str:
         return json.dumps(
             self,
@@ -102,6 +157,11 @@ class GitMasteryConfig:
             progress_local=raw_config.get("progress_local", True),
             progress_remote=raw_config.get("progress_remote", False),
             exercises_source=exercises_source,
+            verify_limits=GitMasteryConfig.VerifyLimits.from_raw(
+                raw_config.get("verify_limits")
+            ),
+            reuse_forks=raw_config.get("reuse_forks", False),
+            offline=raw_config.get("offline", False),
         )
 
 
@@ -6,7 +6,7 @@ import click
 from app.configs.exercise_config import GITMASTERY_EXERCISE_CONFIG_NAME, ExerciseConfig
 from app.configs.utils import find_root
 from app.hooks.utils import generate_cds_string
-from app.utils.click import CliContextKey, error
+from app.utils.click import CliContextKey, error, get_session
 
 
 def in_exercise_root(
@@ -23,7 +23,11 @@ def in_exercise_root(
                 error("You are not inside a Git-Mastery exercise folder.")
 
             path, cds = root
-            config = ExerciseConfig.read(path, cds)
+            session = get_session()
+            if session is not None:
+                config = session.read_exercise_config(path, cds)
+            else:
+                config = ExerciseConfig.read(path, cds)
 
             if must and cds != 0:
                 exercise_name = config.exercise_name
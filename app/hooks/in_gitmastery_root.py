@@ -12,7 +12,8 @@ from app.configs.gitmastery_config import (
 from app.configs.migration import migrate_gitmastery_metadata
 from app.configs.utils import find_root
 from app.hooks.utils import generate_cds_string
-from app.utils.click import CliContextKey, error, warn
+from app.utils.click import CliContextKey, error, get_session, warn
+from app.utils.progress_outbox import flush_in_background, has_pending_progress
 
 
 MIGRATION_FAILURE_MESSAGE = (
@@ -57,7 +58,11 @@ def in_gitmastery_root(
                     error(MIGRATION_FAILURE_MESSAGE)
 
             path, cds = root
-            config = GitMasteryConfig.read(path, cds)
+            session = get_session()
+            if session is not None:
+                config = session.read_gitmastery_config(path, cds)
+            else:
+                config = GitMasteryConfig.read(path, cds)
 
             if must and cds != 0:
                 error(
@@ -66,6 +71,11 @@ def in_gitmastery_root(
                 )
 
             ctx.obj[CliContextKey.GITMASTERY_ROOT_CONFIG] = config
+
+            # Retry progress that could not be pushed earlier, e.g. while offline
+            if ctx.command.name != "flush" and has_pending_progress(config):
+                flush_in_background(config)
+
             return func(*args, **kwargs)
 
         return wrapper
@@ -1,13 +1,19 @@
 import logging
+import logging.handlers
 import re
 
 from app.configs.gitmastery_config import (
     GITMASTERY_CONFIG_NAME,
+    GITMASTERY_METRICS_NAME,
     METADATA_FOLDER_NAME,
     GITMASTERY_LOG_NAME,
 )
 from app.configs.utils import find_root
 
+METRICS_LOGGER_NAME = "gitmastery.metrics"
+METRICS_MAX_BYTES = 1024 * 1024
+METRICS_BACKUP_COUNT = 3
+
 
 class GitMasteryFileHandler(logging.Handler):
     def __init__(self) -> None:
@@ -30,6 +36,32 @@ class GitMasteryFileHandler(logging.Handler):
         super().close()
 
 
+class GitMasteryMetricsHandler(logging.Handler):
+    """Appends pre-formatted JSON records to the rotating metrics file.
+
+    Mirrors GitMasteryFileHandler in resolving the Git-Mastery root on every emit so
+    that metrics follow the user across folders within a REPL session.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        gitmastery_root = find_root(GITMASTERY_CONFIG_NAME, folder=METADATA_FOLDER_NAME)
+        if gitmastery_root is None:
+            return
+
+        metrics_path = (
+            gitmastery_root[0] / METADATA_FOLDER_NAME / GITMASTERY_METRICS_NAME
+        )
+        handler = logging.handlers.RotatingFileHandler(
+            metrics_path,
+            mode="a",
+            maxBytes=METRICS_MAX_BYTES,
+            backupCount=METRICS_BACKUP_COUNT,
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        handler.emit(record)
+        handler.close()
+
+
 class RemoveAnsiFilter(logging.Filter):
     ansi_escape = re.compile(r"\x1B[@-_][0-?]*[ -/]*[@-~]")
 
@@ -50,3 +82,11 @@ def setup_logging() -> None:
     file_handler.setFormatter(formatter)
     file_handler.addFilter(RemoveAnsiFilter())
     root_logger.addHandler(file_handler)
+
+    # Metrics are written as JSON lines to their own file and must not leak into the
+    # human-readable log
+    metrics_logger = logging.getLogger(METRICS_LOGGER_NAME)
+    metrics_logger.setLevel(logging.INFO)
+    metrics_logger.propagate = False
+    metrics_logger.handlers.clear()
+    metrics_logger.addHandler(GitMasteryMetricsHandler())
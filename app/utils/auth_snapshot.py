@@ -0,0 +1,53 @@
+import json
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from app.configs.gitmastery_config import GitMasteryConfig
+from app.utils.click import is_offline
+from app.utils.github_cli import get_username
+
+GITHUB_AUTH_SNAPSHOT_NAME = "github_auth.json"
+
+
+@dataclass
+class AuthSnapshot:
+    """Github CLI authentication as last seen while online."""
+
+    username: str
+    scopes: List[str]
+    checked_at: float
+
+
+def _snapshot_path(config: GitMasteryConfig) -> Path:
+    return config.cache_dir / GITHUB_AUTH_SNAPSHOT_NAME
+
+
+def save_auth_snapshot(
+    config: GitMasteryConfig, username: str, scopes: List[str]
+) -> None:
+    snapshot = AuthSnapshot(username=username, scopes=scopes, checked_at=time.time())
+    _snapshot_path(config).parent.mkdir(parents=True, exist_ok=True)
+    with open(_snapshot_path(config), "w") as file:
+        file.write(json.dumps(asdict(snapshot), indent=2))
+
+
+def read_auth_snapshot(config: GitMasteryConfig) -> Optional[AuthSnapshot]:
+    try:
+        with open(_snapshot_path(config), "r") as file:
+            raw = json.load(file)
+        return AuthSnapshot(
+            username=raw["username"],
+            scopes=raw["scopes"],
+            checked_at=raw["checked_at"],
+        )
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return None
+
+
+def resolve_username(config: GitMasteryConfig) -> str:
+    if not is_offline():
+        return get_username()
+    snapshot = read_auth_snapshot(config)
+    return snapshot.username if snapshot is not None else ""
@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import pytz
+from git_autograder import GitAutograderStatus
+from git_autograder.output import GitAutograderOutput
+
+
+def _to_timestamp(value: Optional[datetime]) -> Optional[float]:
+    return value.timestamp() if value else None
+
+
+def _from_timestamp(value: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(value, tz=pytz.UTC) if value is not None else None
+
+
+def output_to_dict(output: GitAutograderOutput) -> Dict[str, Any]:
+    return {
+        "exercise_name": output.exercise_name,
+        "started_at": _to_timestamp(output.started_at),
+        "completed_at": _to_timestamp(output.completed_at),
+        "comments": output.comments,
+        "status": str(output.status),
+    }
+
+
+def output_from_dict(raw: Dict[str, Any]) -> GitAutograderOutput:
+    return GitAutograderOutput(
+        exercise_name=raw["exercise_name"],
+        started_at=_from_timestamp(raw["started_at"]),
+        completed_at=_from_timestamp(raw["completed_at"]),
+        comments=raw["comments"],
+        status=GitAutograderStatus(raw["status"]),
+    )
@@ -0,0 +1,52 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List
+
+from app.configs.exercise_config import GITMASTERY_BASE_FILES_MANIFEST_NAME
+
+
+def _hash_file(file_path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(64 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_base_files_manifest(exercise_path: Path, base_files: Dict[str, str]) -> None:
+    """Records the content hashes of the base files as they were downloaded."""
+    manifest = {
+        path: _hash_file(exercise_path / path)
+        for path in base_files.values()
+        if (exercise_path / path).is_file()
+    }
+    with open(exercise_path / GITMASTERY_BASE_FILES_MANIFEST_NAME, "w") as file:
+        file.write(json.dumps(manifest, indent=2))
+
+
+def get_changed_base_files(
+    exercise_path: Path, base_files: Dict[str, str]
+) -> List[str]:
+    """Returns the resources of base files that are missing or differ from download.
+
+    Every base file is considered changed if the manifest is missing, such as for
+    exercises downloaded before it was introduced.
+    """
+    manifest_path = exercise_path / GITMASTERY_BASE_FILES_MANIFEST_NAME
+    try:
+        with open(manifest_path, "r") as file:
+            manifest: Dict[str, str] = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifest = {}
+
+    changed = []
+    for resource, path in base_files.items():
+        file_path = exercise_path / path
+        if (
+            path not in manifest
+            or not file_path.is_file()
+            or _hash_file(file_path) != manifest[path]
+        ):
+            changed.append(resource)
+    return changed
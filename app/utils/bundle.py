@@ -0,0 +1,139 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+# A bundle starts with a fixed size header pointing at its index, followed by every
+# distinct file stored once and compressed on its own, and ends with the index
+BUNDLE_MAGIC = b"GMBNDL01"
+BUNDLE_HEADER = struct.Struct("<8sQQ")
+BUNDLE_VERSION = 1
+BUNDLE_FILE_EXTENSION = ".gmbundle"
+
+
+class InvalidBundleError(Exception):
+    pass
+
+
+def write_bundle(
+    bundle_path: Path,
+    files: Dict[str, bytes],
+    folder_hashes: Dict[str, str],
+    commit: Optional[str],
+) -> None:
+    """Packs the given exercises repository files into a single bundle."""
+    partial_path = bundle_path.with_name(bundle_path.name + ".partial")
+    blobs: Dict[str, List[int]] = {}
+    paths: Dict[str, str] = {}
+    with open(partial_path, "wb") as file:
+        file.write(BUNDLE_HEADER.pack(BUNDLE_MAGIC, 0, 0))
+        for file_path in sorted(files):
+            contents = files[file_path]
+            blob_id = hashlib.sha256(contents).hexdigest()
+            paths[file_path] = blob_id
+            if blob_id in blobs:
+                continue
+            compressed = zlib.compress(contents, 9)
+            blobs[blob_id] = [file.tell(), len(compressed), len(contents)]
+            file.write(compressed)
+
+        index = {
+            "version": BUNDLE_VERSION,
+            "commit": commit,
+            "created_at": time.time(),
+            "files": paths,
+            "blobs": blobs,
+            "folders": folder_hashes,
+        }
+        index_offset = file.tell()
+        compressed_index = zlib.compress(json.dumps(index).encode("utf-8"), 9)
+        file.write(compressed_index)
+        file.seek(0)
+        file.write(
+            BUNDLE_HEADER.pack(BUNDLE_MAGIC, index_offset, len(compressed_index))
+        )
+    os.replace(partial_path, bundle_path)
+
+
+class ExercisesBundle:
+    """Reads exercises repository files straight out of a bundle.
+
+    The bundle is memory-mapped, so opening it only reads its index and each file is
+    decompressed when it is requested.
+    """
+
+    def __init__(self, bundle_path: Union[str, Path]) -> None:
+        self.path = Path(bundle_path)
+        self.__file = open(self.path, "rb")
+        try:
+            self.__mmap = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:
+            self.__file.close()
+            raise InvalidBundleError(f"{self.path} is not an exercises bundle") from e
+
+        try:
+            magic, index_offset, index_length = BUNDLE_HEADER.unpack_from(
+                self.__mmap, 0
+            )
+            if magic != BUNDLE_MAGIC:
+                raise InvalidBundleError(f"{self.path} is not an exercises bundle")
+            self.__index: Dict[str, Any] = json.loads(
+                zlib.decompress(self.__mmap[index_offset : index_offset + index_length])
+            )
+        except (struct.error, zlib.error, json.JSONDecodeError) as e:
+            self.close()
+            raise InvalidBundleError(f"{self.path} is not an exercises bundle") from e
+        except InvalidBundleError:
+            self.close()
+            raise
+
+        if self.__index.get("version") != BUNDLE_VERSION:
+            self.close()
+            raise InvalidBundleError(
+                f"{self.path} was created by an incompatible version of Git-Mastery"
+            )
+
+    @property
+    def commit(self) -> Optional[str]:
+        return self.__index.get("commit")
+
+    @property
+    def file_count(self) -> int:
+        return len(self.__index["files"])
+
+    def has_file(self, file_path: Union[str, Path]) -> bool:
+        return Path(file_path).as_posix() in self.__index["files"]
+
+    def read_file(self, file_path: Union[str, Path]) -> bytes:
+        blob_id = self.__index["files"][Path(file_path).as_posix()]
+        offset, length, _ = self.__index["blobs"][blob_id]
+        return zlib.decompress(self.__mmap[offset : offset + length])
+
+    def list_files(self, folder: Union[str, Path]) -> List[str]:
+        prefix = Path(folder).as_posix()
+        if prefix == ".":
+            return sorted(self.__index["files"])
+        return sorted(
+            file_path
+            for file_path in self.__index["files"]
+            if file_path.startswith(prefix + "/")
+        )
+
+    def get_file_sizes(self, folder: Union[str, Path]) -> Dict[str, int]:
+        return {
+            file_path: self.__index["blobs"][self.__index["files"][file_path]][2]
+            for file_path in self.list_files(folder)
+        }
+
+    def get_folder_hash(self, folder: Union[str, Path]) -> Optional[str]:
+        return self.__index["folders"].get(Path(folder).as_posix())
+
+    def close(self) -> None:
+        if not self.__mmap.closed:
+            self.__mmap.close()
+        self.__file.close()
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import logging
+import shutil
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from app.utils.bundle import ExercisesBundle
+from app.utils.mirror import MIRROR_BUNDLE_ROUTE
+
+logger = logging.getLogger(__name__)
+
+
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    server: "CacheServer"
+
+    def do_HEAD(self) -> None:
+        self._respond(send_body=False)
+
+    def do_GET(self) -> None:
+        self._respond(send_body=True)
+
+    def _respond(self, send_body: bool) -> None:
+        published = self.server.get_published()
+        if published is None:
+            self.send_error(HTTPStatus.SERVICE_UNAVAILABLE, "Exercises are not ready")
+            return
+        bundle_path, etag, commit = published
+
+        if self.path == "/":
+            body = json.dumps({"commit": commit, "etag": etag}).encode("utf-8")
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+            return
+
+        if self.path != MIRROR_BUNDLE_ROUTE:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        # Opened per request so that a bundle being replaced is still served whole
+        with open(bundle_path, "rb") as file:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(bundle_path.stat().st_size))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            if send_body:
+                shutil.copyfileobj(file, self.wfile)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+class CacheServer(ThreadingHTTPServer):
+    """Serves one bundle of the exercises to every machine in a lab."""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int]) -> None:
+        super().__init__(address, CacheRequestHandler)
+        self.__lock = threading.Lock()
+        self.__published: Optional[Tuple[Path, str, Optional[str]]] = None
+
+    def publish(self, bundle_path: Path) -> None:
+        digest = hashlib.sha256()
+        with open(bundle_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+        exercises_bundle = ExercisesBundle(bundle_path)
+        commit = exercises_bundle.commit
+        exercises_bundle.close()
+        with self.__lock:
+            self.__published = (bundle_path, f'"{digest.hexdigest()}"', commit)
+
+    def get_published(self) -> Optional[Tuple[Path, str, Optional[str]]]:
+        with self.__lock:
+            return self.__published
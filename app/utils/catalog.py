@@ -0,0 +1,161 @@
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+from app.configs.exercise_config import GITMASTERY_EXERCISE_CONFIG_NAME
+from app.configs.gitmastery_config import GitMasteryConfig
+from app.utils.exercises_cache import ExercisesCache
+
+# Kept out of the module imports so that shell completion can read catalogs quickly
+if TYPE_CHECKING:
+    from app.utils.gitmastery import ExercisesRepo
+
+CATALOG_FOLDER_NAME = "catalog"
+CATALOG_LATEST_NAME = "latest"
+CATALOG_VERSION = 1
+# The exercises are checked for changes after a day so that new exercises show up
+CATALOG_TTL = 24 * 60 * 60
+
+
+@dataclass
+class CatalogEntry:
+    exercise_name: str
+    tags: List[str]
+    requires_git: bool
+    requires_github: bool
+    repo_type: str
+    resource_count: int
+    resource_size: int
+
+    @property
+    def formatted_exercise_name(self) -> str:
+        return self.exercise_name.replace("-", "_")
+
+
+@dataclass
+class Catalog:
+    commit: Optional[str]
+    built_at: float
+    exercises: List[CatalogEntry]
+
+    def filter(
+        self, tags: List[str], requires_github: Optional[bool] = None
+    ) -> List[CatalogEntry]:
+        return [
+            entry
+            for entry in self.exercises
+            if (len(tags) == 0 or any(tag in entry.tags for tag in tags))
+            and (requires_github is None or entry.requires_github == requires_github)
+        ]
+
+
+def get_catalog_dir(config: GitMasteryConfig) -> Path:
+    return (
+        ExercisesCache(config.cache_dir, config.exercises_source).root
+        / CATALOG_FOLDER_NAME
+    )
+
+
+def build_catalog(repo: "ExercisesRepo") -> Catalog:
+    """Reads every exercise config in the exercises repository in a single batch."""
+    # Listing the tree and its sizes does not download any of the files
+    sizes = repo.get_file_sizes(".")
+    config_files = [
+        file_path
+        for file_path in sizes
+        if len(Path(file_path).parts) == 2
+        and Path(file_path).name == GITMASTERY_EXERCISE_CONFIG_NAME
+    ]
+
+    exercises = []
+    for file_path, contents in sorted(repo.fetch_files(config_files).items()):
+        try:
+            raw_config = json.loads(contents)
+        except json.JSONDecodeError:
+            continue
+        folder = Path(file_path).parts[0]
+        resources = [
+            size
+            for resource_path, size in sizes.items()
+            if resource_path.startswith(f"{folder}/res/")
+        ]
+        exercises.append(
+            CatalogEntry(
+                exercise_name=raw_config.get("exercise_name", folder.replace("_", "-")),
+                tags=raw_config.get("tags", []),
+                requires_git=raw_config.get("requires_git", False),
+                requires_github=raw_config.get("requires_github", False),
+                repo_type=raw_config.get("exercise_repo", {}).get("repo_type", ""),
+                resource_count=len(resources),
+                resource_size=sum(resources),
+            )
+        )
+    return Catalog(commit=repo.commit, built_at=time.time(), exercises=exercises)
+
+
+def write_catalog(catalog_dir: Path, catalog: Catalog) -> None:
+    if catalog.commit is None:
+        return
+    os.makedirs(catalog_dir, exist_ok=True)
+    with open(catalog_dir / f"{catalog.commit}.json", "w") as file:
+        file.write(
+            json.dumps(
+                {
+                    "version": CATALOG_VERSION,
+                    "commit": catalog.commit,
+                    "built_at": catalog.built_at,
+                    # Stored as rows to keep the catalog compact
+                    "exercises": [
+                        list(asdict(entry).values()) for entry in catalog.exercises
+                    ],
+                },
+                separators=(",", ":"),
+            )
+        )
+    (catalog_dir / CATALOG_LATEST_NAME).write_text(catalog.commit)
+
+
+def read_catalog(catalog_dir: Path, commit: Optional[str] = None) -> Optional[Catalog]:
+    """Reads the catalog of a commit, or of the last commit a catalog was built for."""
+    try:
+        if commit is None:
+            commit = (catalog_dir / CATALOG_LATEST_NAME).read_text().strip()
+        with open(catalog_dir / f"{commit}.json", "r") as file:
+            raw = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    if raw.get("version") != CATALOG_VERSION:
+        return None
+    return Catalog(
+        commit=raw["commit"],
+        built_at=raw["built_at"],
+        exercises=[CatalogEntry(*row) for row in raw["exercises"]],
+    )
+
+
+def is_catalog_stale(catalog_dir: Path) -> bool:
+    """Whether the exercises have not been checked for changes within the TTL."""
+    try:
+        checked_at = (catalog_dir / CATALOG_LATEST_NAME).stat().st_mtime
+    except FileNotFoundError:
+        return True
+    return time.time() - checked_at > CATALOG_TTL
+
+
+def get_catalog(repo: "ExercisesRepo", catalog_dir: Optional[Path]) -> Catalog:
+    """Returns the catalog of the commit the exercises repository is at."""
+    if catalog_dir is not None and repo.commit is not None:
+        catalog = read_catalog(catalog_dir, repo.commit)
+        if catalog is not None:
+            # Marks the catalog as checked so it is not looked up again within the TTL
+            (catalog_dir / CATALOG_LATEST_NAME).write_text(repo.commit)
+            return catalog
+
+    catalog = build_catalog(repo)
+    if catalog_dir is not None:
+        write_catalog(catalog_dir, catalog)
+    return catalog
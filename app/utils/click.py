@@ -1,13 +1,16 @@
 import logging
 import sys
 from enum import StrEnum
-from typing import Any, NoReturn, Optional
+from typing import TYPE_CHECKING, Any, NoReturn, Optional
 
 import click
 
 from app.configs.exercise_config import ExerciseConfig
 from app.configs.gitmastery_config import GitMasteryConfig
 
+if TYPE_CHECKING:
+    from app.utils.session import GitMasterySession
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,6 +19,10 @@ class CliContextKey(StrEnum):
     GITMASTERY_EXERCISE_CONFIG = "GITMASTERY_EXERCISE_CONFIG"
     VERBOSE = "VERBOSE"
     VERSION = "VERSION"
+    SESSION = "SESSION"
+    OFFLINE = "OFFLINE"
+    # Set for work done in the background, where output would garble the prompt
+    QUIET = "QUIET"
 
 
 class ClickColor(StrEnum):
@@ -37,40 +44,54 @@ class ClickColor(StrEnum):
     BRIGHT_WHITE = "bright_white"
 
 
+def _is_quiet() -> bool:
+    ctx = click.get_current_context(silent=True)
+    return (
+        ctx is not None
+        and ctx.obj is not None
+        and ctx.obj.get(CliContextKey.QUIET, False)
+    )
+
+
 def error(message: str) -> NoReturn:
     logger.error(message)
-    click.echo(
-        f"{click.style(' ERROR ', fg=ClickColor.BLACK, bg=ClickColor.BRIGHT_RED, bold=True)} {message}"
-    )
+    if not _is_quiet():
+        click.echo(
+            f"{click.style(' ERROR ', fg=ClickColor.BLACK, bg=ClickColor.BRIGHT_RED, bold=True)} {message}"
+        )
     sys.exit(1)
 
 
 def info(message: str) -> None:
     logger.info(message)
-    click.echo(
-        f"{click.style(' INFO ', fg=ClickColor.BLACK, bg=ClickColor.BRIGHT_BLUE, bold=True)} {message}"
-    )
+    if not _is_quiet():
+        click.echo(
+            f"{click.style(' INFO ', fg=ClickColor.BLACK, bg=ClickColor.BRIGHT_BLUE, bold=True)} {message}"
+        )
 
 
 def debug(message: str) -> None:
     logger.debug(message)
-    click.echo(
-        f"{click.style(' DEBUG ', fg=ClickColor.WHITE, bg=ClickColor.BLACK, bold=True)} {message}"
-    )
+    if not _is_quiet():
+        click.echo(
+            f"{click.style(' DEBUG ', fg=ClickColor.WHITE, bg=ClickColor.BLACK, bold=True)} {message}"
+        )
 
 
 def warn(message: str) -> None:
     logger.warning(message)
-    click.echo(
-        f"{click.style(' WARN ', fg=ClickColor.BLACK, bg=ClickColor.BRIGHT_YELLOW, bold=True)} {message}"
-    )
+    if not _is_quiet():
+        click.echo(
+            f"{click.style(' WARN ', fg=ClickColor.BLACK, bg=ClickColor.BRIGHT_YELLOW, bold=True)} {message}"
+        )
 
 
 def success(message: str) -> None:
     logger.info(message)
-    click.echo(
-        f"{click.style(' SUCCESS ', fg=ClickColor.BLACK, bg=ClickColor.BRIGHT_GREEN, bold=True)} {message}"
-    )
+    if not _is_quiet():
+        click.echo(
+            f"{click.style(' SUCCESS ', fg=ClickColor.BLACK, bg=ClickColor.BRIGHT_GREEN, bold=True)} {message}"
+        )
 
 
 def prompt(message: str, default: Optional[Any] = None) -> Any:
@@ -123,6 +144,30 @@ def must_get_exercise_root_config() -> ExerciseConfig:
     return v
 
 
-def invoke_command(command: click.Command) -> None:
+def is_offline() -> bool:
+    ctx = click.get_current_context(silent=True)
+    if ctx is None or ctx.obj is None:
+        return False
+    if ctx.obj.get(CliContextKey.OFFLINE, False):
+        return True
+    config = ctx.obj.get(CliContextKey.GITMASTERY_ROOT_CONFIG, None)
+    return config is not None and config.offline
+
+
+def ensure_online(action: str) -> None:
+    if is_offline():
+        error(
+            f"{action} needs an internet connection. Run it again without offline mode once you are connected."
+        )
+
+
+def get_session() -> Optional["GitMasterySession"]:
+    ctx = click.get_current_context(silent=True)
+    if ctx is None or ctx.obj is None:
+        return None
+    return ctx.obj.get(CliContextKey.SESSION, None)
+
+
+def invoke_command(command: click.Command, **kwargs: Any) -> None:
     ctx = click.get_current_context()
-    ctx.invoke(command)
+    ctx.invoke(command, **kwargs)
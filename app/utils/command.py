@@ -1,6 +1,8 @@
 import logging
 import os
 import subprocess
+import sys
+import time
 from dataclasses import dataclass
 from subprocess import CompletedProcess
 from typing import Dict
@@ -8,6 +10,7 @@ from typing import Dict
 from typing_extensions import List
 
 from app.utils.click import get_verbose
+from app.utils.metrics import CommandMetric, record_command
 
 
 @dataclass
@@ -27,6 +30,8 @@ def run(command: List[str], env: Dict[str, str] = {}) -> CommandResult:
     logger = logging.getLogger(__name__)
     logger.info("Running command: %s", command)
 
+    started_at = time.time()
+    start = time.perf_counter()
     try:
         result = subprocess.run(
             command,
@@ -47,6 +52,19 @@ def run(command: List[str], env: Dict[str, str] = {}) -> CommandResult:
         error_msg = f"OS error when running command {command}: {e}"
         logger.error(error_msg)
         result = CompletedProcess(command, returncode=1, stdout="", stderr=error_msg)
+    duration = time.perf_counter() - start
+
+    record_command(
+        CommandMetric(
+            command=command,
+            cwd=os.getcwd(),
+            started_at=started_at,
+            duration=duration,
+            returncode=result.returncode,
+            stdout_bytes=len((result.stdout or "").encode("utf-8")),
+            stderr_bytes=len((result.stderr or "").encode("utf-8")),
+        )
+    )
 
     if env:
         logger.info("Env: %s", env)
@@ -60,3 +78,12 @@ def run(command: List[str], env: Dict[str, str] = {}) -> CommandResult:
             print("\t" + result.stderr)
 
     return CommandResult(result=result)
+
+
+def get_gitmastery_command() -> List[str]:
+    """Returns the command that starts another instance of the running app."""
+    # Bundled binaries are their own interpreter, so the script path must not be
+    # passed again
+    if getattr(sys, "frozen", False):
+        return [sys.executable]
+    return [sys.executable, os.path.abspath(sys.argv[0])]
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from app.configs.gitmastery_config import GitMasteryConfig
+from app.version import __version__
+
+ENV_CHECK_CACHE_NAME = "env_check.json"
+# Checks are re-run after a day even if nothing changed locally, as access to Github
+# can also be revoked remotely
+ENV_CHECK_TTL = 24 * 60 * 60
+
+
+def _file_stamp(path: Optional[Path]) -> Optional[List[int]]:
+    if path is None:
+        return None
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _binary_stamp(name: str) -> List[Any]:
+    path = shutil.which(name)
+    return [path, _file_stamp(Path(path) if path is not None else None)]
+
+
+def _config_home() -> Path:
+    return Path(os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config"))
+
+
+def _git_global_config_paths() -> List[Path]:
+    if "GIT_CONFIG_GLOBAL" in os.environ:
+        return [Path(os.environ["GIT_CONFIG_GLOBAL"])]
+    return [Path.home() / ".gitconfig", _config_home() / "git" / "config"]
+
+
+def _gh_hosts_path() -> Path:
+    if "GH_CONFIG_DIR" in os.environ:
+        config_dir = Path(os.environ["GH_CONFIG_DIR"])
+    elif sys.platform == "win32" and "APPDATA" in os.environ:
+        config_dir = Path(os.environ["APPDATA"]) / "GitHub CLI"
+    else:
+        config_dir = _config_home() / "gh"
+    return config_dir / "hosts.yml"
+
+
+def _git_inputs() -> Dict[str, Any]:
+    return {
+        "git": _binary_stamp("git"),
+        "config": [_file_stamp(path) for path in _git_global_config_paths()],
+    }
+
+
+def _github_inputs() -> Dict[str, Any]:
+    # Only a digest of the tokens is kept, never the tokens themselves
+    tokens = "\0".join(
+        os.environ.get(name, "") for name in ("GH_TOKEN", "GITHUB_TOKEN")
+    )
+    return {
+        "gh": _binary_stamp("gh"),
+        "hosts": _file_stamp(_gh_hosts_path()),
+        "tokens": hashlib.sha256(tokens.encode("utf-8")).hexdigest(),
+    }
+
+
+ENV_CHECK_INPUTS: Dict[str, Callable[[], Dict[str, Any]]] = {
+    "git": _git_inputs,
+    "github": _github_inputs,
+}
+
+
+def get_fingerprint(check: str) -> str:
+    """Digests everything a check depends on that can be looked up without running it."""
+    inputs = {"version": __version__, **ENV_CHECK_INPUTS[check]()}
+    return hashlib.sha256(
+        json.dumps(inputs, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def _cache_path(config: GitMasteryConfig) -> Path:
+    return config.cache_dir / ENV_CHECK_CACHE_NAME
+
+
+def _read_cache(config: GitMasteryConfig) -> Dict[str, Any]:
+    try:
+        with open(_cache_path(config), "r") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_cache(config: GitMasteryConfig, cache: Dict[str, Any]) -> None:
+    _cache_path(config).parent.mkdir(parents=True, exist_ok=True)
+    with open(_cache_path(config), "w") as file:
+        file.write(json.dumps(cache, indent=2))
+
+
+def read_env_check(config: GitMasteryConfig, check: str) -> Optional[Dict[str, Any]]:
+    """Returns what a check found when it last passed, if nothing it relies on changed."""
+    entry = _read_cache(config).get(check)
+    if entry is None or time.time() - entry["checked_at"] > ENV_CHECK_TTL:
+        return None
+    if entry["fingerprint"] != get_fingerprint(check):
+        return None
+    return entry["details"]
+
+
+def save_env_check(
+    config: GitMasteryConfig, check: str, details: Dict[str, Any]
+) -> None:
+    cache = _read_cache(config)
+    cache[check] = {
+        "fingerprint": get_fingerprint(check),
+        "checked_at": time.time(),
+        "details": details,
+    }
+    _write_cache(config, cache)
+
+
+def clear_env_check(config: GitMasteryConfig, check: str) -> None:
+    cache = _read_cache(config)
+    if check in cache:
+        del cache[check]
+        _write_cache(config, cache)
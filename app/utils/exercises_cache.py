@@ -0,0 +1,180 @@
+import dataclasses
+import hashlib
+import importlib.util
+import json
+import marshal
+import os
+import re
+import tempfile
+from pathlib import Path
+from types import CodeType
+from typing import Any, Dict, Optional, Union
+
+from app.configs.gitmastery_config import GitMasteryConfig
+
+EXERCISES_CACHE_FOLDER_NAME = "exercises"
+EXERCISES_CACHE_INDEX_NAME = "index.json"
+EXERCISES_CACHE_FILES_FOLDER_NAME = "files"
+EXERCISES_CACHE_LATEST_NAME = "latest"
+BYTECODE_CACHE_FOLDER_NAME = "bytecode"
+
+
+def _source_folder_name(exercises_source: GitMasteryConfig.ExercisesSource) -> str:
+    if exercises_source.type == "mirror":
+        name = f"mirror-{exercises_source.url}"
+    elif exercises_source.type == "local":
+        name = f"local-{exercises_source.repo_path}"
+    elif exercises_source.type == "bundle":
+        name = f"bundle-{exercises_source.bundle_path}"
+    else:
+        # Files never change within a commit, so their copies can be shared safely
+        revision = exercises_source.commit or exercises_source.branch
+        name = f"{exercises_source.username}-{exercises_source.repository}-{revision}"
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+
+
+class ExercisesCache:
+    """Copies of the exercises repository files that have been fetched before.
+
+    Every file read from a remote exercises source is written through to the cache,
+    along with whether it exists and the hashes of the folders containing it, so that
+    the same reads can be served without a network connection.
+
+    Files of remote sources are kept per commit, with the cache of a branch only
+    recording the commit it was last seen at.
+    """
+
+    def __init__(
+        self, cache_dir: Path, exercises_source: GitMasteryConfig.ExercisesSource
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.exercises_source = exercises_source
+        self.root = (
+            cache_dir
+            / EXERCISES_CACHE_FOLDER_NAME
+            / _source_folder_name(exercises_source)
+        )
+
+    @property
+    def index_file(self) -> Path:
+        return self.root / EXERCISES_CACHE_INDEX_NAME
+
+    def at_commit(self, commit: str) -> "ExercisesCache":
+        """Returns the cache of the files of the source at the given commit."""
+        return ExercisesCache(
+            self.cache_dir, dataclasses.replace(self.exercises_source, commit=commit)
+        )
+
+    def get_latest_commit(self) -> Optional[str]:
+        try:
+            return (self.root / EXERCISES_CACHE_LATEST_NAME).read_text().strip()
+        except FileNotFoundError:
+            return None
+
+    def put_latest_commit(self, commit: str) -> None:
+        if self.get_latest_commit() == commit:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        (self.root / EXERCISES_CACHE_LATEST_NAME).write_text(commit)
+
+    def _file_path(self, file_path: Union[str, Path]) -> Path:
+        return self.root / EXERCISES_CACHE_FILES_FOLDER_NAME / Path(file_path)
+
+    def _read_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.index_file, "r") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"files": {}, "folders": {}}
+
+    def _update_index(self, section: str, key: str, value: Any) -> None:
+        index = self._read_index()
+        if index[section].get(key) == value:
+            return
+        index[section][key] = value
+        os.makedirs(self.root, exist_ok=True)
+        # Several commands may share the cache, so the index is replaced atomically
+        fd, partial_path = tempfile.mkstemp(dir=self.root, suffix=".partial")
+        with os.fdopen(fd, "w") as file:
+            file.write(json.dumps(index, indent=2, sort_keys=True))
+        os.replace(partial_path, self.index_file)
+
+    def has_file(self, file_path: Union[str, Path]) -> Optional[bool]:
+        """Returns if the file exists in the source, or None if it was never checked."""
+        return self._read_index()["files"].get(Path(file_path).as_posix())
+
+    def get_file(
+        self, file_path: Union[str, Path], is_binary: bool
+    ) -> Optional[str | bytes]:
+        if not self.has_file(file_path):
+            return None
+        read_mode = "rb" if is_binary else "rt"
+        try:
+            with open(self._file_path(file_path), read_mode) as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def put_file(self, file_path: Union[str, Path], contents: str | bytes) -> None:
+        cached_path = self._file_path(file_path)
+        os.makedirs(cached_path.parent, exist_ok=True)
+        if isinstance(contents, bytes):
+            cached_path.write_bytes(contents)
+        else:
+            cached_path.write_text(contents)
+        self._update_index("files", Path(file_path).as_posix(), True)
+
+    def put_missing(self, file_path: Union[str, Path]) -> None:
+        self._update_index("files", Path(file_path).as_posix(), False)
+
+    def get_folder_hash(self, folder: Union[str, Path]) -> Optional[str]:
+        return self._read_index()["folders"].get(Path(folder).as_posix())
+
+    def put_folder_hash(self, folder: Union[str, Path], folder_hash: str) -> None:
+        self._update_index("folders", Path(folder).as_posix(), folder_hash)
+
+
+def get_cache_size(cache_dir: Path) -> int:
+    """Returns the number of bytes used by every file under the cache."""
+    size = 0
+    for root, _, files in os.walk(cache_dir):
+        for filename in files:
+            try:
+                size += os.path.getsize(os.path.join(root, filename))
+            except OSError:
+                continue
+    return size
+
+
+def compile_script(
+    source: str, filename: str, bytecode_dir: Optional[Path] = None
+) -> CodeType:
+    """Compiles an exercise script, re-using bytecode compiled for the same source."""
+    if bytecode_dir is None:
+        return compile(source, filename, "exec")
+
+    digest = hashlib.sha256()
+    # Bytecode is only valid for the interpreter version that produced it
+    digest.update(importlib.util.MAGIC_NUMBER)
+    digest.update(filename.encode("utf-8") + b"\0")
+    digest.update(source.encode("utf-8"))
+    bytecode_path = bytecode_dir / f"{digest.hexdigest()}.bin"
+
+    try:
+        code = marshal.loads(bytecode_path.read_bytes())
+        if isinstance(code, CodeType):
+            return code
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    code = compile(source, filename, "exec")
+    try:
+        os.makedirs(bytecode_dir, exist_ok=True)
+        fd, partial_path = tempfile.mkstemp(dir=bytecode_dir, suffix=".partial")
+        with os.fdopen(fd, "wb") as file:
+            file.write(marshal.dumps(code))
+        os.replace(partial_path, bytecode_path)
+    except OSError:
+        # Compiling again next time is slower but still correct
+        pass
+    return code
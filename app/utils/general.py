@@ -5,3 +5,9 @@ def ensure_str(val: Union[str, bytes]) -> str:
     if isinstance(val, bytes):
         return val.decode("utf-8", errors="replace").strip()
     return str(val).strip()
+
+
+def ensure_bytes(val: Union[str, bytes]) -> bytes:
+    if isinstance(val, str):
+        return val.encode("utf-8")
+    return val
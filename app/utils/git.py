@@ -1,5 +1,5 @@
 import re
-from typing import Optional
+from typing import List, Optional
 
 from app.utils.command import run
 from app.utils.version import Version
@@ -23,8 +23,47 @@ def empty_commit(message: str) -> None:
     run(["git", "commit", "-m", message, "--allow-empty"])
 
 
-def push(remote: str, branch: str) -> None:
-    run(["git", "push", "-u", remote, branch])
+def push(remote: str, branch: str) -> bool:
+    return run(["git", "push", "-u", remote, branch]).is_success()
+
+
+def fetch(remote: str) -> bool:
+    return run(["git", "fetch", "--prune", remote]).is_success()
+
+
+def force_push(remote: str, refspecs: List[str]) -> bool:
+    return run(["git", "push", "--force", remote, *refspecs]).is_success()
+
+
+def checkout_branch(branch: str, start_point: str) -> None:
+    run(["git", "checkout", "-B", branch, start_point])
+
+
+def get_remote_default_branch(remote: str) -> Optional[str]:
+    result = run(["git", "ls-remote", "--symref", remote, "HEAD"])
+    if not result.is_success():
+        return None
+
+    match = re.search(r"^ref: refs/heads/(\S+)\s+HEAD", result.stdout, re.MULTILINE)
+    return match.group(1) if match else None
+
+
+def get_remote_branches(remote: str) -> List[str]:
+    result = run(["git", "ls-remote", "--heads", remote])
+    if not result.is_success():
+        return []
+    return [
+        line.split("\t", 1)[1].removeprefix("refs/heads/")
+        for line in result.stdout.splitlines()
+        if "\t" in line
+    ]
+
+
+def get_remote_commit(remote: str, branch: str) -> Optional[str]:
+    result = run(["git", "ls-remote", "--heads", remote, branch])
+    if not result.is_success() or "\t" not in result.stdout:
+        return None
+    return result.stdout.split("\t", 1)[0]
 
 
 def get_git_version() -> Optional[Version]:
@@ -1,8 +1,18 @@
+import json
+import random
 import re
-from typing import List, Optional
+import time
+from typing import Any, Dict, List, Optional
 
+from app.utils.click import get_session
 from app.utils.command import run
 
+FORK_READY_TIMEOUT = 60.0
+FORK_POLL_INITIAL_INTERVAL = 0.5
+FORK_POLL_MAX_INTERVAL = 4.0
+# Keeps each batched mutation well within Github's GraphQL query size limits
+CLOSE_PRS_BATCH_SIZE = 50
+
 
 def is_github_cli_installed() -> bool:
     # If git is not installed yet, we should expect a 127 exit code
@@ -51,6 +61,25 @@ def has_fork(fork_name: str) -> bool:
     return result.is_success() and result.stdout == "true"
 
 
+def get_fork_parent(fork_name: str) -> Optional[str]:
+    result = run(
+        [
+            "gh",
+            "repo",
+            "view",
+            fork_name,
+            "--json",
+            "parent",
+            "--jq",
+            '.parent.owner.login + "/" + .parent.name',
+        ],
+        env={"GH_PAGER": "cat"},
+    )
+    if result.is_success() and result.stdout:
+        return result.stdout
+    return None
+
+
 def get_repo_ssh_url(repo: str) -> Optional[str]:
     result = run(
         ["gh", "repo", "view", repo, "--json", "sshUrl", "--jq", ".sshUrl"],
@@ -71,7 +100,9 @@ def get_repo_https_url(repo: str) -> Optional[str]:
     return None
 
 
-def fork(repository_name: str, fork_name: str, all_branches: bool | None = False) -> None:
+def fork(
+    repository_name: str, fork_name: str, all_branches: bool | None = False
+) -> None:
     fork_command = [
         "gh",
         "repo",
@@ -85,6 +116,38 @@ def fork(repository_name: str, fork_name: str, all_branches: bool | None = False
     run(fork_command)
 
 
+def has_branches(repository_name: str) -> bool:
+    result = run(
+        [
+            "gh",
+            "api",
+            f"repos/{repository_name}/branches?per_page=1",
+            "--jq",
+            "length",
+        ],
+        env={"GH_PAGER": "cat"},
+    )
+    return result.is_success() and result.stdout not in ("", "0")
+
+
+def wait_for_fork(repository_name: str, timeout: float = FORK_READY_TIMEOUT) -> bool:
+    """Polls until a fork can be cloned, returning False if it is not ready in time.
+
+    Github creates forks asynchronously, so a new fork has no branches for a short
+    while after it is created.
+    """
+    deadline = time.monotonic() + timeout
+    interval = FORK_POLL_INITIAL_INTERVAL
+    while not has_branches(repository_name):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        # Jitter keeps students in the same lab from polling Github in lockstep
+        time.sleep(min(remaining, random.uniform(interval / 2, interval)))
+        interval = min(interval * 2, FORK_POLL_MAX_INTERVAL)
+    return True
+
+
 def clone(repository_name: str) -> None:
     run(["gh", "repo", "clone", repository_name])
 
@@ -97,8 +160,23 @@ def delete_repo(repository_name: str) -> None:
     run(["gh", "repo", "delete", repository_name, "--yes"])
 
 
-def pull_request(repo: str, base: str, head: str, title: str, body: str) -> None:
-    run(
+def graphql(query: str, variables: Dict[str, str] = {}) -> Optional[Dict[str, Any]]:
+    command = ["gh", "api", "graphql", "-f", f"query={query}"]
+    for name, value in variables.items():
+        command.extend(["-f", f"{name}={value}"])
+    result = run(command, env={"GH_PAGER": "cat"})
+    if not result.is_success():
+        return None
+    try:
+        return json.loads(result.stdout)["data"]
+    except (json.JSONDecodeError, KeyError):
+        return None
+
+
+def pull_request(
+    repo: str, base: str, head: str, title: str, body: str
+) -> Optional[str]:
+    result = run(
         [
             "gh",
             "pr",
@@ -115,41 +193,95 @@ def pull_request(repo: str, base: str, head: str, title: str, body: str) -> None
             body,
         ],
     )
+    if result.is_success() and result.stdout:
+        # The URL of the new pull request is printed last
+        return result.stdout.splitlines()[-1]
+    return None
 
 
-def get_prs(repo: str, head: str, owner: str) -> List[str]:
-    result = run(
-        [
-            "gh",
-            "pr",
-            "list",
-            "--repo",
-            repo,
-            "--author",
-            "@me",
-            "--head",
-            head,
-            "--json",
-            "headRepositoryOwner",
-            "--json",
-            "url",
-            "-q",
-            f'.[] | select ( .headRepositoryOwner.login == "{owner}" ) | .url',
-        ],
-        env={"GH_PAGER": "cat"},
+VIEWER_OPEN_PRS_QUERY = """
+query($search: String!) {
+  search(type: ISSUE, query: $search, first: 100) {
+    nodes { ... on PullRequest { id url headRepositoryOwner { login } } }
+  }
+}
+"""
+
+
+def _get_viewer_open_prs(repo: str, head: Optional[str] = None) -> List[Dict[str, Any]]:
+    # Filtered by the search rather than after listing, as repositories such as the
+    # progress one have more open pull requests than fit in a single page
+    search = f"repo:{repo} is:pr is:open author:@me"
+    if head is not None:
+        search += f" head:{head}"
+    data = graphql(VIEWER_OPEN_PRS_QUERY, {"search": search})
+    if data is None or data["search"] is None:
+        return []
+    return [pr for pr in data["search"]["nodes"] if pr]
+
+
+VIEWER_OPEN_PRS_BY_HEAD_QUERY = """
+query($owner: String!, $name: String!, $head: String!) {
+  viewer { login }
+  repository(owner: $owner, name: $name) {
+    pullRequests(
+      headRefName: $head
+      states: OPEN
+      first: 100
+      orderBy: { field: CREATED_AT, direction: DESC }
+    ) {
+      nodes { id url author { login } headRepositoryOwner { login } }
+    }
+  }
+}
+"""
+
+
+def _get_viewer_open_prs_by_head(repo: str, head: str) -> List[Dict[str, Any]]:
+    # Newest first, as this only needs to find pull requests too new to be searched
+    owner, name = repo.split("/", 1)
+    data = graphql(
+        VIEWER_OPEN_PRS_BY_HEAD_QUERY, {"owner": owner, "name": name, "head": head}
     )
+    if data is None or data["repository"] is None:
+        return []
+    viewer = data["viewer"]["login"]
+    return [
+        pr
+        for pr in data["repository"]["pullRequests"]["nodes"]
+        if pr and pr["author"] is not None and pr["author"]["login"] == viewer
+    ]
 
-    if result.is_success():
-        prs = result.stdout.splitlines()
-        return prs
-    return []
+
+def get_prs(repo: str, head: str, owner: str) -> List[str]:
+    """Returns the open pull requests by the current user from owner's head branch."""
+    prs = _get_viewer_open_prs(repo, head)
+    if len(prs) == 0:
+        # The search index lags behind by up to minutes, so a pull request that was
+        # just opened is looked up on the repository instead
+        prs = _get_viewer_open_prs_by_head(repo, head)
+    return [
+        pr["url"]
+        for pr in prs
+        if pr["headRepositoryOwner"] is not None
+        and pr["headRepositoryOwner"]["login"] == owner
+    ]
 
 
 def get_username() -> str:
+    # Long-lived processes look the username up once rather than on every command
+    session = get_session()
+    if session is not None:
+        username = session.get_github_username()
+        if username is not None:
+            return username
+
     result = run(["gh", "api", "user", "-q", ".login"])
 
     if result.is_success():
         username = result.stdout.splitlines()[0]
+        if session is not None:
+            session.set_github_username(username)
         return username
     return ""
 
@@ -174,66 +306,18 @@ def get_user_orgs() -> List[str]:
 
 
 def get_user_prs(repo: str, owner: str) -> List[str]:
-    result = run(
-        [
-            "gh",
-            "pr",
-            "list",
-            "--repo",
-            repo,
-            "--author",
-            "@me",
-            "--head",
-            "submission",
-            "--json",
-            "headRepositoryOwner",
-            "--json",
-            "url",
-            "-q",
-            f'.[] | select ( .headRepositoryOwner.login == "{owner}" ) | .url',
-        ],
-        env={"GH_PAGER": "cat"},
-    )
-    if result.is_success():
-        prs = result.stdout.splitlines()
-        return prs
-    return []
+    return get_prs(repo, "submission", owner)
 
 
 def close_prs(repo: str) -> None:
     """Close all open pull requests authored by the current user in `repo`."""
-
-    result = run(
-        [
-            "gh",
-            "pr",
-            "list",
-            "--repo",
-            repo,
-            "--author",
-            "@me",
-            "--state",
-            "open",
-            "--json",
-            "number",
-            "--jq",
-            ".[].number",
-        ],
-        env={"GH_PAGER": "cat"},
-    )
-
-    if not result.is_success():
-        return
-
-    for pr_number in result.stdout.splitlines():
-        run(
-            [
-                "gh",
-                "pr",
-                "close",
-                pr_number,
-                "--repo",
-                repo,
-            ],
-            env={"GH_PAGER": "cat"},
-        )
\ No newline at end of file
+    pr_ids = [pr["id"] for pr in _get_viewer_open_prs(repo)]
+
+    # Pull requests are closed through aliased mutations, one request per batch
+    for start in range(0, len(pr_ids), CLOSE_PRS_BATCH_SIZE):
+        batch = pr_ids[start : start + CLOSE_PRS_BATCH_SIZE]
+        mutations = "\n".join(
+            f"  close{index}: closePullRequest(input: {{pullRequestId: {json.dumps(pr_id)}}}) {{ clientMutationId }}"
+            for index, pr_id in enumerate(batch)
+        )
+        graphql(f"mutation {{\n{mutations}\n}}")
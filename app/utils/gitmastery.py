@@ -1,11 +1,17 @@
+import contextlib
+import dataclasses
+import hashlib
 import inspect
 import os
+import re
 import sys
 import tempfile
 from pathlib import Path
 from typing import (
     Any,
     Dict,
+    List,
+    NoReturn,
     Optional,
     Self,
     Type,
@@ -13,15 +19,36 @@ from typing import (
     Union,
 )
 import shutil
+from dataclasses import dataclass
 
+import click
 from git import Repo
 
-from app.configs.gitmastery_config import GIT_MASTERY_EXERCISES_SOURCE
-from app.utils.click import get_gitmastery_root_config, info
-from app.utils.general import ensure_str
+from app.configs.gitmastery_config import (
+    GIT_MASTERY_EXERCISES_SOURCE,
+    GitMasteryConfig,
+)
+from app.utils.click import (
+    CliContextKey,
+    error,
+    get_gitmastery_root_config,
+    get_session,
+    info,
+    is_offline,
+)
+from app.utils.bundle import ExercisesBundle
+from app.utils.exercises_cache import (
+    BYTECODE_CACHE_FOLDER_NAME,
+    ExercisesCache,
+    compile_script,
+)
+from app.utils.general import ensure_bytes, ensure_str
+from app.utils.mirror import fetch_mirror_bundle
 
 T = TypeVar("T")
 
+# Full SHA-1 or SHA-256 object names, as abbreviated ones cannot be fetched
+COMMIT_SHA_PATTERN = re.compile(r"[0-9a-f]{40}|[0-9a-f]{64}")
 
 EXERCISE_UTILS_FILES = [
     "__init__",
@@ -36,6 +63,17 @@ EXERCISE_UTILS_FILES = [
 ]
 
 
+def _get_bytecode_dir() -> Optional[Path]:
+    # Scripts may be loaded in worker processes that run outside of a click context
+    ctx = click.get_current_context(silent=True)
+    if ctx is None or ctx.obj is None:
+        return None
+    config = ctx.obj.get(CliContextKey.GITMASTERY_ROOT_CONFIG, None)
+    if config is None:
+        return None
+    return config.cache_dir / BYTECODE_CACHE_FOLDER_NAME
+
+
 def _clear_exercise_utils_modules() -> None:
     """Clear cached exercise_utils modules from sys.modules.
 
@@ -52,37 +90,210 @@ def _clear_exercise_utils_modules() -> None:
 
 
 class ExercisesRepo:
-    def __init__(self) -> None:
+    def __init__(self, commit: Optional[str] = None) -> None:
         """Creates a sparse clone of the exercises repository.
 
         Used to minimize Github API calls to the raw. domain as sparse clones will use
         the regular Git server calls which are not a part of the Github API calls.
         These greatly reduce the rate in which the Git-Mastery app will hit the Github
         API rate limit.
+
+        A commit can be given to read a remote source as it was at that commit, such
+        as the one an exercise was downloaded from.
         """
 
+        self.__commit = commit
         self.__repo: Optional[Repo] = None
         self.__temp_dir: Optional[tempfile.TemporaryDirectory] = None
+        self.__is_local = False
+        self.__cache: Optional[ExercisesCache] = None
+        self.__offline = False
+        self.__bundle: Optional[ExercisesBundle] = None
+        # Pinned sources are only fetched once something is missing from the cache
+        self.__pinned_source: Optional[GitMasteryConfig.ExercisesSource] = None
+        self.__source_commit: Optional[str] = None
 
     @property
     def repo(self) -> Repo:
+        if self.__repo is None and self.__pinned_source is not None:
+            self.__clone(self.__pinned_source)
         assert self.__repo is not None
         return self.__repo
 
+    def _reads_cache_first(self) -> bool:
+        # The files of a pinned commit never change, so cached copies are always current
+        return self.__offline or self.__pinned_source is not None
+
     def checkout(self, file_path: Union[str, Path]) -> None:
         self.repo.git.sparse_checkout("set", "--skip-checks", file_path)
 
+    def _not_cached(self, file_path: Union[str, Path]) -> NoReturn:
+        error(
+            f"{click.style(str(file_path), bold=True)} is not available offline. "
+            "Run the command once while connected so that it is cached."
+        )
+
     def has_file(self, file_path: Union[str, Path]) -> bool:
+        if self.__bundle is not None:
+            return self.__bundle.has_file(file_path)
+
+        if self._reads_cache_first():
+            assert self.__cache is not None
+            cached_exists = self.__cache.has_file(file_path)
+            if cached_exists is not None:
+                return cached_exists
+            if self.__offline:
+                self._not_cached(file_path)
+
         self.checkout(file_path)
-        return os.path.exists(Path(self.repo.working_dir) / file_path)
+        exists = os.path.exists(Path(self.repo.working_dir) / file_path)
+        if self.__cache is not None and not exists:
+            self.__cache.put_missing(file_path)
+        return exists
 
     def fetch_file_contents(
         self, file_path: Union[str, Path], is_binary: bool
     ) -> str | bytes:
+        if self.__bundle is not None:
+            if not self.__bundle.has_file(file_path):
+                raise FileNotFoundError(f"{file_path} is not in the exercises bundle")
+            contents = self.__bundle.read_file(file_path)
+            return contents if is_binary else contents.decode("utf-8")
+
+        if self._reads_cache_first():
+            assert self.__cache is not None
+            cached = self.__cache.get_file(file_path, is_binary)
+            if cached is not None:
+                return cached
+            if self.__offline:
+                self._not_cached(file_path)
+
         self.checkout(file_path)
+        return self._read_checked_out_file(file_path, is_binary)
+
+    def _read_checked_out_file(
+        self, file_path: Union[str, Path], is_binary: bool
+    ) -> str | bytes:
         read_mode = "rb" if is_binary else "rt"
         with open(Path(self.repo.working_dir) / file_path, read_mode) as file:
-            return file.read()
+            contents = file.read()
+        if self.__cache is not None:
+            self.__cache.put_file(file_path, contents)
+        return contents
+
+    @property
+    def is_cached(self) -> bool:
+        return self.__cache is not None
+
+    @property
+    def commit(self) -> Optional[str]:
+        if self.__bundle is not None:
+            return self.__bundle.commit
+        if self.__source_commit is not None:
+            return self.__source_commit
+        if self.__repo is None:
+            return None
+        return self.__repo.head.commit.hexsha
+
+    @property
+    def source_commit(self) -> Optional[str]:
+        """The commit of a remote source the files are read from, if it is known."""
+        if self.__bundle is not None or self.__is_local:
+            return None
+        return self.commit
+
+    def list_files(self, folder: Union[str, Path]) -> List[str]:
+        """Lists the files under a folder without downloading them."""
+        if self.__bundle is not None:
+            return self.__bundle.list_files(folder)
+
+        if self.__offline:
+            self._not_cached(folder)
+
+        if self.__is_local:
+            root = Path(self.repo.working_dir)
+            return sorted(
+                path.relative_to(root).as_posix()
+                for path in (root / folder).rglob("*")
+                if path.is_file() and ".git" not in path.relative_to(root).parts
+            )
+
+        output = self.repo.git.ls_tree(
+            "-r", "--name-only", "HEAD", "--", Path(folder).as_posix()
+        )
+        return output.splitlines()
+
+    def get_file_sizes(self, folder: Union[str, Path]) -> Dict[str, int]:
+        """Returns the size of every file under a folder without downloading them."""
+        if self.__bundle is not None:
+            return self.__bundle.get_file_sizes(folder)
+
+        if self.__offline:
+            self._not_cached(folder)
+
+        if self.__is_local:
+            root = Path(self.repo.working_dir)
+            return {
+                file_path: (root / file_path).stat().st_size
+                for file_path in self.list_files(folder)
+            }
+
+        # Each line is "<mode> <type> <object> <size>\t<path>"
+        output = self.repo.git.ls_tree(
+            "-r", "-l", "HEAD", "--", Path(folder).as_posix()
+        )
+        sizes = {}
+        for line in output.splitlines():
+            details, file_path = line.split("\t", 1)
+            size = details.split()[3]
+            sizes[file_path] = int(size) if size.isdigit() else 0
+        return sizes
+
+    def fetch_files(self, file_paths: List[str]) -> Dict[str, bytes]:
+        """Fetches the contents of several files in a single batch."""
+        if self.__bundle is not None or self.__offline or len(file_paths) == 0:
+            return {
+                file_path: ensure_bytes(self.fetch_file_contents(file_path, True))
+                for file_path in file_paths
+            }
+        files: Dict[str, bytes] = {}
+        if self.__pinned_source is not None:
+            assert self.__cache is not None
+            for file_path in file_paths:
+                cached = self.__cache.get_file(file_path, True)
+                if cached is not None:
+                    files[file_path] = ensure_bytes(cached)
+        missing = [file_path for file_path in file_paths if file_path not in files]
+        if len(missing) > 0:
+            self.repo.git.sparse_checkout("set", "--skip-checks", *missing)
+            for file_path in missing:
+                files[file_path] = ensure_bytes(
+                    self._read_checked_out_file(file_path, True)
+                )
+        return {file_path: files[file_path] for file_path in file_paths}
+
+    def prefetch(self, paths: List[str]) -> Dict[str, bytes]:
+        """Caches every file under the given paths, returning their contents.
+
+        All of the paths are checked out together so that their contents are fetched
+        in a single batch rather than once per file.
+        """
+        if len(paths) == 0:
+            return {}
+        if self.__bundle is not None:
+            return self.fetch_files(
+                [file_path for path in paths for file_path in self.list_files(path)]
+            )
+        self.repo.git.sparse_checkout("set", "--skip-checks", *paths)
+
+        files: Dict[str, bytes] = {}
+        for path in paths:
+            for file_path in self.list_files(path):
+                if os.path.isfile(Path(self.repo.working_dir) / file_path):
+                    files[file_path] = ensure_bytes(
+                        self._read_checked_out_file(file_path, True)
+                    )
+        return files
 
     def download_file(
         self,
@@ -100,30 +311,137 @@ class ExercisesRepo:
             with open(download_to_path, "w+") as file:
                 file.write(contents)
 
-    def __enter__(self) -> Self:
-        self.__temp_dir = tempfile.TemporaryDirectory()
+    def get_folder_hash(self, folder: Union[str, Path]) -> str:
+        """Identifies the contents of a folder without downloading its files."""
+        if self.__bundle is not None:
+            bundle_hash = self.__bundle.get_folder_hash(folder)
+            if bundle_hash is None:
+                raise FileNotFoundError(f"{folder} is not in the exercises bundle")
+            return bundle_hash
+
+        if self._reads_cache_first():
+            assert self.__cache is not None
+            cached_hash = self.__cache.get_folder_hash(folder)
+            if cached_hash is not None:
+                return cached_hash
+            if self.__offline:
+                self._not_cached(folder)
+
+        if not self.__is_local:
+            folder_hash = self.repo.git.rev_parse(f"HEAD:{Path(folder).as_posix()}")
+            if self.__cache is not None:
+                self.__cache.put_folder_hash(folder, folder_hash)
+            return folder_hash
+
+        # Local sources are copied along with any uncommitted changes, so the files
+        # themselves are hashed
+        digest = hashlib.sha256()
+        root = Path(self.repo.working_dir) / folder
+        for path in sorted(root.rglob("*")):
+            if path.is_file():
+                digest.update(path.relative_to(root).as_posix().encode("utf-8") + b"\0")
+                digest.update(path.read_bytes())
+        return digest.hexdigest()
+
+    def open(
+        self,
+        exercises_source: GitMasteryConfig.ExercisesSource,
+        cache: Optional[ExercisesCache] = None,
+        offline: bool = False,
+    ) -> None:
+        if exercises_source.type == "bundle":
+            if exercises_source.bundle_path is None:
+                raise ValueError(
+                    "Bundle path is required for using a bundle exercises source"
+                )
+            info(f"Using exercises bundle at {exercises_source.bundle_path}")
+            bundle_path = Path(exercises_source.bundle_path).expanduser().resolve()
+            if not bundle_path.exists():
+                raise FileNotFoundError(f"Exercises bundle not found: {bundle_path}")
+            self.__bundle = ExercisesBundle(bundle_path)
+            return
+
+        if exercises_source.type == "mirror":
+            if exercises_source.url is None:
+                raise ValueError("URL is required for using a mirror exercises source")
+            info(
+                f"Fetching exercise information from the mirror at {exercises_source.url}"
+            )
+            if cache is not None:
+                destination_dir = cache.root
+            else:
+                self.__temp_dir = tempfile.TemporaryDirectory()
+                destination_dir = Path(self.__temp_dir.name)
+            self.__bundle = ExercisesBundle(
+                fetch_mirror_bundle(exercises_source.url, destination_dir, offline)
+            )
+            return
+
+        self.__is_local = exercises_source.type == "local"
+        # Local sources are always available, so they are neither cached nor skipped
+        self.__cache = None if self.__is_local else cache
+        self.__offline = offline and not self.__is_local
+        if not self.__is_local:
+            if exercises_source.commit is not None and not COMMIT_SHA_PATTERN.fullmatch(
+                exercises_source.commit
+            ):
+                raise ValueError(
+                    f"Commit of the exercises source must be a full commit SHA, got {exercises_source.commit}"
+                )
+            self.__source_commit = exercises_source.commit
 
-        gitmastery_config = get_gitmastery_root_config()
-        if gitmastery_config is not None:
-            exercises_source = gitmastery_config.exercises_source
-        else:
-            exercises_source = GIT_MASTERY_EXERCISES_SOURCE
+        if self.__offline:
+            if self.__cache is None:
+                error(
+                    "Exercises can only be used offline from within a Git-Mastery root folder."
+                )
+            if self.__source_commit is None:
+                # Branches are read as they were when they were last fetched
+                self.__source_commit = self.__cache.get_latest_commit()
+                if self.__source_commit is not None:
+                    self.__cache = self.__cache.at_commit(self.__source_commit)
+            info("Using cached exercise information as you are offline")
+            return
 
         if exercises_source.type == "local":
+            self.__temp_dir = tempfile.TemporaryDirectory()
             # copy local repo into temp dir for isolation
             if exercises_source.repo_path is None:
-                raise ValueError("Repo path is required for using local exercises source")
+                raise ValueError(
+                    "Repo path is required for using local exercises source"
+                )
             info(f"Using local exercises source at {exercises_source.repo_path}")
             src = Path(exercises_source.repo_path).expanduser().resolve()
             if not src.exists():
                 raise FileNotFoundError(f"Local exercises source not found: {src}")
-            shutil.copytree(src, self.__temp_dir.name, dirs_exist_ok=True, symlinks=False, copy_function=shutil.copy2)
+            shutil.copytree(
+                src,
+                self.__temp_dir.name,
+                dirs_exist_ok=True,
+                symlinks=False,
+                copy_function=shutil.copy2,
+            )
             self.__repo = Repo(self.__temp_dir.name)
-        else:
+            return
+
+        if exercises_source.commit is not None and self.__cache is not None:
+            self.__pinned_source = exercises_source
+            return
+
+        self.__clone(exercises_source)
+        if exercises_source.commit is None:
+            self.__source_commit = self.repo.head.commit.hexsha
+            if self.__cache is not None:
+                # Files are cached by commit so that a moving branch never mixes them
+                self.__cache.put_latest_commit(self.__source_commit)
+                self.__cache = self.__cache.at_commit(self.__source_commit)
+
+    def __clone(self, exercises_source: GitMasteryConfig.ExercisesSource) -> None:
+        self.__temp_dir = tempfile.TemporaryDirectory()
+        if exercises_source.commit is None:
             info(
                 f"Fetching exercise information from {exercises_source.to_url()} on branch {exercises_source.branch}"
             )
-
             self.__repo = Repo.clone_from(
                 exercises_source.to_url(),
                 self.__temp_dir.name,
@@ -131,6 +449,56 @@ class ExercisesRepo:
                 branch=exercises_source.branch,
                 multi_options=["--filter=blob:none", "--sparse"],
             )
+            return
+
+        info(
+            f"Fetching exercise information from {exercises_source.to_url()} at commit {exercises_source.commit}"
+        )
+        # Only branches and tags can be cloned, so the commit is fetched into an empty
+        # repository with the same sparse, blobless setup as a clone
+        repo = Repo.init(self.__temp_dir.name)
+        repo.create_remote("origin", exercises_source.to_url())
+        repo.git.sparse_checkout("set")
+        repo.git.fetch(
+            "--depth=1", "--filter=blob:none", "origin", exercises_source.commit
+        )
+        repo.git.checkout("--detach", exercises_source.commit)
+        self.__repo = repo
+
+    def close(self) -> None:
+        if self.__bundle is not None:
+            self.__bundle.close()
+            self.__bundle = None
+        if self.__repo is not None:
+            self.__repo.close()
+            self.__repo = None
+        if self.__temp_dir is not None:
+            self.__temp_dir.cleanup()
+            self.__temp_dir = None
+        self.__pinned_source = None
+        self.__source_commit = None
+
+    def __enter__(self) -> "ExercisesRepo":
+        gitmastery_config = get_gitmastery_root_config()
+        if gitmastery_config is not None:
+            exercises_source = gitmastery_config.exercises_source
+        else:
+            exercises_source = GIT_MASTERY_EXERCISES_SOURCE
+        if self.__commit is not None and exercises_source.type == "remote":
+            exercises_source = dataclasses.replace(
+                exercises_source, commit=self.__commit
+            )
+        cache: Optional[ExercisesCache] = None
+        if gitmastery_config is not None:
+            cache = ExercisesCache(gitmastery_config.cache_dir, exercises_source)
+        offline = is_offline()
+
+        # Long-lived processes keep the exercises repository open across commands
+        session = get_session()
+        if session is not None:
+            return session.get_exercises_repo(exercises_source, cache, offline)
+
+        self.open(exercises_source, cache, offline)
         return self
 
     def __exit__(
@@ -139,8 +507,50 @@ class ExercisesRepo:
         exc_val: BaseException | None,
         exc_tb: object | None,
     ) -> None:
-        if self.__temp_dir is not None:
-            self.__temp_dir.cleanup()
+        self.close()
+
+
+def write_exercise_utils(root: Path, exercise_utils: Dict[str, str]) -> None:
+    """Writes the exercise_utils package into root so that it can be imported."""
+    package_root = root / "exercise_utils"
+    os.makedirs(package_root, exist_ok=True)
+    for filename, exercise_utils_src in exercise_utils.items():
+        with open(package_root / f"{filename}.py", "w", encoding="utf-8") as f:
+            f.write(exercise_utils_src)
+
+
+@dataclass
+class ScriptSources:
+    """Source of an exercise script along with the exercise_utils it imports."""
+
+    file_path: str
+    script: str
+    exercise_utils: Dict[str, str]
+
+    @classmethod
+    def fetch(
+        cls: Type[Self], exercises_repo: ExercisesRepo, file_path: Union[str, Path]
+    ) -> Self:
+        script = ensure_str(exercises_repo.fetch_file_contents(file_path, False))
+        exercise_utils = {
+            filename: ensure_str(
+                exercises_repo.fetch_file_contents(
+                    f"exercise_utils/{filename}.py", False
+                )
+            )
+            for filename in EXERCISE_UTILS_FILES
+        }
+        return cls(str(file_path), script, exercise_utils)
+
+    @property
+    def digest(self) -> str:
+        """Content hash of the script and every exercise_utils file it can import."""
+        digest = hashlib.sha256()
+        digest.update(self.script.encode("utf-8"))
+        for filename in sorted(self.exercise_utils):
+            digest.update(b"\0" + filename.encode("utf-8") + b"\0")
+            digest.update(self.exercise_utils[filename].encode("utf-8"))
+        return digest.hexdigest()
 
 
 class Namespace:
@@ -151,29 +561,37 @@ class Namespace:
     def load_file_as_namespace(
         cls: Type[Self], exercises_repo: ExercisesRepo, file_path: Union[str, Path]
     ) -> Self:
-        sys.dont_write_bytecode = True
-        py_file = exercises_repo.fetch_file_contents(file_path, False)
+        return cls.load_sources_as_namespace(
+            ScriptSources.fetch(exercises_repo, file_path)
+        )
+
+    @classmethod
+    def load_sources_as_namespace(cls: Type[Self], sources: ScriptSources) -> Self:
         namespace: Dict[str, Any] = {}
 
         # Clear any cached exercise_utils modules to ensure fresh imports
         _clear_exercise_utils_modules()
 
-        with tempfile.TemporaryDirectory() as tmpdir:
-            package_root = os.path.join(tmpdir, "exercise_utils")
-            os.makedirs(package_root, exist_ok=True)
-
-            for filename in EXERCISE_UTILS_FILES:
-                exercise_utils_src = exercises_repo.fetch_file_contents(
-                    f"exercise_utils/{filename}.py", False
-                )
-                with open(f"{package_root}/{filename}.py", "w", encoding="utf-8") as f:
-                    f.write(ensure_str(exercise_utils_src))
-
-            sys.path.insert(0, tmpdir)
+        with contextlib.ExitStack() as stack:
+            session = get_session()
+            if session is not None:
+                root = session.get_exercise_utils_dir(sources.exercise_utils)
+            else:
+                root = Path(stack.enter_context(tempfile.TemporaryDirectory()))
+                write_exercise_utils(root, sources.exercise_utils)
+            # Only a session folder outlives the command, so only its bytecode is kept
+            sys.dont_write_bytecode = session is None
+
+            sys.path.insert(0, str(root))
             try:
-                exec(py_file, namespace)
+                exec(
+                    compile_script(
+                        sources.script, sources.file_path, _get_bytecode_dir()
+                    ),
+                    namespace,
+                )
             finally:
-                sys.path.remove(tmpdir)
+                sys.path.remove(str(root))
                 # Clean up cached modules again after execution
                 _clear_exercise_utils_modules()
                 sys.dont_write_bytecode = False
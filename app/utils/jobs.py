@@ -0,0 +1,123 @@
+import os
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.utils.command import get_gitmastery_command
+
+JOB_POLL_INTERVAL = 0.1
+
+
+@dataclass
+class Job:
+    job_id: int
+    args: List[str]
+    process: subprocess.Popen
+    output_path: Path
+    started_at: float
+    finished_at: Optional[float] = None
+    # Whether the user has been told that the job finished
+    reported: bool = False
+
+    @property
+    def command_line(self) -> str:
+        return " ".join(["gitmastery", *self.args])
+
+    @property
+    def is_running(self) -> bool:
+        if self.finished_at is None and self.process.poll() is not None:
+            self.finished_at = time.monotonic()
+        return self.finished_at is None
+
+    @property
+    def elapsed(self) -> float:
+        end = time.monotonic() if self.is_running else self.finished_at
+        return (end or self.started_at) - self.started_at
+
+    def read_output(self, offset: int = 0) -> bytes:
+        with open(self.output_path, "rb") as file:
+            file.seek(offset)
+            return file.read()
+
+
+class JobManager:
+    """Runs Git-Mastery commands in the background for the REPL.
+
+    Each job is a separate process, as commands change the working directory and
+    write to stdout, neither of which can be shared by commands running together.
+    Their output is kept in a file so that it can be shown once the user asks.
+    """
+
+    def __init__(self) -> None:
+        self.__jobs: Dict[int, Job] = {}
+        self.__next_id = 1
+        self.__output_dir: Optional[tempfile.TemporaryDirectory] = None
+
+    @property
+    def jobs(self) -> List[Job]:
+        return list(self.__jobs.values())
+
+    @property
+    def running(self) -> List[Job]:
+        return [job for job in self.__jobs.values() if job.is_running]
+
+    def start(self, args: List[str], offline: bool) -> Job:
+        if self.__output_dir is None:
+            self.__output_dir = tempfile.TemporaryDirectory(prefix="gitmastery-jobs-")
+        job_id = self.__next_id
+        self.__next_id += 1
+
+        output_path = Path(self.__output_dir.name) / f"{job_id}.log"
+        env = dict(os.environ)
+        if offline:
+            env["GITMASTERY_OFFLINE"] = "1"
+        with open(output_path, "wb") as output:
+            process = subprocess.Popen(
+                get_gitmastery_command() + args,
+                stdin=subprocess.DEVNULL,
+                stdout=output,
+                stderr=subprocess.STDOUT,
+                env=env,
+            )
+        job = Job(
+            job_id=job_id,
+            args=args,
+            process=process,
+            output_path=output_path,
+            started_at=time.monotonic(),
+        )
+        self.__jobs[job_id] = job
+        return job
+
+    def get(self, job_id: Optional[int]) -> Optional[Job]:
+        """Returns the given job, or the most recently started one."""
+        if job_id is None:
+            return self.__jobs[max(self.__jobs)] if self.__jobs else None
+        return self.__jobs.get(job_id)
+
+    def take_finished(self) -> List[Job]:
+        """Returns the jobs that finished since this was last called."""
+        finished = [
+            job
+            for job in self.__jobs.values()
+            if not job.is_running and not job.reported
+        ]
+        for job in finished:
+            job.reported = True
+        return finished
+
+    def close(self) -> None:
+        for job in self.running:
+            job.process.terminate()
+        for job in self.__jobs.values():
+            try:
+                job.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                job.process.kill()
+        self.__jobs.clear()
+        if self.__output_dir is not None:
+            self.__output_dir.cleanup()
+            self.__output_dir = None
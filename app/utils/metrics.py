@@ -0,0 +1,70 @@
+import json
+import logging
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+from app.configs.gitmastery_config import GITMASTERY_METRICS_NAME
+from app.logging.setup_logging import METRICS_BACKUP_COUNT, METRICS_LOGGER_NAME
+
+metrics_logger = logging.getLogger(METRICS_LOGGER_NAME)
+
+
+@dataclass
+class CommandMetric:
+    command: List[str]
+    cwd: str
+    started_at: float
+    duration: float
+    returncode: int
+    stdout_bytes: int
+    stderr_bytes: int
+
+    @property
+    def command_type(self) -> str:
+        # Group by the executable and its subcommand (e.g. "git push", "gh pr") so
+        # that arguments like repository names do not fragment the statistics
+        positional = [part for part in self.command[1:] if not part.startswith("-")]
+        return " ".join(self.command[:1] + positional[:1])
+
+
+def record_command(metric: CommandMetric) -> None:
+    metrics_logger.info(json.dumps(metric.__dict__))
+
+
+def read_metrics(metadata_dir: Path) -> List[CommandMetric]:
+    """Reads all metrics records, oldest first, including rotated backups."""
+    metrics_path = metadata_dir / GITMASTERY_METRICS_NAME
+    paths = [
+        Path(f"{metrics_path}.{i}") for i in range(METRICS_BACKUP_COUNT, 0, -1)
+    ] + [metrics_path]
+
+    metrics = []
+    for path in paths:
+        if not path.is_file():
+            continue
+        with open(path, "r") as metrics_file:
+            for line in metrics_file:
+                try:
+                    metrics.append(CommandMetric(**json.loads(line)))
+                except (json.JSONDecodeError, TypeError):
+                    # Partially written or outdated records are skipped
+                    continue
+    return metrics
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile of values."""
+    ordered = sorted(values)
+    rank = max(math.ceil(p / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def group_by_command_type(
+    metrics: List[CommandMetric],
+) -> Dict[str, List[CommandMetric]]:
+    groups: Dict[str, List[CommandMetric]] = {}
+    for metric in metrics:
+        groups.setdefault(metric.command_type, []).append(metric)
+    return groups
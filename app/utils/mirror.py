@@ -0,0 +1,63 @@
+import logging
+import os
+from pathlib import Path
+
+import requests
+
+from app.utils.click import error, warn
+
+logger = logging.getLogger(__name__)
+
+MIRROR_BUNDLE_ROUTE = "/exercises.gmbundle"
+MIRROR_BUNDLE_NAME = "mirror.gmbundle"
+MIRROR_ETAG_NAME = "mirror.etag"
+MIRROR_REQUEST_TIMEOUT = 10
+MIRROR_CHUNK_SIZE = 64 * 1024
+
+
+def fetch_mirror_bundle(url: str, destination_dir: Path, offline: bool) -> Path:
+    """Downloads the bundle served by a mirror, unless the copy kept is still current.
+
+    The copy from the last download is used when offline or when the mirror cannot be
+    reached, so a lab keeps working if the machine serving it goes down.
+    """
+    bundle_path = destination_dir / MIRROR_BUNDLE_NAME
+    etag_path = destination_dir / MIRROR_ETAG_NAME
+    has_copy = bundle_path.is_file()
+    if offline:
+        if not has_copy:
+            error(
+                "Exercises from the mirror are not available offline. "
+                "Run the command once while connected so that they are cached."
+            )
+        return bundle_path
+
+    headers = {}
+    if has_copy and etag_path.is_file():
+        headers["If-None-Match"] = etag_path.read_text().strip()
+
+    try:
+        with requests.get(
+            url.rstrip("/") + MIRROR_BUNDLE_ROUTE,
+            headers=headers,
+            timeout=MIRROR_REQUEST_TIMEOUT,
+            stream=True,
+        ) as response:
+            if response.status_code == 304:
+                return bundle_path
+            response.raise_for_status()
+
+            os.makedirs(destination_dir, exist_ok=True)
+            partial_path = bundle_path.with_name(bundle_path.name + ".partial")
+            with open(partial_path, "wb") as file:
+                for chunk in response.iter_content(MIRROR_CHUNK_SIZE):
+                    file.write(chunk)
+            os.replace(partial_path, bundle_path)
+            etag_path.write_text(response.headers.get("ETag", ""))
+            return bundle_path
+    except requests.RequestException as e:
+        logger.warning("Unable to reach the exercises mirror at %s: %s", url, e)
+        if not has_copy:
+            error(f"Unable to reach the exercises mirror at {url}")
+        warn("Unable to reach the exercises mirror, using the exercises fetched last")
+        return bundle_path
@@ -0,0 +1,144 @@
+import json
+import logging
+import os
+import subprocess
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List
+
+from app.configs.gitmastery_config import GitMasteryConfig
+from app.utils.click import is_offline
+from app.utils.command import get_gitmastery_command
+
+logger = logging.getLogger(__name__)
+
+# Kept outside of the progress repository so that it is never committed
+PROGRESS_OUTBOX_NAME = "progress-outbox.jsonl"
+PROGRESS_FLUSH_LOCK_NAME = "progress-flush.lock"
+# A flush that has held the lock for this long is assumed to have crashed
+PROGRESS_FLUSH_LOCK_TIMEOUT = 10 * 60
+
+
+def _outbox_path(config: GitMasteryConfig) -> Path:
+    return config.metadata_dir / PROGRESS_OUTBOX_NAME
+
+
+def _flushing_path(config: GitMasteryConfig) -> Path:
+    return config.metadata_dir / f"{PROGRESS_OUTBOX_NAME}.flushing"
+
+
+def _taken_paths(config: GitMasteryConfig) -> List[Path]:
+    return sorted(config.metadata_dir.glob(f"{PROGRESS_OUTBOX_NAME}.taken-*"))
+
+
+def add_to_outbox(config: GitMasteryConfig, entry: Dict[str, Any]) -> None:
+    outbox_path = _outbox_path(config)
+    while True:
+        with open(outbox_path, "a") as file:
+            file.write(json.dumps(entry) + "\n")
+            file.flush()
+            written = os.fstat(file.fileno())
+        # A flush that took the outbox while this was being written may have read it
+        # too early, so the entry is queued again. Entries only mark that there is
+        # progress to push, so the occasional duplicate is harmless
+        try:
+            current = os.stat(outbox_path)
+        except FileNotFoundError:
+            continue
+        if (current.st_dev, current.st_ino) == (written.st_dev, written.st_ino):
+            return
+
+
+def has_pending_progress(config: GitMasteryConfig) -> bool:
+    return (
+        _outbox_path(config).is_file()
+        or _flushing_path(config).is_file()
+        or len(_taken_paths(config)) > 0
+    )
+
+
+def take_outbox(config: GitMasteryConfig) -> List[Dict[str, Any]]:
+    """Moves every pending entry into the batch being flushed and returns the batch.
+
+    Entries added while the batch is flushed go to a fresh outbox, and the batch is
+    only discarded through complete_outbox once the push succeeds.
+    """
+    outbox_path = _outbox_path(config)
+    flushing_path = _flushing_path(config)
+    # The outbox is renamed before it is read, as the rename is atomic and every entry
+    # appended after it goes to a fresh outbox instead of being deleted with this one
+    try:
+        os.replace(
+            outbox_path,
+            outbox_path.with_name(f"{PROGRESS_OUTBOX_NAME}.taken-{uuid.uuid4().hex}"),
+        )
+    except FileNotFoundError:
+        pass
+    except PermissionError:
+        # Windows cannot rename a file another command is appending to, so the outbox
+        # is left for the next round
+        pass
+
+    # Outboxes left behind by a flush that stopped after renaming them are kept too
+    for taken_path in _taken_paths(config):
+        with open(taken_path, "r") as taken, open(flushing_path, "a") as flushing:
+            flushing.write(taken.read())
+        taken_path.unlink()
+
+    if not flushing_path.is_file():
+        return []
+
+    entries = []
+    with open(flushing_path, "r") as file:
+        for line in file:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
+
+
+def complete_outbox(config: GitMasteryConfig) -> None:
+    _flushing_path(config).unlink(missing_ok=True)
+
+
+def acquire_flush_lock(config: GitMasteryConfig) -> bool:
+    lock_path = config.metadata_dir / PROGRESS_FLUSH_LOCK_NAME
+    try:
+        if time.time() - lock_path.stat().st_mtime > PROGRESS_FLUSH_LOCK_TIMEOUT:
+            lock_path.unlink(missing_ok=True)
+    except FileNotFoundError:
+        pass
+
+    try:
+        fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w") as file:
+        file.write(str(os.getpid()))
+    return True
+
+
+def release_flush_lock(config: GitMasteryConfig) -> None:
+    (config.metadata_dir / PROGRESS_FLUSH_LOCK_NAME).unlink(missing_ok=True)
+
+
+def flush_in_background(config: GitMasteryConfig) -> None:
+    """Starts pushing pending progress in a detached process."""
+    # Offline progress stays queued until a command is run while connected
+    if is_offline() or (config.metadata_dir / PROGRESS_FLUSH_LOCK_NAME).is_file():
+        return
+
+    try:
+        subprocess.Popen(
+            get_gitmastery_command() + ["progress", "flush", "--quiet"],
+            cwd=config.path,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as e:
+        # The pending progress is pushed the next time a command runs instead
+        logger.warning("Unable to start the progress flush: %s", e)
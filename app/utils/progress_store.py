@@ -0,0 +1,182 @@
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List
+
+PROGRESS_FILE_NAME = "progress.json"
+PROGRESS_MANIFEST_NAME = "manifest.json"
+PROGRESS_EXERCISES_FOLDER_NAME = "exercises"
+SHARDED_LAYOUT_VERSION = 1
+
+ProgressEntry = Dict[str, Any]
+
+
+class ProgressStore(ABC):
+    """Reads and writes the progress entries kept in a progress folder.
+
+    Entries are stored either in a single progress.json (the default), or sharded
+    into one append-only JSONL file per exercise alongside a manifest.
+    """
+
+    def __init__(self, progress_dir: Path) -> None:
+        self.progress_dir = progress_dir
+
+    @abstractmethod
+    def exists(self) -> bool:
+        pass
+
+    @abstractmethod
+    def read_all(self) -> List[ProgressEntry]:
+        pass
+
+    def read_exercise(self, exercise_name: str) -> List[ProgressEntry]:
+        return [
+            entry
+            for entry in self.read_all()
+            if entry["exercise_name"] == exercise_name
+        ]
+
+    @abstractmethod
+    def append(self, entry: ProgressEntry) -> None:
+        pass
+
+    @abstractmethod
+    def remove_exercise(self, exercise_name: str) -> None:
+        pass
+
+    @abstractmethod
+    def write_all(self, entries: List[ProgressEntry]) -> None:
+        pass
+
+
+class JsonProgressStore(ProgressStore):
+    @property
+    def progress_file(self) -> Path:
+        return self.progress_dir / PROGRESS_FILE_NAME
+
+    def exists(self) -> bool:
+        return self.progress_file.is_file()
+
+    def read_all(self) -> List[ProgressEntry]:
+        if not self.exists():
+            return []
+        with open(self.progress_file, "r") as file:
+            return json.load(file)
+
+    def append(self, entry: ProgressEntry) -> None:
+        self.write_all(self.read_all() + [entry])
+
+    def remove_exercise(self, exercise_name: str) -> None:
+        self.write_all(
+            [
+                entry
+                for entry in self.read_all()
+                if entry["exercise_name"] != exercise_name
+            ]
+        )
+
+    def write_all(self, entries: List[ProgressEntry]) -> None:
+        os.makedirs(self.progress_dir, exist_ok=True)
+        with open(self.progress_file, "w") as file:
+            file.write(json.dumps(entries, indent=2))
+
+
+class ShardedProgressStore(ProgressStore):
+    @property
+    def manifest_file(self) -> Path:
+        return self.progress_dir / PROGRESS_MANIFEST_NAME
+
+    def _shard_file(self, exercise_name: str) -> Path:
+        return (
+            self.progress_dir
+            / PROGRESS_EXERCISES_FOLDER_NAME
+            / f"{exercise_name}.jsonl"
+        )
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        if not self.manifest_file.is_file():
+            return {"version": SHARDED_LAYOUT_VERSION, "exercises": {}}
+        with open(self.manifest_file, "r") as file:
+            return json.load(file)
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        with open(self.manifest_file, "w") as file:
+            file.write(json.dumps(manifest, indent=2, sort_keys=True))
+
+    def _update_manifest(self, exercise_name: str, entries: int) -> None:
+        manifest = self._read_manifest()
+        if entries == 0:
+            manifest["exercises"].pop(exercise_name, None)
+        else:
+            manifest["exercises"][exercise_name] = {
+                "entries": entries,
+                "updated_at": time.time(),
+            }
+        self._write_manifest(manifest)
+
+    def exists(self) -> bool:
+        return self.manifest_file.is_file()
+
+    def read_all(self) -> List[ProgressEntry]:
+        entries = []
+        for exercise_name in sorted(self._read_manifest()["exercises"]):
+            entries.extend(self.read_exercise(exercise_name))
+        return entries
+
+    def read_exercise(self, exercise_name: str) -> List[ProgressEntry]:
+        shard_file = self._shard_file(exercise_name)
+        if not shard_file.is_file():
+            return []
+        with open(shard_file, "r") as file:
+            return [json.loads(line) for line in file if line.strip()]
+
+    def append(self, entry: ProgressEntry) -> None:
+        exercise_name = entry["exercise_name"]
+        shard_file = self._shard_file(exercise_name)
+        os.makedirs(shard_file.parent, exist_ok=True)
+        with open(shard_file, "a") as file:
+            file.write(json.dumps(entry) + "\n")
+        manifest = self._read_manifest()
+        entries = manifest["exercises"].get(exercise_name, {}).get("entries", 0)
+        self._update_manifest(exercise_name, entries + 1)
+
+    def remove_exercise(self, exercise_name: str) -> None:
+        self._shard_file(exercise_name).unlink(missing_ok=True)
+        self._update_manifest(exercise_name, 0)
+
+    def write_all(self, entries: List[ProgressEntry]) -> None:
+        grouped: Dict[str, List[ProgressEntry]] = {}
+        for entry in entries:
+            grouped.setdefault(entry["exercise_name"], []).append(entry)
+
+        os.makedirs(self.progress_dir / PROGRESS_EXERCISES_FOLDER_NAME, exist_ok=True)
+        manifest = self._read_manifest()
+        for exercise_name in set(manifest["exercises"]) - set(grouped):
+            self._shard_file(exercise_name).unlink(missing_ok=True)
+            del manifest["exercises"][exercise_name]
+
+        for exercise_name, exercise_entries in grouped.items():
+            contents = "".join(json.dumps(entry) + "\n" for entry in exercise_entries)
+            shard_file = self._shard_file(exercise_name)
+            # Untouched exercises are left alone so that they do not show up in diffs
+            if shard_file.is_file() and shard_file.read_text() == contents:
+                continue
+            with open(shard_file, "w") as file:
+                file.write(contents)
+            manifest["exercises"][exercise_name] = {
+                "entries": len(exercise_entries),
+                "updated_at": time.time(),
+            }
+        self._write_manifest(manifest)
+
+
+def is_sharded(progress_dir: Path) -> bool:
+    return (progress_dir / PROGRESS_MANIFEST_NAME).is_file()
+
+
+def open_progress_store(progress_dir: Path) -> ProgressStore:
+    if is_sharded(progress_dir):
+        return ShardedProgressStore(progress_dir)
+    return JsonProgressStore(progress_dir)
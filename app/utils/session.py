@@ -0,0 +1,152 @@
+import copy
+import hashlib
+import tempfile
+import threading
+import time
+from dataclasses import astuple
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from app.configs.exercise_config import GITMASTERY_EXERCISE_CONFIG_NAME, ExerciseConfig
+from app.configs.gitmastery_config import (
+    GITMASTERY_CONFIG_NAME,
+    METADATA_FOLDER_NAME,
+    GitMasteryConfig,
+)
+from app.utils.exercises_cache import ExercisesCache
+from app.utils.gitmastery import ExercisesRepo, write_exercise_utils
+
+# Shared exercises repositories are re-created after this many seconds so that
+# long-lived processes eventually pick up changes to the exercises
+EXERCISES_REPO_TTL = 5 * 60
+# The Github username is looked up again after this many seconds in case the user
+# logged in to another account
+GITHUB_USERNAME_TTL = 5 * 60
+
+ConfigType = TypeVar("ConfigType")
+
+ExercisesSourceKey = Tuple[Tuple[Any, ...], Optional[str], bool]
+
+
+def _source_key(
+    exercises_source: GitMasteryConfig.ExercisesSource,
+    cache: Optional[ExercisesCache],
+    offline: bool,
+) -> ExercisesSourceKey:
+    return (
+        astuple(exercises_source),
+        # Each Git-Mastery root folder keeps its own cache
+        str(cache.root) if cache is not None else None,
+        offline,
+    )
+
+
+class GitMasterySession:
+    """State shared by every command run within a long-lived process.
+
+    Stored in the click context under CliContextKey.SESSION by the worker and the REPL
+    so that commands re-use expensive resources instead of setting them up per
+    invocation.
+    """
+
+    def __init__(self) -> None:
+        # Held while opening repositories, which a background warmup may also do
+        self.__lock = threading.Lock()
+        self.__exercises_repos: Dict[
+            ExercisesSourceKey, Tuple[ExercisesRepo, float]
+        ] = {}
+        self.__configs: Dict[Tuple[Path, int], Tuple[Tuple[int, int], Any]] = {}
+        self.__github_username: Optional[Tuple[str, float]] = None
+        self.__temp_dir: Optional[tempfile.TemporaryDirectory] = None
+        self.__exercise_utils_dirs: Dict[str, Path] = {}
+
+    def get_exercises_repo(
+        self,
+        exercises_source: GitMasteryConfig.ExercisesSource,
+        cache: Optional[ExercisesCache] = None,
+        offline: bool = False,
+    ) -> ExercisesRepo:
+        key = _source_key(exercises_source, cache, offline)
+        with self.__lock:
+            if key in self.__exercises_repos:
+                repo, opened_at = self.__exercises_repos[key]
+                if time.monotonic() - opened_at < EXERCISES_REPO_TTL:
+                    return repo
+                repo.close()
+                del self.__exercises_repos[key]
+
+            repo = ExercisesRepo()
+            repo.open(exercises_source, cache, offline)
+            self.__exercises_repos[key] = (repo, time.monotonic())
+            return repo
+
+    def __read_config(
+        self,
+        config_path: Path,
+        cds: int,
+        read: Callable[[], ConfigType],
+    ) -> ConfigType:
+        stat = config_path.stat()
+        # The size is checked too as some filesystems only keep mtimes to the second
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        key = (config_path, cds)
+        if key not in self.__configs or self.__configs[key][0] != stamp:
+            self.__configs[key] = (stamp, read())
+        # Commands are free to change the config they are given
+        return copy.deepcopy(self.__configs[key][1])
+
+    def read_gitmastery_config(self, path: Path, cds: int) -> GitMasteryConfig:
+        return self.__read_config(
+            path / METADATA_FOLDER_NAME / GITMASTERY_CONFIG_NAME,
+            cds,
+            lambda: GitMasteryConfig.read(path, cds),
+        )
+
+    def read_exercise_config(self, path: Path, cds: int) -> ExerciseConfig:
+        return self.__read_config(
+            path / GITMASTERY_EXERCISE_CONFIG_NAME,
+            cds,
+            lambda: ExerciseConfig.read(path, cds),
+        )
+
+    def get_github_username(self) -> Optional[str]:
+        if self.__github_username is None:
+            return None
+        username, checked_at = self.__github_username
+        if time.monotonic() - checked_at >= GITHUB_USERNAME_TTL:
+            return None
+        return username
+
+    def set_github_username(self, username: str) -> None:
+        self.__github_username = (username, time.monotonic())
+
+    def get_exercise_utils_dir(self, exercise_utils: Dict[str, str]) -> Path:
+        """Returns a folder holding the exercise_utils package for the given sources.
+
+        The folder is kept for the whole session, so the bytecode Python writes when
+        importing the package is re-used by every later command.
+        """
+        digest = hashlib.sha256()
+        for filename, source in sorted(exercise_utils.items()):
+            digest.update(filename.encode("utf-8") + b"\0")
+            digest.update(source.encode("utf-8") + b"\0")
+        key = digest.hexdigest()
+        if key not in self.__exercise_utils_dirs:
+            if self.__temp_dir is None:
+                self.__temp_dir = tempfile.TemporaryDirectory()
+            root = Path(self.__temp_dir.name) / key
+            write_exercise_utils(root, exercise_utils)
+            self.__exercise_utils_dirs[key] = root
+        return self.__exercise_utils_dirs[key]
+
+    def close(self) -> None:
+        with self.__lock:
+            for repo, _ in self.__exercises_repos.values():
+                repo.close()
+            self.__exercises_repos.clear()
+        self.__configs.clear()
+        self.__github_username = None
+        self.__exercise_utils_dirs.clear()
+        if self.__temp_dir is not None:
+            self.__temp_dir.cleanup()
+            self.__temp_dir = None
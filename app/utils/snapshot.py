@@ -0,0 +1,93 @@
+import json
+import logging
+import os
+import tarfile
+import time
+from pathlib import Path
+
+from app.configs.exercise_config import ExerciseConfig
+from app.version import __version__
+
+logger = logging.getLogger(__name__)
+
+# Remote exercises depend on forks and clones on Github, so only exercises that are
+# set up entirely on the student's machine can be restored from a snapshot
+SNAPSHOT_REPO_TYPES = ("local", "local-ignore")
+
+
+def is_snapshottable(config: ExerciseConfig) -> bool:
+    # The commit the exercise was set up from identifies its snapshot, so exercises
+    # from sources without one are always set up again
+    return (
+        config.exercise_repo.repo_type in SNAPSHOT_REPO_TYPES
+        and config.source_commit is not None
+    )
+
+
+def _archive_path(snapshots_dir: Path, exercise_name: str) -> Path:
+    return snapshots_dir / f"{exercise_name}.tar.gz"
+
+
+def _manifest_path(snapshots_dir: Path, exercise_name: str) -> Path:
+    return snapshots_dir / f"{exercise_name}.json"
+
+
+def save_snapshot(
+    snapshots_dir: Path, exercise_path: Path, config: ExerciseConfig
+) -> None:
+    """Stores the freshly set up exercise repository and base files."""
+    os.makedirs(snapshots_dir, exist_ok=True)
+    archive_path = _archive_path(snapshots_dir, config.exercise_name)
+    partial_path = archive_path.with_name(archive_path.name + ".partial")
+
+    paths = [config.exercise_repo.repo_name, *config.base_files.values()]
+    # The whole repository is archived rather than bundled to keep the reflog, index
+    # and config that exercises may be set up with
+    with tarfile.open(partial_path, "w:gz", compresslevel=1) as archive:
+        for path in paths:
+            if (exercise_path / path).exists():
+                archive.add(exercise_path / path, arcname=Path(path).as_posix())
+    os.replace(partial_path, archive_path)
+
+    with open(_manifest_path(snapshots_dir, config.exercise_name), "w") as file:
+        file.write(
+            json.dumps(
+                {
+                    "source_commit": config.source_commit,
+                    # The setup also depends on the bundled repo-smith
+                    "version": __version__,
+                    "created_at": time.time(),
+                },
+                indent=2,
+            )
+        )
+
+
+def restore_snapshot(
+    snapshots_dir: Path, exercise_path: Path, config: ExerciseConfig
+) -> bool:
+    """Restores the exercise from its snapshot, returning False if none is usable.
+
+    Only the snapshot itself is read, so no network access is needed.
+    """
+    archive_path = _archive_path(snapshots_dir, config.exercise_name)
+    manifest_path = _manifest_path(snapshots_dir, config.exercise_name)
+    if not archive_path.is_file() or not manifest_path.is_file():
+        return False
+
+    try:
+        with open(manifest_path, "r") as file:
+            manifest = json.load(file)
+        if (
+            manifest["source_commit"] != config.source_commit
+            or manifest["version"] != __version__
+        ):
+            logger.info("Snapshot of %s is outdated", config.exercise_name)
+            return False
+
+        with tarfile.open(archive_path, "r:gz") as archive:
+            archive.extractall(exercise_path, filter="data")
+    except (json.JSONDecodeError, KeyError, OSError, tarfile.TarError) as e:
+        logger.warning("Unable to restore snapshot of %s: %s", config.exercise_name, e)
+        return False
+    return True
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from git import Repo
+from git_autograder.output import GitAutograderOutput
+
+from app.configs.exercise_config import ExerciseConfig
+from app.utils.autograder import output_from_dict, output_to_dict
+from app.utils.gitmastery import ScriptSources
+
+VERIFY_CACHE_FOLDER_NAME = "verify"
+
+# Files under the Git directory that capture state not visible through refs and the
+# index, such as reflogs used by exercises on resetting, or in-progress merges
+GIT_STATE_FILES = [
+    "HEAD",
+    "ORIG_HEAD",
+    "MERGE_HEAD",
+    "CHERRY_PICK_HEAD",
+    "REVERT_HEAD",
+    "config",
+    "logs/HEAD",
+    "rebase-merge/head-name",
+    "rebase-apply/head-name",
+]
+
+
+def is_cacheable(config: ExerciseConfig) -> bool:
+    # Exercises that involve Github can depend on remote state (e.g. pull requests)
+    # that is not captured by the local fingerprint
+    return not config.requires_github and config.exercise_repo.repo_type != "remote"
+
+
+def _update_with_worktree(digest: "hashlib._Hash", exercise_path: Path) -> None:
+    # Size and modification time are enough to detect edits without reading
+    # potentially large student files on every verification
+    for root, dirs, files in os.walk(exercise_path):
+        dirs[:] = sorted(d for d in dirs if d != ".git")
+        for filename in sorted(files):
+            file_path = Path(root) / filename
+            try:
+                stat = file_path.lstat()
+            except FileNotFoundError:
+                continue
+            relative_path = file_path.relative_to(exercise_path).as_posix()
+            digest.update(
+                f"{relative_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8")
+            )
+
+
+def _update_with_git_state(digest: "hashlib._Hash", repo_path: Path) -> None:
+    if not (repo_path / ".git").exists():
+        return
+
+    repo = Repo(repo_path)
+    try:
+        git_dir = Path(repo.git_dir)
+        for state_file in GIT_STATE_FILES:
+            state_path = git_dir / state_file
+            if state_path.is_file():
+                digest.update(state_file.encode("utf-8") + b"\0")
+                digest.update(state_path.read_bytes())
+
+        # Refs and staged blobs are compared by content rather than through the index
+        # file, which Git rewrites with fresh stat information whenever it is read
+        digest.update(
+            repo.git.for_each_ref("--format=%(refname) %(objectname)").encode("utf-8")
+        )
+        digest.update(repo.git.ls_files("--stage").encode("utf-8"))
+    finally:
+        repo.close()
+
+
+def compute_cache_key(config: ExerciseConfig, sources: ScriptSources) -> str:
+    digest = hashlib.sha256()
+    digest.update(config.exercise_name.encode("utf-8") + b"\0")
+    digest.update(sources.digest.encode("utf-8") + b"\0")
+    _update_with_worktree(digest, config.path)
+    _update_with_git_state(digest, config.path / config.exercise_repo.repo_name)
+    return digest.hexdigest()
+
+
+def _cache_file(cache_dir: Path, exercise_name: str) -> Path:
+    return cache_dir / VERIFY_CACHE_FOLDER_NAME / f"{exercise_name}.json"
+
+
+def read_cached_output(
+    cache_dir: Path, exercise_name: str, key: str
+) -> Optional[GitAutograderOutput]:
+    cache_file = _cache_file(cache_dir, exercise_name)
+    if not cache_file.is_file():
+        return None
+
+    try:
+        with open(cache_file, "r") as file:
+            cached = json.load(file)
+        if cached["key"] != key:
+            return None
+        return output_from_dict(cached["output"])
+    except (json.JSONDecodeError, KeyError, ValueError):
+        return None
+
+
+def write_cached_output(
+    cache_dir: Path, exercise_name: str, key: str, output: GitAutograderOutput
+) -> None:
+    cache_file = _cache_file(cache_dir, exercise_name)
+    os.makedirs(cache_file.parent, exist_ok=True)
+    with open(cache_file, "w") as file:
+        file.write(json.dumps({"key": key, "output": output_to_dict(output)}, indent=2))
@@ -0,0 +1,260 @@
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytz
+from git_autograder import (
+    GitAutograderExercise,
+    GitAutograderInvalidStateException,
+    GitAutograderStatus,
+    GitAutograderWrongAnswerException,
+)
+from git_autograder.output import GitAutograderOutput
+
+from app.configs.gitmastery_config import GitMasteryConfig
+from app.utils.autograder import output_from_dict, output_to_dict
+from app.utils.gitmastery import Namespace, ScriptSources
+
+if sys.platform != "win32":
+    import resource
+
+
+def error_output(
+    exercise_name: str, started_at: datetime, comments: List[str]
+) -> GitAutograderOutput:
+    return GitAutograderOutput(
+        exercise_name=exercise_name,
+        started_at=started_at,
+        completed_at=datetime.now(tz=pytz.UTC),
+        comments=comments,
+        status=GitAutograderStatus.ERROR,
+    )
+
+
+def execute_verify(
+    exercise_path: Path,
+    exercise_name: str,
+    sources: ScriptSources,
+    started_at: datetime,
+    namespace: Optional[Namespace] = None,
+) -> GitAutograderOutput:
+    """Grades the exercise at exercise_path, converting any failure into an output.
+
+    Does not depend on the click context so that it can run in worker processes.
+    """
+    try:
+        os.chdir(exercise_path)
+        exercise = GitAutograderExercise(exercise_path)
+        if namespace is None:
+            namespace = Namespace.load_sources_as_namespace(sources)
+        output = namespace.execute_function(
+            "verify",
+            {"exercise": exercise},
+        )
+        if output is None:
+            return error_output(
+                exercise_name, started_at, ["Exercise has no verify function"]
+            )
+        return output
+    except (
+        GitAutograderInvalidStateException,
+        GitAutograderWrongAnswerException,
+    ) as e:
+        return GitAutograderOutput(
+            exercise_name=exercise_name,
+            started_at=started_at,
+            completed_at=datetime.now(tz=pytz.UTC),
+            comments=[e.message] if isinstance(e.message, str) else e.message,
+            status=(
+                GitAutograderStatus.ERROR
+                if isinstance(e, GitAutograderInvalidStateException)
+                else GitAutograderStatus.UNSUCCESSFUL
+            ),
+        )
+    except MemoryError:
+        return error_output(
+            exercise_name, started_at, ["Verification ran out of memory"]
+        )
+    except Exception as e:
+        # Unexpected exception
+        return error_output(exercise_name, started_at, [str(e)])
+
+
+def _run_sandboxed(
+    connection: Any,
+    exercise_path: Path,
+    exercise_name: str,
+    sources: ScriptSources,
+    started_at: datetime,
+    limits: GitMasteryConfig.VerifyLimits,
+) -> None:
+    if sys.platform != "win32":
+        # Git processes spawned by the exercise inherit the limits and join the
+        # process group, so they are stopped together with the verification
+        os.setpgid(0, 0)
+        if limits.cpu_time is not None:
+            resource.setrlimit(
+                resource.RLIMIT_CPU, (limits.cpu_time, limits.cpu_time + 1)
+            )
+        if limits.memory is not None:
+            memory = limits.memory * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+
+    output = execute_verify(exercise_path, exercise_name, sources, started_at)
+    connection.send(output_to_dict(output))
+    connection.close()
+
+
+def _stop_sandbox(process: multiprocessing.Process) -> None:
+    if process.is_alive() and process.pid is not None:
+        try:
+            if sys.platform != "win32":
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except OSError:
+            # The process group may not have been created yet
+            process.kill()
+    process.join()
+
+
+def execute_verify_sandboxed(
+    exercise_path: Path,
+    exercise_name: str,
+    sources: ScriptSources,
+    started_at: datetime,
+    limits: GitMasteryConfig.VerifyLimits,
+) -> GitAutograderOutput:
+    """Grades the exercise in a child process bounded by the given limits.
+
+    CPU time and memory limits are only enforced on platforms with setrlimit.
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=_run_sandboxed,
+        args=(sender, exercise_path, exercise_name, sources, started_at, limits),
+    )
+    start = time.perf_counter()
+    process.start()
+    sender.close()
+    try:
+        if not receiver.poll(limits.wall_time):
+            return error_output(
+                exercise_name,
+                started_at,
+                [
+                    f"Verification was stopped after {time.perf_counter() - start:.1f}s as it exceeded the time limit of {limits.wall_time}s"
+                ],
+            )
+
+        try:
+            return output_from_dict(receiver.recv())
+        except EOFError:
+            # The child exited without reporting a result
+            pass
+
+        process.join()
+        elapsed = time.perf_counter() - start
+        if sys.platform != "win32" and process.exitcode in (
+            -signal.SIGXCPU,
+            -signal.SIGKILL,
+        ):
+            if limits.cpu_time is not None:
+                return error_output(
+                    exercise_name,
+                    started_at,
+                    [
+                        f"Verification was stopped after {elapsed:.1f}s as it exceeded the CPU time limit of {limits.cpu_time}s"
+                    ],
+                )
+        return error_output(
+            exercise_name,
+            started_at,
+            [
+                f"Verification exited unexpectedly after {elapsed:.1f}s with exit code {process.exitcode}"
+            ],
+        )
+    finally:
+        _stop_sandbox(process)
+        receiver.close()
+
+
+def run_verify(
+    exercise_path: Path,
+    exercise_name: str,
+    sources: ScriptSources,
+    started_at: datetime,
+    limits: GitMasteryConfig.VerifyLimits,
+    namespace: Optional[Namespace] = None,
+) -> GitAutograderOutput:
+    if limits.enabled:
+        return execute_verify_sandboxed(
+            exercise_path, exercise_name, sources, started_at, limits
+        )
+    return execute_verify(exercise_path, exercise_name, sources, started_at, namespace)
+
+
+# The formatted exercise name and the exercises commit the script was read from
+ScriptKey = Tuple[str, Optional[str]]
+
+
+@dataclass
+class BatchVerifyTask:
+    exercise_path: Path
+    exercise_name: str
+    # Key into the verification scripts shared with every worker
+    script: ScriptKey
+
+
+@dataclass
+class BatchVerifyResult:
+    exercise_path: Path
+    exercise_name: str
+    output: Dict[str, Any]
+    duration: float
+
+
+_worker_scripts: Dict[ScriptKey, ScriptSources] = {}
+_worker_limits = GitMasteryConfig.VerifyLimits()
+
+
+def init_batch_worker(
+    scripts: Dict[ScriptKey, ScriptSources], limits: GitMasteryConfig.VerifyLimits
+) -> None:
+    global _worker_limits
+    # Scripts are handed to each worker once instead of being pickled per task
+    _worker_scripts.update(scripts)
+    _worker_limits = limits
+
+
+def run_batch_task(task: BatchVerifyTask) -> BatchVerifyResult:
+    # Every task runs the script in a fresh namespace with freshly imported
+    # exercise_utils, and the worker process keeps any leftover module state away
+    # from the parent
+    started_at = datetime.now(tz=pytz.UTC)
+    start = time.perf_counter()
+    sources = _worker_scripts.get(task.script)
+    if sources is None:
+        output = error_output(
+            task.exercise_name, started_at, ["Missing verification script"]
+        )
+    else:
+        output = run_verify(
+            task.exercise_path,
+            task.exercise_name,
+            sources,
+            started_at,
+            _worker_limits,
+        )
+    return BatchVerifyResult(
+        exercise_path=task.exercise_path,
+        exercise_name=task.exercise_name,
+        output=output_to_dict(output),
+        duration=time.perf_counter() - start,
+    )
@@ -0,0 +1,86 @@
+import importlib
+import logging
+import pkgutil
+import threading
+from typing import Any, Callable, Dict
+
+import click
+
+from app.configs.gitmastery_config import GITMASTERY_CONFIG_NAME, METADATA_FOLDER_NAME
+from app.configs.utils import find_root
+from app.utils.click import CliContextKey, is_offline
+from app.utils.github_cli import get_username
+from app.utils.gitmastery import ExercisesRepo
+from app.utils.session import GitMasterySession
+
+logger = logging.getLogger(__name__)
+
+# Packages whose submodules exercise scripts import when they are run
+WARMUP_PACKAGES = ["git_autograder", "repo_smith"]
+
+
+class SessionWarmup(threading.Thread):
+    """Fills a session in the background so the first command does not start cold.
+
+    Every step is skipped once the warmup is cancelled, and nothing is printed so the
+    prompt is left untouched.
+    """
+
+    def __init__(self, session: GitMasterySession, obj: Dict[str, Any]) -> None:
+        super().__init__(name="gitmastery-warmup", daemon=True)
+        self.session = session
+        self.obj = obj
+        self.__cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self.__cancelled.set()
+
+    def run(self) -> None:
+        obj = {
+            **self.obj,
+            CliContextKey.SESSION: self.session,
+            CliContextKey.QUIET: True,
+        }
+        root = find_root(GITMASTERY_CONFIG_NAME, folder=METADATA_FOLDER_NAME)
+        if root is not None:
+            obj[CliContextKey.GITMASTERY_ROOT_CONFIG] = (
+                self.session.read_gitmastery_config(*root)
+            )
+
+        # Click keeps a context per thread, so commands are unaffected by this one
+        with click.Context(click.Command("warmup"), obj=obj):
+            self.__step("importing exercise dependencies", self.__import_packages)
+            if root is None:
+                return
+            self.__step("opening the exercises repository", self.__open_repo)
+            if not is_offline():
+                self.__step("looking up the Github username", get_username)
+
+    def __step(self, description: str, step: Callable[[], Any]) -> None:
+        if self.__cancelled.is_set():
+            return
+        try:
+            step()
+        except (Exception, SystemExit) as e:
+            # Whatever failed here is retried by the command that needs it
+            logger.info("Warmup failed while %s: %s", description, e)
+
+    def __import_packages(self) -> None:
+        for package_name in WARMUP_PACKAGES:
+            try:
+                package = importlib.import_module(package_name)
+            except ImportError:
+                continue
+            for module in pkgutil.walk_packages(
+                package.__path__, prefix=f"{package_name}."
+            ):
+                if self.__cancelled.is_set():
+                    return
+                try:
+                    importlib.import_module(module.name)
+                except Exception:
+                    continue
+
+    def __open_repo(self) -> None:
+        with ExercisesRepo():
+            pass
@@ -0,0 +1,187 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from types import TracebackType
+from typing import Dict, Optional, Self, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEBOUNCE_INTERVAL = 0.3
+POLL_INTERVAL = 1.0
+
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_ISDIR = 0x40000000
+IN_WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+INOTIFY_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _is_ignored(directory: Path) -> bool:
+    # Git object files are always accompanied by ref or index updates, so watching
+    # the (potentially large) object store only adds noise
+    return directory.name == "objects" and directory.parent.name == ".git"
+
+
+def _is_ignored_file(directory: Path, name: str) -> bool:
+    # Git writes through lock files that are renamed over the real file once complete,
+    # so only the rename is a change
+    return name.endswith(".lock") and ".git" in directory.parts
+
+
+class Watcher(ABC):
+    """Blocks until files under a folder change, coalescing bursts of changes.
+
+    Uses inotify on Linux and falls back to polling file metadata elsewhere.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    @abstractmethod
+    def _wait_for_event(self, timeout: Optional[float]) -> bool:
+        """Waits for a change for up to timeout seconds, returning if there was one."""
+
+    def wait_for_change(self) -> None:
+        while not self._wait_for_event(None):
+            pass
+        # Git operations touch many files in quick succession, so wait for them to
+        # settle before reporting a single change
+        while self._wait_for_event(DEBOUNCE_INTERVAL):
+            pass
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+class PollingWatcher(Watcher):
+    def __init__(self, root: Path) -> None:
+        super().__init__(root)
+        self.__snapshot = self.__take_snapshot()
+
+    def __take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for directory, dirs, files in os.walk(self.root):
+            dirs[:] = [d for d in dirs if not _is_ignored(Path(directory) / d)]
+            for filename in files:
+                if _is_ignored_file(Path(directory), filename):
+                    continue
+                file_path = os.path.join(directory, filename)
+                try:
+                    stat = os.lstat(file_path)
+                except FileNotFoundError:
+                    continue
+                snapshot[file_path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def _wait_for_event(self, timeout: Optional[float]) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(
+                POLL_INTERVAL if timeout is None else min(timeout, POLL_INTERVAL)
+            )
+            snapshot = self.__take_snapshot()
+            if snapshot != self.__snapshot:
+                self.__snapshot = snapshot
+                return True
+        return False
+
+
+class InotifyWatcher(Watcher):
+    def __init__(self, root: Path, libc: ctypes.CDLL) -> None:
+        super().__init__(root)
+        self.__libc = libc
+        self.__fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.__fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.__watches: Dict[int, Path] = {}
+        self.__add_watches(root)
+
+    def __add_watches(self, directory: Path) -> None:
+        for current, dirs, _ in os.walk(directory):
+            dirs[:] = [d for d in dirs if not _is_ignored(Path(current) / d)]
+            wd = self.__libc.inotify_add_watch(
+                self.__fd, os.fsencode(current), IN_WATCH_MASK
+            )
+            if wd >= 0:
+                self.__watches[wd] = Path(current)
+
+    def _wait_for_event(self, timeout: Optional[float]) -> bool:
+        readable, _, _ = select.select([self.__fd], [], [], timeout)
+        if not readable:
+            return False
+
+        try:
+            buffer = os.read(self.__fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+
+        changed = False
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _, name_length = INOTIFY_EVENT_HEADER.unpack_from(buffer, offset)
+            offset += INOTIFY_EVENT_HEADER.size
+            name = buffer[offset : offset + name_length].rstrip(b"\0")
+            offset += name_length
+
+            directory = self.__watches.get(wd)
+            if directory is None:
+                changed = True
+                continue
+            if not _is_ignored_file(directory, os.fsdecode(name)):
+                changed = True
+            # Directories created after the watcher started need their own watches
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                new_directory = directory / os.fsdecode(name)
+                if not _is_ignored(new_directory):
+                    self.__add_watches(new_directory)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.__fd)
+
+
+def create_watcher(root: Path) -> Watcher:
+    if sys.platform.startswith("linux"):
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is not None:
+            try:
+                return InotifyWatcher(root, ctypes.CDLL(libc_name, use_errno=True))
+            except (OSError, AttributeError) as e:
+                logger.warning("Falling back to polling for file changes: %s", e)
+    return PollingWatcher(root)
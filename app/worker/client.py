@@ -0,0 +1,111 @@
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Only lightweight modules may be imported here as the client runs before the rest of
+# the app is loaded
+from app.aliases import resolve_alias
+from app.configs.gitmastery_config import GITMASTERY_CONFIG_NAME, METADATA_FOLDER_NAME
+from app.configs.utils import find_root
+from app.version import __version__
+
+WORKER_SOCKET_NAME = "worker.sock"
+FORWARDED_COMMANDS = {"download", "verify"}
+# Options of the top-level group, which the worker applies before the command
+GROUP_OPTIONS = {"--verbose", "-v", "--offline"}
+# Separates the command output from the trailing result, which output never contains
+RESULT_SEPARATOR = b"\0"
+
+
+def get_worker_socket_path() -> Optional[Path]:
+    root = find_root(GITMASTERY_CONFIG_NAME, folder=METADATA_FOLDER_NAME)
+    if root is None:
+        return None
+    return root[0] / METADATA_FOLDER_NAME / WORKER_SOCKET_NAME
+
+
+def connect_to_worker(socket_path: Path) -> Optional[socket.socket]:
+    if not hasattr(socket, "AF_UNIX") or not socket_path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        # Stale socket left behind by a worker that did not shut down cleanly
+        sock.close()
+        return None
+    return sock
+
+
+def send_request(sock: socket.socket, request: Dict[str, Any]) -> Dict[str, Any]:
+    """Sends a request and streams the worker's output to stdout until it responds."""
+    # A worker started before an upgrade keeps running the old code, so every request
+    # says which version sent it
+    request = {**request, "version": __version__}
+    sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+
+    result = b""
+    in_result = False
+    while True:
+        chunk = sock.recv(64 * 1024)
+        if not chunk:
+            break
+        if not in_result and RESULT_SEPARATOR in chunk:
+            chunk, result = chunk.split(RESULT_SEPARATOR, 1)
+            in_result = True
+            sys.stdout.buffer.write(chunk)
+        elif in_result:
+            result += chunk
+        else:
+            sys.stdout.buffer.write(chunk)
+        sys.stdout.buffer.flush()
+
+    if not result:
+        return {"exit_code": 1}
+    return json.loads(result)
+
+
+def forward_to_worker(argv: List[str]) -> Optional[int]:
+    """Runs the command in the worker of the current Git-Mastery root, if any.
+
+    Returns the exit code of the command, or None if it has to run in-process.
+    """
+    index = 0
+    while index < len(argv) and argv[index] in GROUP_OPTIONS:
+        index += 1
+    if index >= len(argv) or resolve_alias(argv[index]) not in FORWARDED_COMMANDS:
+        return None
+    args = [resolve_alias(argv[index])] + argv[index + 1 :]
+    # Watching blocks until interrupted, which would tie up the worker
+    if "--watch" in args:
+        return None
+
+    socket_path = get_worker_socket_path()
+    if socket_path is None:
+        return None
+    sock = connect_to_worker(socket_path)
+    if sock is None:
+        return None
+
+    with sock:
+        try:
+            result = send_request(
+                sock,
+                {
+                    "options": argv[:index],
+                    "args": args,
+                    "cwd": os.getcwd(),
+                    "env": dict(os.environ),
+                    "color": sys.stdout.isatty(),
+                },
+            )
+        except (OSError, json.JSONDecodeError):
+            print("Lost connection to the Git-Mastery worker", file=sys.stderr)
+            return 1
+    if result.get("rejected"):
+        # The worker is from another version and has stopped without running anything
+        return None
+    return result.get("exit_code", 1)
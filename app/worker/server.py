@@ -0,0 +1,142 @@
+import contextlib
+import io
+import json
+import logging
+import os
+import socketserver
+import time
+import traceback
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, cast
+
+import click
+
+from app.cli import cli
+from app.utils.click import CliContextKey
+from app.utils.session import GitMasterySession
+from app.version import __version__
+from app.worker.client import FORWARDED_COMMANDS, RESULT_SEPARATOR, WORKER_SOCKET_NAME
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerRequestHandler(socketserver.StreamRequestHandler):
+    server: "WorkerServer"
+
+    def handle(self) -> None:
+        request = json.loads(self.rfile.readline())
+        if request.get("version") != __version__:
+            logger.info(
+                "Worker is running %s but received a request from %s, shutting down",
+                __version__,
+                request.get("version"),
+            )
+            self.server.stopping = True
+            response: Dict[str, Any] = {"exit_code": 1, "rejected": True}
+        elif request.get("shutdown"):
+            self.server.stopping = True
+            response = {"exit_code": 0}
+        elif request.get("ping"):
+            response = {
+                "exit_code": 0,
+                "pid": os.getpid(),
+                "uptime": time.monotonic() - self.server.started_at,
+                "requests": self.server.requests,
+            }
+        else:
+            self.server.requests += 1
+            response = {
+                "exit_code": self.server.run_command(
+                    request, cast(BinaryIO, self.wfile)
+                )
+            }
+        self.wfile.write(RESULT_SEPARATOR + json.dumps(response).encode("utf-8"))
+
+
+class WorkerServer(socketserver.UnixStreamServer):
+    """Runs forwarded commands one at a time in a process with everything loaded.
+
+    Commands change the working directory, environment and standard streams of the
+    process, so requests are deliberately handled sequentially.
+    """
+
+    def __init__(self, root: Path, idle_timeout: float) -> None:
+        self.root = root
+        self.timeout = idle_timeout
+        self.stopping = False
+        self.started_at = time.monotonic()
+        self.requests = 0
+        self.session = GitMasterySession()
+        socket_path = root / WORKER_SOCKET_NAME
+        super().__init__(str(socket_path), WorkerRequestHandler)
+        os.chmod(socket_path, 0o600)
+
+    def handle_timeout(self) -> None:
+        logger.info("Worker has been idle for %ss, shutting down", self.timeout)
+        self.stopping = True
+
+    def run_command(self, request: Dict[str, Any], wfile: BinaryIO) -> int:
+        args = request["args"]
+        if args[0] not in FORWARDED_COMMANDS:
+            logger.info("Worker refused to run command %s", args)
+            return 1
+
+        stream = io.TextIOWrapper(
+            wfile, encoding="utf-8", line_buffering=True, write_through=True
+        )
+        original_env = dict(os.environ)
+        os.environ.clear()
+        os.environ.update(request["env"])
+        try:
+            with (
+                contextlib.redirect_stdout(stream),
+                contextlib.redirect_stderr(stream),
+            ):
+                os.chdir(request["cwd"])
+                logger.info("Worker running command %s", args)
+                # Run through the top-level group so that offline mode, verbose output
+                # and the version check apply as they do in-process
+                ctx = cli.make_context(
+                    "gitmastery",
+                    request["options"] + args,
+                    obj={CliContextKey.SESSION: self.session},
+                    color=request["color"],
+                )
+                with ctx:
+                    cli.invoke(ctx)
+            return 0
+        except click.exceptions.Exit as e:
+            return e.exit_code
+        except click.ClickException as e:
+            e.show(file=stream)
+            return e.exit_code
+        except click.Abort:
+            stream.write("Aborted.\n")
+            return 1
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else 0 if e.code is None else 1
+        except Exception:
+            logger.exception("Worker failed to run command %s", args)
+            stream.write(traceback.format_exc())
+            return 1
+        finally:
+            os.environ.clear()
+            os.environ.update(original_env)
+            os.chdir(self.root)
+            stream.flush()
+            # The socket is owned by the request handler and must outlive the wrapper
+            stream.detach()
+
+
+def serve(metadata_dir: Path, idle_timeout: float) -> None:
+    socket_path = metadata_dir / WORKER_SOCKET_NAME
+    socket_path.unlink(missing_ok=True)
+
+    server = WorkerServer(metadata_dir, idle_timeout)
+    try:
+        while not server.stopping:
+            server.handle_request()
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+        server.session.close()
@@ -1,6 +1,24 @@
-from app.cli import start
-from app.logging.setup_logging import setup_logging
+import multiprocessing
+import sys
+
+from app.completion import COMPLETION_COMMAND, run_completion
+from app.worker.client import forward_to_worker
 
 if __name__ == "__main__":
+    # Required for worker processes spawned from the bundled binary
+    multiprocessing.freeze_support()
+
+    # Shell completion answers from the cached catalog without loading the app
+    if len(sys.argv) > 1 and sys.argv[1] == COMPLETION_COMMAND:
+        sys.exit(run_completion(sys.argv[2:]))
+
+    # Hand the command to a running worker before loading the rest of the app
+    exit_code = forward_to_worker(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from app.cli import start
+    from app.logging.setup_logging import setup_logging
+
     setup_logging()
     start()
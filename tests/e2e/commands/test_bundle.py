@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from ..constants import EXERCISE_NAME
+from ..runner import BinaryRunner
+
+
+def test_bundle_export(
+    runner: BinaryRunner, gitmastery_root: Path, tmp_path: Path
+) -> None:
+    """bundle export packs the exercise into a single file."""
+    output = tmp_path / "exercises.gmbundle"
+    res = runner.run(
+        ["bundle", "export", str(output), EXERCISE_NAME], cwd=gitmastery_root
+    )
+    res.assert_success()
+    res.assert_stdout_contains("Exported 1 exercises")
+    assert output.is_file()
+
+
+def test_bundle_import_invalid(
+    runner: BinaryRunner, gitmastery_root: Path, tmp_path: Path
+) -> None:
+    """bundle import rejects files that are not bundles."""
+    not_a_bundle = tmp_path / "exercises.gmbundle"
+    not_a_bundle.write_text("not a bundle")
+    res = runner.run(["bundle", "import", str(not_a_bundle)], cwd=gitmastery_root)
+    assert res.returncode == 1
+    res.assert_stdout_contains("is not an exercises bundle")
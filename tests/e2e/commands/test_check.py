@@ -1,3 +1,5 @@
+from pathlib import Path
+
 from ..runner import BinaryRunner
 
 
@@ -13,3 +15,12 @@ def test_check_github(runner: BinaryRunner) -> None:
     res = runner.run(["check", "github"])
     res.assert_success()
     res.assert_stdout_contains("Github CLI is installed and configured")
+
+
+def test_check_git_cached(runner: BinaryRunner, gitmastery_root: Path) -> None:
+    """check git reuses the last successful check made in the Git-Mastery root."""
+    runner.run(["check", "git"], cwd=gitmastery_root).assert_success()
+
+    res = runner.run(["check", "git", "--cached"], cwd=gitmastery_root)
+    res.assert_success()
+    res.assert_stdout_contains("was already checked")
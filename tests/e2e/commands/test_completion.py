@@ -0,0 +1,20 @@
+from pathlib import Path
+
+from ..constants import EXERCISE_NAME
+from ..runner import BinaryRunner
+
+
+def test_complete_commands(runner: BinaryRunner, gitmastery_root: Path) -> None:
+    """__complete lists the commands and aliases matching the word being typed."""
+    res = runner.run(["__complete", "d"], cwd=gitmastery_root)
+    res.assert_success()
+    res.assert_stdout_contains("download")
+
+
+def test_complete_exercises(runner: BinaryRunner, gitmastery_root: Path) -> None:
+    """__complete lists exercises from the catalog built by list."""
+    runner.run(["list"], cwd=gitmastery_root).assert_success()
+
+    res = runner.run(["__complete", "download", ""], cwd=gitmastery_root)
+    res.assert_success()
+    res.assert_stdout_contains(EXERCISE_NAME)
@@ -1,7 +1,13 @@
 import json
+import re
+import subprocess
 from pathlib import Path
+from typing import List, Optional
+
+import pytest
 
 from ..constants import EXERCISE_NAME
+from ..runner import BinaryRunner
 
 
 def test_download_exercise(downloaded_exercise_dir: Path) -> None:
@@ -15,6 +21,116 @@ def test_download_exercise(downloaded_exercise_dir: Path) -> None:
     assert (downloaded_exercise_dir / "README.md").is_file()
 
 
+def test_download_records_source_commit(downloaded_exercise_dir: Path) -> None:
+    """download records the commit of the exercises source it was downloaded from."""
+    exercise_config = downloaded_exercise_dir / ".gitmastery-exercise.json"
+    source_commit = json.loads(exercise_config.read_text())["source_commit"]
+    assert re.fullmatch(r"[0-9a-f]{40}", source_commit)
+
+
 def test_download_hands_on(downloaded_hands_on_dir: Path) -> None:
     """download creates the hands-on folder."""
     assert downloaded_hands_on_dir.is_dir()
+
+
+def _run(command: List[str], cwd: Optional[Path] = None) -> str:
+    return subprocess.run(
+        command, cwd=cwd, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def _find_forked_exercise(runner: BinaryRunner, gitmastery_root: Path) -> Optional[str]:
+    # Building the list of exercises caches the config of every exercise
+    res = runner.run(["list", "--refresh"], cwd=gitmastery_root, timeout=120)
+    res.assert_success()
+    cache_dir = gitmastery_root / ".gitmastery" / "cache" / "exercises"
+    for config_path in sorted(cache_dir.glob("*/files/*/.gitmastery-exercise.json")):
+        exercise_config = json.loads(config_path.read_text())
+        if exercise_config["exercise_repo"].get("create_fork"):
+            return exercise_config["exercise_name"]
+    return None
+
+
+def test_download_reuses_fork(runner: BinaryRunner, gitmastery_root: Path) -> None:
+    """download with reuse_forks resets the existing fork and closes its pull requests."""
+    exercise = _find_forked_exercise(runner, gitmastery_root)
+    if exercise is None:
+        pytest.skip("No exercise forks its repository")
+
+    config_path = gitmastery_root / ".gitmastery" / "config.json"
+    original_config = config_path.read_text()
+    config_path.write_text(
+        json.dumps({**json.loads(original_config), "reuse_forks": True})
+    )
+    try:
+        # The first download makes sure that the fork exists
+        runner.run(
+            ["download", exercise], cwd=gitmastery_root, timeout=300
+        ).assert_success()
+        exercise_repo = json.loads(
+            (gitmastery_root / exercise / ".gitmastery-exercise.json").read_text()
+        )["exercise_repo"]
+        repo_dir = gitmastery_root / exercise / exercise_repo["repo_name"]
+        username = _run(["gh", "api", "user", "-q", ".login"])
+        fork = f"{username}/{username}-gitmastery-{exercise_repo['repo_title']}"
+        upstream = f"git-mastery/{exercise_repo['repo_title']}"
+
+        # Leave a branch that is not in the exercise repository with a pull request
+        default_branch = _run(["git", "rev-parse", "--abbrev-ref", "HEAD"], repo_dir)
+        _run(["git", "checkout", "-b", "stale-attempt"], repo_dir)
+        _run(["git", "commit", "--allow-empty", "-m", "Stale attempt"], repo_dir)
+        _run(["git", "push", "origin", "stale-attempt"], repo_dir)
+        _run(
+            [
+                "gh",
+                "pr",
+                "create",
+                "--repo",
+                fork,
+                "--base",
+                default_branch,
+                "--head",
+                "stale-attempt",
+                "--title",
+                "Stale attempt",
+                "--body",
+                "Left open to be closed when the fork is reset",
+            ],
+            repo_dir,
+        )
+
+        res = runner.run(["download", exercise], cwd=gitmastery_root, timeout=300)
+        res.assert_success()
+        res.assert_stdout_contains("resetting it to match the exercise repository")
+
+        open_prs = _run(
+            [
+                "gh",
+                "pr",
+                "list",
+                "--repo",
+                fork,
+                "--author",
+                "@me",
+                "--state",
+                "open",
+                "--json",
+                "number",
+                "--jq",
+                ".[].number",
+            ]
+        )
+        assert open_prs == ""
+        fork_heads = _run(["git", "ls-remote", "--heads", f"https://github.com/{fork}"])
+        assert "refs/heads/stale-attempt" not in fork_heads
+        upstream_head = _run(
+            [
+                "git",
+                "ls-remote",
+                f"https://github.com/{upstream}",
+                f"refs/heads/{default_branch}",
+            ]
+        ).split()[0]
+        assert f"{upstream_head}\trefs/heads/{default_branch}" in fork_heads
+    finally:
+        config_path.write_text(original_config)
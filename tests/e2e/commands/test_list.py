@@ -0,0 +1,30 @@
+from pathlib import Path
+
+from ..constants import EXERCISE_NAME
+from ..runner import BinaryRunner
+
+
+def test_list_exercises(runner: BinaryRunner, gitmastery_root: Path) -> None:
+    """list shows the exercises and keeps a catalog of them."""
+    res = runner.run(["list"], cwd=gitmastery_root)
+    res.assert_success()
+    res.assert_stdout_contains(EXERCISE_NAME)
+
+    catalog_dir = (
+        gitmastery_root
+        / ".gitmastery"
+        / "cache"
+        / "exercises"
+        / "git-mastery-exercises-main"
+        / "catalog"
+    )
+    assert (catalog_dir / "latest").is_file()
+
+
+def test_list_exercises_unknown_tag(
+    runner: BinaryRunner, gitmastery_root: Path
+) -> None:
+    """list warns when no exercise has the tag."""
+    res = runner.run(["list", "--tag", "no-such-tag"], cwd=gitmastery_root)
+    res.assert_success()
+    res.assert_stdout_contains("No exercises match the given filters.")
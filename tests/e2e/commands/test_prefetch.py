@@ -0,0 +1,25 @@
+from pathlib import Path
+
+from ..constants import EXERCISE_NAME
+from ..runner import BinaryRunner
+
+
+def test_prefetch_exercise(runner: BinaryRunner, gitmastery_root: Path) -> None:
+    """prefetch caches the exercise so that it can be downloaded offline."""
+    res = runner.run(["prefetch", EXERCISE_NAME], cwd=gitmastery_root)
+    res.assert_success()
+    res.assert_stdout_contains("Prefetched 1 exercises")
+
+    exercises_cache = gitmastery_root / ".gitmastery" / "cache" / "exercises"
+    # Files are kept per commit, with the branch recording the commit it was last at
+    latest_commit = (
+        (exercises_cache / "git-mastery-exercises-main" / "latest").read_text().strip()
+    )
+    cached_config = (
+        exercises_cache
+        / f"git-mastery-exercises-{latest_commit}"
+        / "files"
+        / EXERCISE_NAME.replace("-", "_")
+        / ".gitmastery-exercise.json"
+    )
+    assert cached_config.is_file()
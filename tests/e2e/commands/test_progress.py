@@ -1,8 +1,23 @@
 import json
+import subprocess
+import time
 from pathlib import Path
+
 import pytest
 
+from ..constants import EXERCISE_NAME
 from ..runner import BinaryRunner
+from ..utils import rmtree
+
+
+def _git(progress_dir: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args],
+        cwd=progress_dir,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
 
 
 def test_progress_show(runner: BinaryRunner, gitmastery_root: Path) -> None:
@@ -16,8 +31,15 @@ def test_progress_sync_on_then_off(runner: BinaryRunner, gitmastery_root: Path)
     """progress sync on/off toggles progress_remote in the config."""
     res_on = runner.run(["progress", "sync", "on"], cwd=gitmastery_root)
     res_on.assert_success()
-    res_on.assert_stdout_contains("You have setup the progress tracker for Git-Mastery!")
-    assert json.loads((gitmastery_root / ".gitmastery" / "config.json").read_text())["progress_remote"] is True
+    res_on.assert_stdout_contains(
+        "You have setup the progress tracker for Git-Mastery!"
+    )
+    assert (
+        json.loads((gitmastery_root / ".gitmastery" / "config.json").read_text())[
+            "progress_remote"
+        ]
+        is True
+    )
 
     # send 'y' to confirm
     res_off = runner.run(
@@ -25,7 +47,12 @@ def test_progress_sync_on_then_off(runner: BinaryRunner, gitmastery_root: Path)
     )
     res_off.assert_success()
     res_off.assert_stdout_contains("Successfully removed your remote sync")
-    assert json.loads((gitmastery_root / ".gitmastery" / "config.json").read_text())["progress_remote"] is False
+    assert (
+        json.loads((gitmastery_root / ".gitmastery" / "config.json").read_text())[
+            "progress_remote"
+        ]
+        is False
+    )
 
 
 @pytest.mark.order(after="tests/e2e/commands/test_verify.py::test_verify_exercise")
@@ -33,6 +60,154 @@ def test_progress_reset(runner: BinaryRunner, verified_exercise_dir: Path) -> No
     """progress reset removes the current exercise's entry from progress.json."""
     res = runner.run(["progress", "reset"], cwd=verified_exercise_dir)
     res.assert_success()
-    progress_json = verified_exercise_dir.parent / ".gitmastery" / "progress" / "progress.json"
+    progress_json = (
+        verified_exercise_dir.parent / ".gitmastery" / "progress" / "progress.json"
+    )
     # TODO: need to verify that the exercise itself progress was reset, not just progress.json was cleared
     assert json.loads(progress_json.read_text()) == []
+
+
+@pytest.mark.order(after="test_progress_reset")
+def test_progress_migrate(runner: BinaryRunner, gitmastery_root: Path) -> None:
+    """progress migrate replaces progress.json with per-exercise files and a manifest."""
+    res = runner.run(["progress", "migrate"], cwd=gitmastery_root)
+    res.assert_success()
+    res.assert_stdout_contains("Migrated your progress")
+    progress_dir = gitmastery_root / ".gitmastery" / "progress"
+    assert not (progress_dir / "progress.json").exists()
+    assert json.loads((progress_dir / "manifest.json").read_text())["version"] == 1
+
+
+def test_progress_sync_on_offline(runner: BinaryRunner, gitmastery_root: Path) -> None:
+    """progress sync on fails fast without touching the config when offline."""
+    res = runner.run(["--offline", "progress", "sync", "on"], cwd=gitmastery_root)
+    assert res.returncode == 1
+    res.assert_stdout_contains("needs an internet connection")
+    assert (
+        json.loads((gitmastery_root / ".gitmastery" / "config.json").read_text())[
+            "progress_remote"
+        ]
+        is False
+    )
+
+
+def test_progress_reset_restores_from_snapshot(
+    runner: BinaryRunner, downloaded_exercise_dir: Path
+) -> None:
+    """progress reset restores the exercise from its snapshot without reading the exercises."""
+    metadata_dir = downloaded_exercise_dir.parent / ".gitmastery"
+    if not (metadata_dir / "snapshots" / f"{EXERCISE_NAME}.tar.gz").is_file():
+        pytest.skip(f"{EXERCISE_NAME} has no snapshot")
+    exercise_config = json.loads(
+        (downloaded_exercise_dir / ".gitmastery-exercise.json").read_text()
+    )
+    repo_dir = downloaded_exercise_dir / exercise_config["exercise_repo"]["repo_name"]
+    (repo_dir / "attempt.txt").write_text("Added by the student\n")
+
+    # Without the exercises cache, the exercises cannot be read offline, so the reset
+    # can only succeed from the snapshot
+    rmtree(metadata_dir / "cache" / "exercises")
+    res = runner.run(["--offline", "progress", "reset"], cwd=downloaded_exercise_dir)
+    res.assert_success()
+    res.assert_stdout_contains("Restored the exercise from its initial snapshot")
+    assert not (repo_dir / "attempt.txt").exists()
+
+
+def test_progress_reset_restores_changed_base_files(
+    runner: BinaryRunner, downloaded_exercise_dir: Path
+) -> None:
+    """progress reset only downloads the base files that were changed or removed."""
+    exercise_config = json.loads(
+        (downloaded_exercise_dir / ".gitmastery-exercise.json").read_text()
+    )
+    if len(exercise_config["base_files"]) == 0:
+        pytest.skip(f"{EXERCISE_NAME} has no base files")
+    # Snapshots restore every base file at once, so they are removed to make reset
+    # download the base files again
+    snapshots_dir = downloaded_exercise_dir.parent / ".gitmastery" / "snapshots"
+
+    rmtree(snapshots_dir)
+    res = runner.run(["progress", "reset"], cwd=downloaded_exercise_dir)
+    res.assert_success()
+    res.assert_stdout_contains("Exercise base files are unchanged")
+
+    changed_path, *unchanged_paths = exercise_config["base_files"].values()
+    original = (downloaded_exercise_dir / changed_path).read_bytes()
+    (downloaded_exercise_dir / changed_path).write_bytes(b"Changed by the student\n")
+
+    rmtree(snapshots_dir)
+    res = runner.run(["progress", "reset"], cwd=downloaded_exercise_dir)
+    res.assert_success()
+    res.assert_stdout_contains(f"Restored {changed_path}")
+    for path in unchanged_paths:
+        assert f"Restored {path}" not in res.stdout
+    assert (downloaded_exercise_dir / changed_path).read_bytes() == original
+
+
+def test_progress_sync_on_clones_new_fork(
+    runner: BinaryRunner, gitmastery_root: Path
+) -> None:
+    """progress sync on waits for the new fork and clones it in place of the local folder."""
+    res = runner.run(["progress", "sync", "on"], cwd=gitmastery_root, timeout=120)
+    try:
+        res.assert_success()
+        assert "Your fork is taking a while to be created" not in res.stdout
+        origin = subprocess.run(
+            ["git", "remote", "get-url", "origin"],
+            cwd=gitmastery_root / ".gitmastery" / "progress",
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        assert "-gitmastery-progress" in origin
+    finally:
+        runner.run(
+            ["progress", "sync", "off"], cwd=gitmastery_root, stdin_text="y\n"
+        ).assert_success()
+
+
+def test_progress_flush_delivers_queued_progress(
+    runner: BinaryRunner, gitmastery_root: Path
+) -> None:
+    """progress flush pushes queued progress, including progress queued while it runs."""
+    metadata_dir = gitmastery_root / ".gitmastery"
+    progress_dir = metadata_dir / "progress"
+
+    def queue(name: str) -> None:
+        (progress_dir / f"{name}.txt").write_text(name)
+        with open(metadata_dir / "progress-outbox.jsonl", "a") as file:
+            file.write(json.dumps({"exercise_name": name}) + "\n")
+
+    runner.run(
+        ["progress", "sync", "on"], cwd=gitmastery_root, timeout=120
+    ).assert_success()
+    try:
+        queue("queued")
+        res = runner.run(["progress", "flush"], cwd=gitmastery_root, timeout=120)
+        res.assert_success()
+        res.assert_stdout_contains("pending progress updates")
+
+        # Progress queued while a flush is running is pushed by a later flush
+        background = subprocess.Popen(
+            [runner.binary_path, "progress", "flush", "--quiet"],
+            cwd=gitmastery_root,
+        )
+        index = 0
+        while background.poll() is None:
+            queue(f"racing-{index}")
+            index += 1
+            time.sleep(0.05)
+        runner.run(
+            ["progress", "flush"], cwd=gitmastery_root, timeout=120
+        ).assert_success()
+
+        assert list(metadata_dir.glob("progress-outbox.jsonl*")) == []
+        assert _git(progress_dir, "status", "--porcelain") == ""
+        _git(progress_dir, "fetch", "origin")
+        assert _git(progress_dir, "rev-parse", "HEAD") == _git(
+            progress_dir, "rev-parse", "origin/main"
+        )
+    finally:
+        runner.run(
+            ["progress", "sync", "off"], cwd=gitmastery_root, stdin_text="y\n"
+        ).assert_success()
@@ -0,0 +1,98 @@
+import json
+import socket
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from ..constants import EXERCISE_NAME
+from ..runner import BinaryRunner
+from ..utils import rmtree
+
+# Serving builds a bundle of every exercise before it starts listening
+SERVE_CACHE_START_TIMEOUT = 120
+
+
+def _get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_serving(server: subprocess.Popen, url: str) -> None:
+    deadline = time.monotonic() + SERVE_CACHE_START_TIMEOUT
+    while time.monotonic() < deadline:
+        assert server.poll() is None, "serve-cache exited before serving"
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(0.5)
+    pytest.fail(f"serve-cache did not start serving at {url} in time")
+
+
+def test_serve_cache_mirror(
+    runner: BinaryRunner,
+    gitmastery_root: Path,
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    """A mirror root fetches the served exercises, and reuses its copy when unchanged or unreachable."""
+    url = f"http://127.0.0.1:{_get_free_port()}"
+    server = subprocess.Popen(
+        [
+            runner.binary_path,
+            "serve-cache",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            url.rsplit(":", 1)[1],
+            "--refresh",
+            "0",
+        ],
+        cwd=gitmastery_root,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    work_dir = tmp_path_factory.mktemp("gitmastery-e2e-mirror")
+    try:
+        runner.run(["setup"], cwd=work_dir, stdin_text="\n").assert_success()
+        mirror_root = work_dir / "gitmastery-exercises"
+        config_path = mirror_root / ".gitmastery" / "config.json"
+        config = json.loads(config_path.read_text())
+        config["exercises_source"] = {"type": "mirror", "url": url}
+        config_path.write_text(json.dumps(config, indent=2))
+
+        _wait_until_serving(server, url)
+        res = runner.run(["list", "--refresh"], cwd=mirror_root, timeout=120)
+        res.assert_success()
+        res.assert_stdout_contains(EXERCISE_NAME)
+        (mirror_dir,) = (mirror_root / ".gitmastery" / "cache" / "exercises").glob(
+            "mirror-*"
+        )
+        bundle_path = mirror_dir / "mirror.gmbundle"
+        etag = (mirror_dir / "mirror.etag").read_text()
+        assert bundle_path.is_file() and etag != ""
+        fetched_at = bundle_path.stat().st_mtime_ns
+
+        # The ETag of the copy kept tells the mirror that it is still current
+        res = runner.run(["list", "--refresh"], cwd=mirror_root, timeout=120)
+        res.assert_success()
+        assert bundle_path.stat().st_mtime_ns == fetched_at
+        assert (mirror_dir / "mirror.etag").read_text() == etag
+
+        server.terminate()
+        server.wait(timeout=10)
+        res = runner.run(["list", "--refresh"], cwd=mirror_root, timeout=120)
+        res.assert_success()
+        res.assert_stdout_contains("using the exercises fetched last")
+        res.assert_stdout_contains(EXERCISE_NAME)
+    finally:
+        server.kill()
+        server.wait()
+        rmtree(work_dir)
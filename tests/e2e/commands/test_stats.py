@@ -0,0 +1,14 @@
+from pathlib import Path
+
+from ..runner import BinaryRunner
+
+
+def test_stats(runner: BinaryRunner, gitmastery_root: Path) -> None:
+    """stats aggregates the external commands recorded inside the Git-Mastery root."""
+    runner.run(["check", "git"], cwd=gitmastery_root).assert_success()
+
+    res = runner.run(["stats"], cwd=gitmastery_root)
+    res.assert_success()
+    res.assert_stdout_contains("Slowest")
+    res.assert_stdout_matches(r"git config\s+\d+")
+    assert (gitmastery_root / ".gitmastery" / "metrics.jsonl").is_file()
@@ -1,12 +1,71 @@
 import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
 from pathlib import Path
+from typing import List
+
+import pytest
 
 from ..constants import EXERCISE_NAME
+from ..runner import BinaryRunner
+
+
+class _WatchedVerify:
+    """Runs verify --watch in the background and collects its output."""
+
+    def __init__(self, runner: BinaryRunner, cwd: Path) -> None:
+        self.process = subprocess.Popen(
+            [runner.binary_path, "verify", "--watch"],
+            cwd=cwd,
+            env={**os.environ, "NO_COLOR": "1", "PYTHONIOENCODING": "utf-8"},
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+        self.lines: List[str] = []
+        self.reader = threading.Thread(target=self.__read, daemon=True)
+        self.reader.start()
+
+    def __read(self) -> None:
+        assert self.process.stdout is not None
+        for line in self.process.stdout:
+            self.lines.append(line)
+
+    @property
+    def output(self) -> str:
+        return "".join(self.lines)
+
+    def wait_for(self, text: str, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if text in self.output:
+                return True
+            time.sleep(0.1)
+        return text in self.output
+
+    def close(self) -> None:
+        self.process.terminate()
+        self.process.wait(timeout=10)
+        self.reader.join(timeout=10)
+
+
+def _get_exercise_repo_dir(exercise_dir: Path) -> Path:
+    exercise_config = json.loads(
+        (exercise_dir / ".gitmastery-exercise.json").read_text()
+    )
+    return exercise_dir / exercise_config["exercise_repo"]["repo_name"]
 
 
 def test_verify_exercise(verified_exercise_dir: Path) -> None:
     """verify writes a progress entry with the expected fields."""
-    progress_json = verified_exercise_dir.parent / ".gitmastery" / "progress" / "progress.json"
+    progress_json = (
+        verified_exercise_dir.parent / ".gitmastery" / "progress" / "progress.json"
+    )
     entries = json.loads(progress_json.read_text())
     assert len(entries) == 1
     entry = entries[0]
@@ -14,3 +73,112 @@ def test_verify_exercise(verified_exercise_dir: Path) -> None:
     assert "started_at" in entry
     assert "completed_at" in entry
     assert "status" in entry
+
+
+def test_verify_reuses_cached_result(
+    runner: BinaryRunner, verified_exercise_dir: Path
+) -> None:
+    """verify reuses the last result while the attempt is unchanged."""
+    runner.run(["verify"], cwd=verified_exercise_dir).assert_success()
+
+    res = runner.run(["verify"], cwd=verified_exercise_dir)
+    res.assert_success()
+    res.assert_stdout_contains("Nothing has changed since your last verification")
+
+
+def test_verify_no_cache(runner: BinaryRunner, verified_exercise_dir: Path) -> None:
+    """verify --no-cache verifies again even when a cached result exists."""
+    runner.run(["verify"], cwd=verified_exercise_dir).assert_success()
+
+    res = runner.run(["verify", "--no-cache"], cwd=verified_exercise_dir)
+    res.assert_success()
+    res.assert_stdout_contains("Verification completed.")
+    assert "Nothing has changed since your last verification" not in res.stdout
+
+
+@pytest.mark.skipif(
+    sys.platform != "linux", reason="Memory limits are only enforced on Linux"
+)
+def test_verify_memory_limit_exceeded(
+    runner: BinaryRunner, verified_exercise_dir: Path
+) -> None:
+    """verify reports an error when the verification exceeds its memory limit."""
+    res = runner.run(
+        ["verify", "--no-cache", "--memory-limit", "1"], cwd=verified_exercise_dir
+    )
+    res.assert_success()
+    res.assert_stdout_contains("Status: Error")
+
+
+def test_verify_watch_reverifies_on_change(
+    runner: BinaryRunner, verified_exercise_dir: Path
+) -> None:
+    """verify --watch verifies again once the attempt changes."""
+    watched = _WatchedVerify(runner, verified_exercise_dir)
+    try:
+        assert watched.wait_for("Status:", timeout=60), watched.output
+
+        subprocess.run(
+            ["git", "commit", "--allow-empty", "-m", "Watched change"],
+            cwd=_get_exercise_repo_dir(verified_exercise_dir),
+            check=True,
+            capture_output=True,
+        )
+        assert watched.wait_for("Change detected", timeout=30), watched.output
+    finally:
+        watched.close()
+
+
+def test_verify_watch_ignores_git_lock_churn(
+    runner: BinaryRunner, verified_exercise_dir: Path
+) -> None:
+    """verify --watch does not verify again when Git only creates and removes locks."""
+    lock_path = _get_exercise_repo_dir(verified_exercise_dir) / ".git" / "index.lock"
+    watched = _WatchedVerify(runner, verified_exercise_dir)
+    try:
+        assert watched.wait_for("Status:", timeout=60), watched.output
+
+        for _ in range(10):
+            lock_path.write_text("")
+            time.sleep(0.2)
+            lock_path.unlink()
+            time.sleep(0.2)
+        assert not watched.wait_for("Change detected", timeout=3), watched.output
+    finally:
+        lock_path.unlink(missing_ok=True)
+        watched.close()
+
+
+def test_verify_batch(
+    runner: BinaryRunner, verified_exercise_dir: Path, tmp_path: Path
+) -> None:
+    """verify with several exercise folders verifies each of them in one batch."""
+    copied_exercise_dir = tmp_path / EXERCISE_NAME
+    shutil.copytree(verified_exercise_dir, copied_exercise_dir, symlinks=True)
+    summary_path = tmp_path / "summary.json"
+
+    res = runner.run(
+        [
+            "verify",
+            str(verified_exercise_dir),
+            str(copied_exercise_dir),
+            "--summary",
+            str(summary_path),
+            "--summary-format",
+            "json",
+        ],
+        cwd=verified_exercise_dir.parent,
+        timeout=120,
+    )
+    res.assert_success()
+    res.assert_stdout_contains("Verified 2 exercise folders")
+
+    rows = json.loads(summary_path.read_text())
+    assert sorted(Path(row["path"]) for row in rows) == sorted(
+        [verified_exercise_dir.resolve(), copied_exercise_dir.resolve()]
+    )
+    for row in rows:
+        assert row["exercise_name"] == EXERCISE_NAME
+        # Both folders hold the same attempt, which the exercise can verify
+        assert row["status"] != "ERROR", row["comments"]
+    assert rows[0]["status"] == rows[1]["status"]
@@ -0,0 +1,20 @@
+from pathlib import Path
+
+from ..runner import BinaryRunner
+
+
+def test_worker(runner: BinaryRunner, gitmastery_root: Path) -> None:
+    """worker start forwards later commands to a background process until stopped."""
+    runner.run(["worker", "start"], cwd=gitmastery_root).assert_success()
+    try:
+        assert (gitmastery_root / ".gitmastery" / "worker.sock").exists()
+
+        res = runner.run(["worker", "status"], cwd=gitmastery_root)
+        res.assert_success()
+        res.assert_stdout_contains("is running")
+    finally:
+        runner.run(["worker", "stop"], cwd=gitmastery_root).assert_success()
+
+    res = runner.run(["worker", "status"], cwd=gitmastery_root)
+    res.assert_success()
+    res.assert_stdout_contains("is not running")